@@ -0,0 +1,72 @@
+"""Benchmarks the band-limited square/sawtooth against the naive ones (time and alias energy)
+
+Each function is generated with a whole number of cycles across the ROM (as the ROM loops during playback).
+Harmonics of the waveform land on multiples of the cycle count; anything else in the spectrum was folded
+back from above Nyquist. Alias energy is that folded energy relative to the harmonics (lower is better).
+Odd cycle counts are used, so folded harmonics don't land back on the harmonic bins.
+
+Run with:
+    $ python -m benchmarks.bench_bandlimit
+"""
+
+import timeit
+
+import numpy as np
+
+from wav2bin.src.waveform_bank import square, sawtooth, square_bl, sawtooth_bl
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+ADDRESS_BITS = [8, 12]
+CYCLES = [3, 5, 13, 31, 61]
+REPEATS = 20
+
+PAIRS = [("square", square, square_bl), ("sawtooth", sawtooth, sawtooth_bl)]
+
+
+def alias_energy(y, cycles: int) -> float:
+    """Finds the energy outside of the harmonics, relative to the harmonics
+
+    Keyword arguments:
+        :param y: Array of points (one loop of the ROM)
+        :param cycles: Number of cycles across the points
+
+    :returns: Alias energy (in dB)
+    """
+
+    power = np.absolute(np.fft.rfft(y - y.mean())) ** 2
+
+    harmonic = np.zeros(power.size, dtype=bool)
+    harmonic[::cycles] = True
+
+    return 10 * np.log10(power[~harmonic].sum() / power[harmonic].sum())
+
+
+# END def alias_energy() #
+
+
+def main():
+    """Prints time and alias energy of every function at every depth and cycle count"""
+
+    print("%8s %7s %-10s %14s %14s %14s %14s" % ("depth", "cycles", "function",
+                                                  "naive (us)", "BL (us)", "naive (dB)", "BL (dB)"))
+
+    for address_bits in ADDRESS_BITS:
+        depth = 1 << address_bits
+
+        for cycles in CYCLES:
+            t = 2 * np.pi * cycles * np.arange(depth) / depth
+
+            for name, naive, band_limited in PAIRS:
+                times = [min(timeit.repeat(lambda: function(t), number=1, repeat=REPEATS))
+                         for function in (naive, band_limited)]
+
+                print("%8d %7d %-10s %14.1f %14.1f %14.1f %14.1f" %
+                      (depth, cycles, name, times[0] * 1e6, times[1] * 1e6,
+                       alias_energy(naive(t), cycles), alias_energy(band_limited(t), cycles)))
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Benchmarks the cost of painting a hand-drawn stroke (full redraws vs blitting only the line)
+
+Runs headless on the Agg canvas. Each "frame" is a new stroke point followed by a repaint; at FRAME_TIME
+coalescing, the per-frame cost has to stay well under DRAW_LATENCY_TARGET to keep up with the cursor.
+
+Run with:
+    $ python -m benchmarks.bench_draw
+"""
+
+import timeit
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from wav2bin.src.draw_graph import DrawGraph, DRAW_LATENCY_TARGET
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+STROKE_POINTS = 200
+REPEATS = 3
+
+
+def main():
+    """Prints the per-frame cost of both ways of painting"""
+
+    graph_tool = DrawGraph()
+    canvas = FigureCanvasAgg(graph_tool.fig)
+    line, ax = graph_tool.line, graph_tool.ax
+
+    x = np.linspace(graph_tool.x_min, graph_tool.x_max, STROKE_POINTS)
+    y = graph_tool.y_mid_point + 100 * np.sin(x / 20)
+
+    def full_redraw():
+        for i in range(1, STROKE_POINTS + 1):
+            line.set_data(x[:i], y[:i])
+            canvas.draw()
+
+    def blit():
+        line.set_animated(True)
+        canvas.draw()
+        background = canvas.copy_from_bbox(ax.bbox)
+
+        for i in range(1, STROKE_POINTS + 1):
+            canvas.restore_region(background)
+            line.set_data(x[:i], y[:i])
+            ax.draw_artist(line)
+            canvas.blit(ax.bbox)
+
+        line.set_animated(False)
+
+    print("%-14s %16s %12s" % ("paint", "per frame (ms)", "target (ms)"))
+
+    for name, run in (("full redraw", full_redraw), ("blit", blit)):
+        seconds = min(timeit.repeat(run, number=1, repeat=REPEATS)) / STROKE_POINTS
+        print("%-14s %16.3f %12.1f" % (name, seconds * 1e3, DRAW_LATENCY_TARGET * 1e3))
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    main()
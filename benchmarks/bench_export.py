@@ -0,0 +1,48 @@
+"""Benchmarks every exporter on images of growing size (written to memory, so the disk isn't timed)
+
+Run with:
+    $ python -m benchmarks.bench_export
+"""
+
+import io
+import timeit
+
+import numpy as np
+
+from wav2bin.src.exporters import EXPORTERS
+from wav2bin.src.rom_geometry import RomGeometry
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+GEOMETRIES = [(8, 8, 32), (12, 12, 256), (16, 16, 64)]  # (address_bits, data_bits, waveform_count) . . .
+REPEATS = 3
+
+
+def main():
+    """Prints the time and output size of every exporter for every image"""
+
+    print("%10s %-8s %12s %14s %12s" % ("image (B)", "format", "time (ms)", "output (B)", "MB/s"))
+
+    for address_bits, data_bits, waveform_count in GEOMETRIES:
+        geometry = RomGeometry(address_bits, data_bits)
+        data = np.random.default_rng(0).integers(0, 1 << data_bits, (waveform_count, geometry.depth))
+        image_size = data.size * geometry.bytes_per_sample
+
+        for extension, (description, writer) in EXPORTERS.items():
+            sizes = []
+
+            def export():
+                f = io.BytesIO()
+                writer(data, f, geometry)
+                sizes.append(f.tell())
+
+            elapsed = min(timeit.repeat(export, number=1, repeat=REPEATS))
+
+            print("%10d %-8s %12.1f %14d %12.1f" % (image_size, extension, elapsed * 1e3, sizes[-1],
+                                                    image_size / elapsed / 1e6))
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmarks each hand-drawn stroke fit (time and error) over a range of ROM depths
+
+A stroke is simulated as a noisy sine sampled at uneven, increasing x points (like mouse events). Error
+is the RMS difference between the fit and the noiseless sine on the sample grid.
+
+Run with:
+    $ python -m benchmarks.bench_fit
+"""
+
+import timeit
+
+import numpy as np
+
+from wav2bin.src.stroke_fit import fit_stroke, FIT_METHODS
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+ADDRESS_BITS = [8, 12, 16]
+STROKE_POINTS = 400     # Mouse events in a stroke . . .
+NOISE = 2.0             # Hand jitter (in y units) . . .
+REPEATS = 5
+
+
+def make_stroke(depth: int, rng) -> tuple:
+    """Creates a simulated stroke across the grid
+
+    Keyword arguments:
+        :param depth: Number of samples in the grid
+        :param rng: 'np.random.Generator' used
+
+    :returns: (x, y) points of the stroke and the noiseless y points on the grid
+    """
+
+    def curve(x):
+        return 127.5 + 100 * np.sin(2 * np.pi * 2 * x / (depth - 1))
+
+    x = np.sort(rng.uniform(0, depth - 1, STROKE_POINTS))
+    x[0], x[-1] = 0, depth - 1
+
+    y = curve(x) + rng.normal(0, NOISE, x.size)
+
+    return x, y, curve(np.arange(depth))
+
+
+# END def make_stroke() #
+
+
+def main():
+    """Prints time and error of every fit at every depth"""
+
+    rng = np.random.default_rng(0)
+
+    print("%8s %-18s %12s %10s" % ("depth", "fit", "time (ms)", "RMS error"))
+
+    for address_bits in ADDRESS_BITS:
+        depth = 1 << address_bits
+        x, y, truth = make_stroke(depth, rng)
+
+        for method in FIT_METHODS:
+            seconds = min(timeit.repeat(lambda: fit_stroke(x, y, 0, depth - 1, method),
+                                        number=1, repeat=REPEATS))
+            error = np.sqrt(np.mean((fit_stroke(x, y, 0, depth - 1, method) - truth) ** 2))
+
+            print("%8d %-18s %12.3f %10.3f" % (depth, method, seconds * 1e3, error))
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    main()
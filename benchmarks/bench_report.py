@@ -0,0 +1,50 @@
+"""Benchmarks pdf report rendering over bank size, mode, and number of processes
+
+Pages should scale linearly with the number of pages, and time should drop with each process added (up
+to the number of CPUs).
+
+Run with:
+    $ python -m benchmarks.bench_report
+"""
+
+import os
+import tempfile
+import time
+
+from wav2bin.src.pdf_report import render_report, REPORT_MODES
+from wav2bin.src.waveform_bank import WaveformBank
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+WAVEFORM_COUNTS = [32, 256, 1024]
+JOBS = sorted({1, 2, os.cpu_count() or 1})
+
+
+def main():
+    """Prints time per page of every mode at every bank size and number of processes"""
+
+    print("%8s %6s %-7s %5s %10s %14s" % ("slots", "pages", "mode", "jobs", "time (s)", "per page (ms)"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "report.pdf")
+
+        for waveform_count in WAVEFORM_COUNTS:
+            bank = WaveformBank(waveform_count=waveform_count)
+            for slot in range(waveform_count):
+                bank.current_waveform = slot
+                bank.change_function("Sine", mix_func=False, cycles=slot % 7 + 1)
+
+            for mode in REPORT_MODES:
+                for jobs in JOBS:
+                    start = time.perf_counter()
+                    pages = render_report(bank, file_name, mode=mode, jobs=jobs)
+                    seconds = time.perf_counter() - start
+
+                    print("%8d %6d %-7s %5d %10.3f %14.2f" % (waveform_count, pages, mode, jobs,
+                                                               seconds, seconds / pages * 1e3))
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Benchmarks the frequency / "Waveform" resampling path over a range of ROM depths
+
+Run with:
+    $ python -m benchmarks.bench_resample
+"""
+
+import timeit
+
+import numpy as np
+
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.waveform_bank import WaveformBank
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+ADDRESS_BITS = [8, 10, 12, 14, 16, 18, 20]
+FREQ = 3
+REPEATS = 5
+
+
+def bench_change_freq(address_bits: int) -> float:
+    """Times 'WaveformBank.change_freq' for a single waveform
+
+    Keyword arguments:
+        :param address_bits: Number of address bits in the waveform
+
+    :returns: Best time (in seconds) of REPEATS runs
+    """
+
+    bank = WaveformBank(waveform_count=1, geometry=RomGeometry(address_bits=address_bits))
+    bank.change_function(name="Sine", mix_func=False, cycles=5)
+    source = bank.line_set[0].y.copy()
+
+    def run():
+        bank.line_set[0].y = source.copy()
+        bank.change_freq(FREQ)
+
+    return min(timeit.repeat(run, number=1, repeat=REPEATS))
+
+
+# END def bench_change_freq() #
+
+
+def main():
+    """Prints the time taken per depth, along with the time per sample (which should stay flat)"""
+
+    print("%10s %12s %14s" % ("depth", "time (ms)", "ns / sample"))
+
+    for address_bits in ADDRESS_BITS:
+        depth = 1 << address_bits
+        seconds = bench_change_freq(address_bits)
+        print("%10d %12.3f %14.2f" % (depth, seconds * 1e3, seconds * 1e9 / depth))
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    main()
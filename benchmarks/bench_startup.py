@@ -0,0 +1,73 @@
+"""Benchmarks cold import time of each wav2bin module (each run is a fresh interpreter)
+
+Run with:
+    $ python -m benchmarks.bench_startup
+"""
+
+import subprocess
+import sys
+import time
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+MODULES = ['wav2bin.src.waveform_bank',
+           'wav2bin.src.rom_builder',
+           'wav2bin.src.draw_graph',
+           'wav2bin.src.graphic_interface']
+REPEATS = 5
+
+
+def bench_import(module: str) -> float:
+    """Times how long a fresh interpreter takes to import a module (minus bare interpreter start up)
+
+    Keyword arguments:
+        :param module: Name of module imported
+
+    :returns: Best time (in seconds) of REPEATS runs
+    """
+
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', code])
+        return time.perf_counter() - start
+
+    interpreter = min(run('pass') for i in range(REPEATS))
+
+    return min(run('import %s' % module) for i in range(REPEATS)) - interpreter
+
+
+# END def bench_import() #
+
+
+def imported_modules(module: str) -> set:
+    """Finds which heavy packages are pulled in by importing a module
+
+    Keyword arguments:
+        :param module: Name of module imported
+
+    :returns: Set of heavy packages imported
+    """
+
+    code = ("import sys, %s; print(' '.join(name for name in ('matplotlib', 'scipy', 'tkinter') "
+            "if name in sys.modules))" % module)
+
+    return set(subprocess.check_output([sys.executable, '-c', code]).decode().split())
+
+
+# END def imported_modules() #
+
+
+def main():
+    """Prints the cold import time of each module, along with the heavy packages it pulls in"""
+
+    print("%-34s %12s  %s" % ("module", "import (ms)", "heavy imports"))
+
+    for module in MODULES:
+        print("%-34s %12.1f  %s" % (module, bench_import(module) * 1e3,
+                                    ', '.join(sorted(imported_modules(module))) or '-'))
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,423 @@
+"""Benchmark suite of the waveform engine and export paths, with results kept as JSON
+
+Every case is run over each ROM depth and bank size (headless, on the Agg backend). Results are written to
+a JSON file, and compared against a stored baseline: any case slower than the baseline by more than the
+tolerance is flagged (and the suite exits with 1).
+
+Run with:
+    $ python -m benchmarks.suite                      # Runs every case, compared against the baseline
+    $ python -m benchmarks.suite --save-baseline      # Stores the results as the new baseline
+    $ python -m benchmarks.suite -k export --quick    # Only cases matching 'export', smallest sizes only
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import timeit
+
+from collections import OrderedDict
+
+import matplotlib
+matplotlib.use('Agg')   # Headless (before anything imports pyplot) . . .
+
+import numpy as np
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+ADDRESS_BITS = [8, 12]
+WAVEFORM_COUNTS = [32, 256]
+REPEATS = 5
+
+RESULTS_FILE = 'benchmark_results.json'
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+TOLERANCE = 1.25        # Cases slower than the baseline by this factor are flagged . . .
+MIN_DIFFERENCE = 1e-4   # ... unless they're slower by less than this (in seconds), which is timer noise . . .
+
+CASES = OrderedDict()
+
+
+def case(name: str):
+    """Registers a benchmark case
+
+    A case takes (address_bits, waveform_count), does any set up, and returns the function being timed.
+
+    Keyword arguments:
+        :param name: Name of case
+
+    :returns: Decorator registering the case
+    """
+
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+# END def case() #
+
+
+def filled_bank(address_bits: int, waveform_count: int, history=None):
+    """Creates a bank with every slot drawn
+
+    Keyword arguments:
+        :param address_bits: Number of address bits per waveform
+        :param waveform_count: Number of slots
+        :param history: 'History' kept by the bank (None to not keep one)
+
+    :returns: 'WaveformBank'
+    """
+
+    from wav2bin.src.rom_geometry import RomGeometry
+    from wav2bin.src.waveform_bank import WaveformBank
+
+    bank = WaveformBank(waveform_count=waveform_count, geometry=RomGeometry(address_bits=address_bits),
+                        history=history)
+    for slot in range(waveform_count):
+        bank.current_waveform = slot
+        bank.change_function("Sine", mix_func=False, cycles=slot % 7 + 1)
+
+    bank.current_waveform = 0
+
+    return bank
+
+
+# END def filled_bank() #
+
+
+@case("change_freq")
+def bench_change_freq(address_bits: int, waveform_count: int):
+    """Compresses a waveform by 2 (repeating it to fill the ROM)"""
+
+    bank = filled_bank(address_bits, waveform_count)
+
+    return lambda: bank.change_freq(2)
+
+
+# END def bench_change_freq() #
+
+
+@case("change_function/Sine")
+def bench_change_function_sine(address_bits: int, waveform_count: int):
+    """Mixes a cached sine into a waveform"""
+
+    bank = filled_bank(address_bits, waveform_count)
+
+    return lambda: bank.change_function("Sine", mix_func=True, cycles=3)
+
+
+# END def bench_change_function_sine() #
+
+
+@case("change_function/Random")
+def bench_change_function_random(address_bits: int, waveform_count: int):
+    """Overwrites a waveform with random points (repeated 7 times)"""
+
+    bank = filled_bank(address_bits, waveform_count)
+
+    return lambda: bank.change_function("Random", mix_func=False, cycles=7)
+
+
+# END def bench_change_function_random() #
+
+
+@case("change_function/Waveform")
+def bench_change_function_waveform(address_bits: int, waveform_count: int):
+    """Overwrites a waveform with another one (repeated 3 times)"""
+
+    bank = filled_bank(address_bits, waveform_count)
+
+    return lambda: bank.change_function("Waveform", mix_func=False, cycles=3, wav_num=waveform_count - 1)
+
+
+# END def bench_change_function_waveform() #
+
+
+@case("edit_chain")
+def bench_edit_chain(address_bits: int, waveform_count: int, history=None):
+    """Runs a scripted chain of amplitude/level edits on one waveform, then exports the bank"""
+
+    bank = filled_bank(address_bits, waveform_count, history)
+
+    def edit():
+        for step in range(20):
+            bank.change_amp(1.1)
+            bank.change_level(3)
+        bank.export_data()
+
+    return edit
+
+
+# END def bench_edit_chain() #
+
+
+@case("edit_chain/history")
+def bench_edit_chain_history(address_bits: int, waveform_count: int):
+    """Runs 'edit_chain' with undo/redo history kept (as the GUI always does)"""
+
+    from wav2bin.src.history import History
+
+    return bench_edit_chain(address_bits, waveform_count, History())
+
+
+# END def bench_edit_chain_history() #
+
+
+@case("curve_fit")
+def bench_curve_fit(address_bits: int, waveform_count: int):
+    """Fits a hand-drawn stroke (as '__curve_fit' does once the mouse is let go)"""
+
+    from wav2bin.src.stroke_fit import fit_stroke
+
+    depth = 1 << address_bits
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, depth - 1, 400))
+    y = 127.5 + 100 * np.sin(2 * np.pi * x / (depth - 1)) + rng.normal(0, 2.0, x.size)
+
+    return lambda: fit_stroke(x, y, 0, depth - 1)
+
+
+# END def bench_curve_fit() #
+
+
+@case("export_data")
+def bench_export_data(address_bits: int, waveform_count: int):
+    """Rounds the whole bank into ROM samples"""
+
+    bank = filled_bank(address_bits, waveform_count)
+
+    return bank.export_data
+
+
+# END def bench_export_data() #
+
+
+@case("export_data/quantizers")
+def bench_export_quantizers(address_bits: int, waveform_count: int):
+    """Rounds the whole bank into ROM samples with every quantizer, measuring the error of each"""
+
+    from wav2bin.src.quantize import QUANTIZERS
+
+    bank = filled_bank(address_bits, waveform_count)
+
+    def export():
+        for quantizer in QUANTIZERS:
+            bank.quantizer = quantizer
+            bank.export_data(report=True)
+
+    return export
+
+
+# END def bench_export_quantizers() #
+
+
+@case("export/formats")
+def bench_export_formats(address_bits: int, waveform_count: int):
+    """Exports the whole bank to every format in 'EXPORTERS' (in memory)"""
+
+    from wav2bin.src.exporters import EXPORTERS
+
+    bank = filled_bank(address_bits, waveform_count)
+    data = bank.export_data()
+
+    def export():
+        for description, writer in EXPORTERS.values():
+            writer(data, io.BytesIO(), bank.geometry)
+
+    return export
+
+
+# END def bench_export_formats() #
+
+
+@case("print_to_pdf")
+def bench_print_to_pdf(address_bits: int, waveform_count: int):
+    """Renders the whole bank into a (vector) pdf report"""
+
+    from wav2bin.src.pdf_report import render_report
+
+    bank = filled_bank(address_bits, waveform_count)
+
+    return lambda: render_report(bank, os.devnull, mode="vector", jobs=1)
+
+
+# END def bench_print_to_pdf() #
+
+
+@case("render_wav")
+def bench_render_wav(address_bits: int, waveform_count: int):
+    """Renders a minute of one waveform as audio (as 'wav2bin render' does)"""
+
+    from wav2bin.src.audition import render_wav
+
+    bank = filled_bank(address_bits, waveform_count)
+    data = bank.export_data()
+
+    return lambda: render_wav(data, os.devnull, bank.geometry, slots=[1], duration=60.0)
+
+
+# END def bench_render_wav() #
+
+
+@case("hex_view")
+def bench_hex_view(address_bits: int, waveform_count: int):
+    """Opens the exported data preview and pages through it (as 'PopupDialog.list_data' does)"""
+
+    from wav2bin.src.hex_view import HexRows
+
+    bank = filled_bank(address_bits, waveform_count)
+    data = bank.export_data()
+
+    # Opening the preview, then paging through it a screen at a time . . .
+    def view():
+        rows = HexRows(bank.geometry.pack(data), bank.geometry.bytes_per_sample)
+        for start in range(0, len(rows), max(1, len(rows) // 50)):
+            rows.format(start, start + 40)
+
+    return view
+
+
+# END def bench_hex_view() #
+
+
+def run_cases(pattern: str = None, quick: bool = False, repeats: int = REPEATS) -> OrderedDict:
+    """Runs every case (matching 'pattern') over each ROM depth and bank size
+
+    Keyword arguments:
+        :param pattern: Regular expression cases are matched against (all cases if None)
+        :param quick: Whether only the smallest depth and bank size are used
+        :param repeats: Number of times each case is timed
+
+    :returns: Dictionary of "case[depth=..,slots=..]" -> {"best": seconds, "median": seconds}
+    """
+
+    address_bits_list = ADDRESS_BITS[:1] if quick else ADDRESS_BITS
+    waveform_counts = WAVEFORM_COUNTS[:1] if quick else WAVEFORM_COUNTS
+
+    results = OrderedDict()
+    for name, setup in CASES.items():
+        if pattern is not None and not re.search(pattern, name):
+            continue
+
+        for address_bits in address_bits_list:
+            for waveform_count in waveform_counts:
+                key = "%s[depth=%d,slots=%d]" % (name, 1 << address_bits, waveform_count)
+
+                function = setup(address_bits, waveform_count)
+                times = timeit.repeat(function, number=1, repeat=repeats)
+                results[key] = {"best": min(times), "median": statistics.median(times)}
+
+                print("%-50s %12.3f ms" % (key, min(times) * 1e3), flush=True)
+
+    return results
+
+
+# END def run_cases() #
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """Finds cases slower than the baseline
+
+    Keyword arguments:
+        :param results: Results of 'run_cases'
+        :param baseline: Results stored earlier (cases missing from either are skipped)
+        :param tolerance: Factor of the baseline time a case is allowed to take
+
+    :returns: List of (key, seconds, baseline seconds) of every regression
+    """
+
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+
+        best, baseline_best = result["best"], baseline[key]["best"]
+        if best > baseline_best * tolerance and best - baseline_best > MIN_DIFFERENCE:
+            regressions.append((key, best, baseline_best))
+
+    return regressions
+
+
+# END def compare() #
+
+
+def machine() -> dict:
+    """Describes the machine results were taken on (kept alongside the results)"""
+
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__, "platform": platform.platform(),
+            "cpus": os.cpu_count()}
+
+
+# END def machine() #
+
+
+def main(argv: list = None) -> int:
+    """Runs the suite, writes the results, and compares them against the baseline
+
+    Keyword arguments:
+        :param argv: List of arguments
+
+    :returns: Exit status (1 if any case regressed)
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run cases matching this regular expression")
+    parser.add_argument("--quick", action='store_true', help="only use the smallest depth and bank size")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="times each case is timed")
+    parser.add_argument("-o", "--output", default=RESULTS_FILE, help="file results are written to")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="file of results compared against")
+    parser.add_argument("--save-baseline", action='store_true', help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="slowdown allowed (i.e. 1.25)")
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.pattern, args.quick, args.repeats)
+
+    with open(args.output, 'w') as f:
+        json.dump({"machine": machine(), "results": results}, f, indent=2)
+
+    if args.save_baseline:
+        # Cases not run this time keep their old baseline . . .
+        stored = OrderedDict()
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                stored = json.load(f, object_pairs_hook=OrderedDict)["results"]
+        stored.update(results)
+
+        with open(args.baseline, 'w') as f:
+            json.dump({"machine": machine(), "results": stored}, f, indent=2)
+
+        print("Baseline saved to %s" % args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline at %s (store one with --save-baseline)" % args.baseline)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    for key, best, baseline_best in regressions:
+        print("REGRESSION %-50s %10.3f ms (baseline %.3f ms, x%.2f)" %
+              (key, best * 1e3, baseline_best * 1e3, best / baseline_best))
+
+    if baseline.get("machine") != machine():
+        print("Baseline was taken on another machine (%s); times may not compare" %
+              baseline.get("machine", {}).get("platform"))
+
+    print("%d of %d cases regressed" % (len(regressions), len(results)))
+
+    return 1 if regressions else 0
+
+
+# END def main() #
+
+
+if __name__ == '__main__':
+    sys.exit(main())
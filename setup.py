@@ -92,6 +92,10 @@ setup(
       entry_points={
         'gui_scripts': [
                 'wav2bin = wav2bin.src.__main__:main'
+        ],
+        # Same entry point, but with a console (on Windows a gui script has none, so 'build' etc. print nothing) . . .
+        'console_scripts': [
+                'wav2bin-cli = wav2bin.src.__main__:main'
         ]
       },
       install_requires=REQUIRED,
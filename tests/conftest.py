@@ -0,0 +1,15 @@
+import pytest
+
+from wav2bin.src.history import History
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.waveform_bank import WaveformBank
+
+
+@pytest.fixture
+def bank():
+    """Small bank (8 waveforms of 256 x 8-bit samples) recording its history"""
+
+    return WaveformBank(waveform_count=8, geometry=RomGeometry(8, 8), history=History())
+
+
+# END def bank() #
@@ -0,0 +1,80 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from wav2bin.src.audition import pcm_table, render_wav, write_wav
+from wav2bin.src.rom_geometry import RomGeometry
+
+
+def random_data(geometry: RomGeometry, waveform_count: int = 3, seed: int = 0) -> np.ndarray:
+    """Exported data of random levels"""
+
+    levels = np.random.default_rng(seed).integers(0, geometry.y_max + 1, (waveform_count, geometry.depth))
+
+    return levels.astype(geometry.dtype)
+
+
+# END def random_data() #
+
+
+def test_wav_plays_every_sample():
+    """At 'sample_rate / depth' Hz each frame steps one address, so the audio is the table itself"""
+
+    geometry = RomGeometry(8, 8)
+    data = random_data(geometry, waveform_count=4)
+    rate = 44100
+
+    f = io.BytesIO()
+    frames = render_wav(data, f, geometry, slots=[2, 0], sample_rate=rate, frequency=rate / geometry.depth,
+                        duration=2 * geometry.depth / rate)
+    f.seek(0)
+
+    with wave.open(f, 'rb') as audio:
+        assert (audio.getnchannels(), audio.getsampwidth(), audio.getframerate()) == (1, 2, rate)
+        assert audio.getnframes() == frames == 4 * geometry.depth
+        samples = np.frombuffer(audio.readframes(frames), dtype='<i2')
+
+    table = pcm_table(data, geometry)
+    assert np.array_equal(samples, np.concatenate([table[2], table[2], table[0], table[0]]))
+
+
+# END def test_wav_plays_every_sample() #
+
+
+def test_wav_exporter_skips_flat_waveforms():
+    geometry = RomGeometry(8, 8)
+    data = random_data(geometry, waveform_count=3)
+    data[1] = 0
+
+    f = io.BytesIO()
+    written = write_wav(data, f, geometry)
+    assert written == len(f.getvalue())
+
+    f.seek(0)
+    with wave.open(f, 'rb') as audio:
+        frames_per_slot = audio.getnframes() // 2
+        samples = np.frombuffer(audio.readframes(audio.getnframes()), dtype='<i2')
+
+    # Second waveform played is slot 2 (slot 1 is flat) . . .
+    assert set(samples[frames_per_slot:]) <= set(pcm_table(data, geometry)[2])
+
+
+# END def test_wav_exporter_skips_flat_waveforms() #
+
+
+def test_bad_arguments_write_nothing(tmp_path):
+    geometry = RomGeometry(8, 8)
+    data = random_data(geometry)
+    path = tmp_path / "out.wav"
+
+    with pytest.raises(ValueError):
+        render_wav(data, str(path), geometry, slots=[5])
+    with pytest.raises(ValueError):
+        render_wav(data, str(path), geometry, frequency=30000)
+
+    assert not path.exists()
+
+
+# END def test_bad_arguments_write_nothing() #
@@ -0,0 +1,193 @@
+import io
+
+import numpy as np
+import pytest
+
+from wav2bin.src.exporters import EXPORTERS, find_exporter
+from wav2bin.src.rom_geometry import RomGeometry
+
+# Geometries covering 8-bit, odd-width big endian, and images past 64 KiB (extended/24-bit addresses) . . .
+GEOMETRIES = [RomGeometry(8, 8), RomGeometry(5, 12, 'big'), RomGeometry(16, 16)]
+
+
+def random_data(geometry: RomGeometry, waveform_count: int = 3, seed: int = 0) -> np.ndarray:
+    """Exported data of random levels"""
+
+    levels = np.random.default_rng(seed).integers(0, geometry.y_max + 1, (waveform_count, geometry.depth))
+
+    return levels.astype(geometry.dtype)
+
+
+# END def random_data() #
+
+
+def export(extension: str, data, geometry: RomGeometry) -> bytes:
+    """Writes data with an exporter, checking the number of bytes it says it wrote"""
+
+    f = io.BytesIO()
+    written = find_exporter('rom' + extension)(data, f, geometry)
+    assert written == len(f.getvalue())
+
+    return f.getvalue()
+
+
+# END def export() #
+
+
+def unpack(image: bytes, geometry: RomGeometry, shape: tuple) -> np.ndarray:
+    """Reads samples back out of a ROM image"""
+
+    return np.frombuffer(image, dtype=geometry.packed_dtype).reshape(shape)
+
+
+# END def unpack() #
+
+
+def read_intel_hex(text: bytes) -> bytes:
+    """Parses Intel HEX, checking every record's length and checksum"""
+
+    image = {}
+    upper = 0
+    lines = text.decode('ascii').splitlines()
+
+    for line in lines:
+        assert line[0] == ':'
+        record = bytes.fromhex(line[1:])
+        assert len(record) == record[0] + 5
+        assert sum(record) & 0xFF == 0
+
+        address, kind = (record[1] << 8) | record[2], record[3]
+        if kind == 0x00:
+            for i, value in enumerate(record[4:-1]):
+                image[upper + address + i] = value
+        elif kind == 0x04:
+            upper = int.from_bytes(record[4:6], 'big') << 16
+        else:
+            assert kind == 0x01 and line == lines[-1]
+
+    assert lines[-1] == ':00000001FF'
+
+    return bytes(image[address] for address in range(len(image)))
+
+
+# END def read_intel_hex() #
+
+
+def read_srec(text: bytes) -> tuple:
+    """Parses S-records, checking every record's length and checksum
+
+    :returns: Image and the record types used
+    """
+
+    image = {}
+    types = []
+
+    for line in text.decode('ascii').splitlines():
+        record = bytes.fromhex(line[2:])
+        assert len(record) == record[0] + 1
+        assert sum(record) & 0xFF == 0xFF
+
+        types.append(line[:2])
+        address_size = {'S1': 2, 'S2': 3, 'S3': 4}.get(line[:2])
+        if address_size is not None:
+            address = int.from_bytes(record[1:1 + address_size], 'big')
+            for i, value in enumerate(record[1 + address_size:-1]):
+                image[address + i] = value
+        elif line[:2] == 'S5':
+            assert int.from_bytes(record[1:-1], 'big') == sum(kind in ('S1', 'S2', 'S3') for kind in types)
+
+    return bytes(image[address] for address in range(len(image))), types
+
+
+# END def read_srec() #
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES, ids=repr)
+def test_bin_round_trip(geometry):
+    data = random_data(geometry)
+
+    assert np.array_equal(unpack(export('.bin', data, geometry), geometry, data.shape), data)
+
+
+# END def test_bin_round_trip() #
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES, ids=repr)
+def test_intel_hex_round_trip(geometry):
+    data = random_data(geometry)
+    text = export('.hex', data, geometry)
+
+    assert np.array_equal(unpack(read_intel_hex(text), geometry, data.shape), data)
+    assert (b':02000004' in text) == (data.nbytes > 2 ** 16)
+
+
+# END def test_intel_hex_round_trip() #
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES, ids=repr)
+def test_srec_round_trip(geometry):
+    data = random_data(geometry)
+    image, types = read_srec(export('.srec', data, geometry))
+
+    assert np.array_equal(unpack(image, geometry, data.shape), data)
+    assert types[0] == 'S0'
+    assert types[-1] == ('S9' if data.nbytes <= 2 ** 16 else 'S8')
+
+
+# END def test_srec_round_trip() #
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES, ids=repr)
+def test_readmemh_round_trip(geometry):
+    data = random_data(geometry)
+    lines = export('.mem', data, geometry).decode('ascii').splitlines()
+
+    assert lines[0].startswith('//')
+    assert np.array_equal(np.array([int(line, 16) for line in lines[1:]]), data.reshape(-1))
+
+
+# END def test_readmemh_round_trip() #
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES, ids=repr)
+def test_mif_round_trip(geometry):
+    data = random_data(geometry)
+    text = export('.mif', data, geometry).decode('ascii')
+
+    header, content = text.split('CONTENT BEGIN\n')
+    assert 'WIDTH=%d;' % geometry.data_bits in header
+    assert 'DEPTH=%d;' % data.size in header
+    assert content.endswith('END;\n')
+
+    pairs = [line.strip().rstrip(';').split(' : ') for line in content.splitlines()[:-1]]
+    assert [int(address, 16) for address, value in pairs] == list(range(data.size))
+    assert np.array_equal(np.array([int(value, 16) for address, value in pairs]), data.reshape(-1))
+
+
+# END def test_mif_round_trip() #
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES, ids=repr)
+def test_coe_round_trip(geometry):
+    data = random_data(geometry)
+    text = export('.coe', data, geometry).decode('ascii')
+
+    header, vector = text.split('memory_initialization_vector=\n')
+    assert 'memory_initialization_radix=16;' in header
+
+    values = vector.strip().split(',\n')
+    assert values[-1].endswith(';')
+    assert np.array_equal(np.array([int(value.rstrip(';'), 16) for value in values]), data.reshape(-1))
+
+
+# END def test_coe_round_trip() #
+
+
+def test_find_exporter():
+    assert find_exporter('ROM.HEX') is EXPORTERS['.hex'][1]
+
+    with pytest.raises(ValueError):
+        find_exporter('rom.txt')
+
+
+# END def test_find_exporter() #
@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+import pytest
+
+from wav2bin.src.expressions import compile_expression
+
+
+def t_points(bank) -> np.ndarray:
+    """Phase (0 to 2*pi) of every point of the bank's waveforms"""
+
+    return np.linspace(0, 2 * np.pi, bank.x_max - bank.x_min + 1)
+
+
+# END def t_points() #
+
+
+def test_expression_evaluates_over_t(bank):
+    t = t_points(bank)
+    y = compile_expression("0.5*sin(3*t) + 0.25*cos(t) - 2**-3").evaluate(bank)
+
+    assert np.allclose(y, 0.5 * np.sin(3 * t) + 0.25 * np.cos(t) - 0.125)
+
+
+# END def test_expression_evaluates_over_t() #
+
+
+def test_constant_expression_fills_the_waveform(bank):
+    y = compile_expression("7 % 4 / 6").evaluate(bank)
+
+    assert y.shape == t_points(bank).shape
+    assert np.all(y == 0.5)
+
+
+# END def test_constant_expression_fills_the_waveform() #
+
+
+def test_expression_reads_other_waveforms(bank):
+    bank.change_expression("sin(t)", False)
+    bank.current_waveform = 1
+
+    # Waveforms are read back scaled like functions (y_min -> -1, y_max -> 1) . . .
+    assert np.allclose(compile_expression("w[0] * 2").evaluate(bank), 2 * np.sin(t_points(bank)))
+
+
+# END def test_expression_reads_other_waveforms() #
+
+
+@pytest.mark.parametrize('text', ["__import__('os')",
+                                  "t.real",
+                                  "(lambda: 1)()",
+                                  "[t for t in t]",
+                                  "open('x')",
+                                  "sin(**{'x': t})",
+                                  "t if t else t",
+                                  "t < 1",
+                                  "t // 2",
+                                  "t << 2",
+                                  "'text'",
+                                  "w[t]",
+                                  "x + 1",
+                                  "sin(t"])
+def test_expression_outside_whitelist_is_rejected(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+# END def test_expression_outside_whitelist_is_rejected() #
+
+
+@pytest.mark.parametrize('text', ["9**9**9", "2**100000", "(10**10)**(10**10)"])
+def test_huge_power_fails_quickly(bank, text):
+    start = time.perf_counter()
+
+    with pytest.raises(ValueError):
+        compile_expression(text).evaluate(bank)
+
+    assert time.perf_counter() - start < 1.0
+
+
+# END def test_huge_power_fails_quickly() #
+
+
+@pytest.mark.parametrize('text, message', [("w[1]", "not been drawn"),
+                                           ("w[99]", "outside"),
+                                           ("1 / 0", "could not be evaluated"),
+                                           ("sin(t, nope=1)", "could not be evaluated")])
+def test_expression_errors_when_evaluated(bank, text, message):
+    with pytest.raises(ValueError, match=message):
+        compile_expression(text).evaluate(bank)
+
+
+# END def test_expression_errors_when_evaluated() #
@@ -0,0 +1,193 @@
+import numpy as np
+import pytest
+
+from wav2bin.src.history import History
+from wav2bin.src.waveform_bank import WaveformBank
+
+
+def snapshot(bank) -> list:
+    """Copies the points of every waveform (None for waveforms not drawn)"""
+
+    return [np.array(line.y) if line.drawn else None for line in bank.line_set]
+
+
+# END def snapshot() #
+
+
+def assert_same(found: list, expected: list):
+    """Undo and redo put points back exactly (not just close)"""
+
+    for found_y, expected_y in zip(found, expected):
+        if expected_y is None:
+            assert found_y is None
+        else:
+            assert found_y is not None and np.array_equal(found_y, expected_y)
+
+
+# END def assert_same() #
+
+
+# Edits of every kind the history records (affine, generated, and snapshots) . . .
+EDITS = [
+    lambda bank: bank.change_function("Sine", False, 1),
+    lambda bank: bank.change_amp(0.5),
+    lambda bank: bank.change_function("Square", True, 3),
+    lambda bank: bank.change_level(20),
+    lambda bank: bank.change_harmonics([1, 0.5, 0.25], None, True),
+    lambda bank: bank.change_function("Random", True, 1),
+    lambda bank: bank.change_expression("0.5*sin(2*t)", True),
+    lambda bank: bank.change_harmonics([0, 1], [0.5, 0], False),
+    lambda bank: bank.change_freq(2),
+]
+
+
+def test_undo_redo_every_kind_of_edit(bank):
+    states = [snapshot(bank)]
+
+    for edit in EDITS:
+        edit(bank)
+        states.append(snapshot(bank))
+
+    for state in reversed(states[:-1]):
+        assert bank.undo() == 0
+        assert_same(snapshot(bank), state)
+
+    assert bank.undo() is None
+
+    for state in states[1:]:
+        assert bank.redo() == 0
+        assert_same(snapshot(bank), state)
+
+    assert bank.redo() is None
+
+
+# END def test_undo_redo_every_kind_of_edit() #
+
+
+def test_undo_restores_the_right_slot(bank):
+    bank.change_function("Sine", False, 1)
+    bank.current_waveform = 3
+    bank.change_function("Sawtooth", False, 2)
+    before = snapshot(bank)
+
+    bank.current_waveform = 0
+    bank.change_amp(2)      # Overflows, so the waveform is rescaled too . . .
+
+    assert bank.undo() == 0
+    assert_same(snapshot(bank), before)
+    assert bank.undo() == 3
+    assert not bank.line_set[3].drawn
+    assert bank.line_set[0].drawn
+
+
+# END def test_undo_restores_the_right_slot() #
+
+
+def test_new_edit_clears_redo(bank):
+    bank.change_function("Sine", False, 1)
+    bank.change_level(10)
+    bank.undo()
+
+    assert bank.history.can_redo
+    bank.change_amp(0.5)
+    assert not bank.history.can_redo
+
+
+# END def test_new_edit_clears_redo() #
+
+
+def test_undo_is_byte_exact_after_extreme_scales():
+    bank = WaveformBank(history=History())
+    bank.change_function("Sine", False, 1.0)
+    original = bank.export_data()
+
+    bank.change_amp(1e-9)
+    bank.undo()
+    assert np.array_equal(bank.export_data(), original)
+
+    exported = [original]
+    for edit in (lambda: bank.change_amp(0.3), lambda: bank.change_amp(1e-3), lambda: bank.change_amp(-2.2),
+                 lambda: bank.change_level(40), lambda: bank.change_function("Square", True, 1),
+                 lambda: bank.change_freq(3), lambda: bank.change_amp(1e-6), lambda: bank.change_amp(1e6)):
+        edit()
+        exported.append(bank.export_data())
+
+    for data in reversed(exported[:-1]):
+        bank.undo()
+        assert np.array_equal(bank.export_data(), data)
+
+    for data in exported[1:]:
+        bank.redo()
+        assert np.array_equal(bank.export_data(), data)
+
+
+# END def test_undo_is_byte_exact_after_extreme_scales() #
+
+
+def test_undo_is_exact_whether_or_not_points_were_used_between_edits(bank):
+    bank.change_function("Sine", False, 1)
+    original = snapshot(bank)
+
+    for amp, level in ((0.3, 7.25), (1e-7, 100), (3e6, -1e8)):
+        bank.change_amp(amp)
+        bank.change_level(level)
+        bank.line_set[0].y  # Applies the pending scale and offset (as drawing the waveform does) . . .
+
+    for undo in range(6):
+        bank.undo()
+    assert_same(snapshot(bank), original)
+
+
+# END def test_undo_is_exact_whether_or_not_points_were_used_between_edits() #
+
+
+def test_scaling_shares_the_points_once(bank):
+    """A run of amplitude and level changes shares the slot's points, counted once however many share them"""
+
+    bank.change_function("Sine", False, 1)
+    held = bank.history.nbytes
+
+    for repeat in range(4):
+        bank.change_amp(0.5)
+        bank.change_level(-10)
+    assert bank.history.nbytes - held < bank.line_set[0].y.nbytes + 1024
+
+
+# END def test_scaling_shares_the_points_once() #
+
+
+@pytest.mark.parametrize('edit', [lambda bank: bank.change_function("Cosine", True, 4),
+                                  lambda bank: bank.change_harmonics([0, 0, 1], None, True)])
+def test_mix_holds_only_the_points_before(bank, edit):
+    bank.change_function("Sine", False, 1)
+    held = bank.history.nbytes
+
+    edit(bank)
+    assert bank.history.nbytes - held < 2 * bank.line_set[0].y.nbytes
+
+
+# END def test_mix_holds_only_the_points_before() #
+
+
+def test_overwriting_with_a_function_holds_only_the_points_replaced(bank):
+    bank.change_function("Sine", False, 1)
+    held = bank.history.nbytes
+
+    bank.change_function("Square", False, 2)
+    assert bank.history.nbytes - held < 2 * bank.line_set[0].y.nbytes
+
+
+# END def test_overwriting_with_a_function_holds_only_the_points_replaced() #
+
+
+def test_edit_that_changes_nothing_isnt_recorded(bank):
+    bank.change_function("Sine", False, 1)
+    bank.change_amp(1.0)
+    bank.change_level(0.0)
+
+    bank.undo()
+    assert not bank.line_set[0].drawn
+    assert not bank.history.can_undo
+
+
+# END def test_edit_that_changes_nothing_isnt_recorded() #
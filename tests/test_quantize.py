@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from wav2bin.src.quantize import QUANTIZERS, quantize, quantization_report
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.waveform_bank import WaveformBank
+
+
+def sine_rows(rows: int = 4, size: int = 1024, y_max: int = 255) -> np.ndarray:
+    """Sines of a few frequencies reaching past both rails (so clipping is tested too)"""
+
+    t = np.linspace(0, 2 * np.pi, size, endpoint=False)
+    frequencies = np.arange(1, rows + 1)[:, np.newaxis]
+
+    return y_max / 2 + 0.55 * y_max * np.sin(frequencies * t)
+
+
+# END def sine_rows() #
+
+
+@pytest.mark.parametrize('method', list(QUANTIZERS))
+def test_levels_are_whole_and_in_range(method):
+    levels = quantize(sine_rows(), 0, 255, method)
+
+    assert levels.shape == (4, 1024)
+    assert np.all(levels == np.rint(levels))
+    assert levels.min() == 0 and levels.max() == 255
+
+
+# END def test_levels_are_whole_and_in_range() #
+
+
+@pytest.mark.parametrize('method', list(QUANTIZERS))
+def test_error_stays_small_away_from_the_rails(method):
+    y = 127.5 + 100 * np.sin(np.linspace(0, 2 * np.pi, 4096, endpoint=False))[np.newaxis]
+    levels = quantize(y, 0, 255, method)
+
+    # Error is at most half a level when rounded, and a few levels with dither (or shaped dither) . . .
+    assert np.abs(levels - y).max() <= (0.5 if method == "Round" else 4)
+    assert abs((levels - y).mean()) < 0.1
+
+
+# END def test_error_stays_small_away_from_the_rails() #
+
+
+@pytest.mark.parametrize('method', list(QUANTIZERS))
+def test_seed_reproduces_levels(method):
+    np.random.seed(1234)
+    first = quantize(sine_rows(), 0, 255, method)
+    np.random.seed(1234)
+    again = quantize(sine_rows(), 0, 255, method)
+    np.random.seed(4321)
+    other = quantize(sine_rows(), 0, 255, method)
+
+    assert np.array_equal(first, again)
+    assert np.array_equal(first, other) == (method == "Round")
+
+
+# END def test_seed_reproduces_levels() #
+
+
+def test_export_uses_the_banks_quantizer():
+    bank = WaveformBank(waveform_count=4, geometry=RomGeometry(10, 8))
+    bank.change_function("Sine", False, 1)
+    bank.current_waveform = 2
+    bank.change_function("Sawtooth", False, 3)
+
+    for method in QUANTIZERS:
+        bank.quantizer = method
+        np.random.seed(0)
+        data, report = bank.export_data(report=True)
+
+        assert data.dtype == bank.geometry.dtype
+        assert report["slots"] == [0, 2]
+        assert np.all(data[[1, 3]] == bank.y_min)
+        assert np.all(report["snr"] > 30)
+
+
+# END def test_export_uses_the_banks_quantizer() #
+
+
+def test_report_of_exact_levels():
+    y = np.array([[0.0, 1.0, 2.0, 3.0]])
+    report = quantization_report(y, quantize(y, 0, 3))
+
+    assert np.isinf(report["snr"][0])
+    assert report["max_error"][0] == 0
+
+
+# END def test_report_of_exact_levels() #
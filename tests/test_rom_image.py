@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.rom_image import RomImage
+from wav2bin.src.waveform_bank import WaveformBank
+
+
+@pytest.fixture
+def image_file(tmp_path) -> str:
+    """Writes a .bin image of 8 waveforms (8-bit addresses and data), each slot holding different levels"""
+
+    path = str(tmp_path / "image.bin")
+    (np.arange(8 * 256) % 251).astype(np.uint8).tofile(path)
+
+    return path
+
+
+# END def image_file() #
+
+
+def open_image(file_name: str) -> tuple:
+    """Opens an image and attaches it to a new bank
+
+    :returns: 'RomImage' and 'WaveformBank' attached to it
+    """
+
+    image = RomImage(file_name, RomGeometry(8, 8))
+    bank = WaveformBank(waveform_count=len(image), geometry=image.geometry)
+    image.attach(bank)
+
+    return image, bank
+
+
+# END def open_image() #
+
+
+def test_opened_image_round_trips_unchanged(image_file):
+    with open(image_file, 'rb') as file:
+        original = file.read()
+
+    image, bank = open_image(image_file)
+
+    assert bank.export_data().tobytes() == original
+    assert image.write_back(bank) == []
+    image.close()
+
+    with open(image_file, 'rb') as file:
+        assert file.read() == original
+
+
+# END def test_opened_image_round_trips_unchanged() #
+
+
+def test_write_back_writes_only_touched_slots(image_file):
+    original = np.fromfile(image_file, dtype=np.uint8).reshape(8, 256)
+    image, bank = open_image(image_file)
+
+    bank.line_set[5].y  # Reading a slot doesn't touch it . . .
+    for slot in (1, 3):
+        bank.current_waveform = slot
+        bank.change_level(2)
+
+    assert image.write_back(bank) == [1, 3]
+    assert image.write_back(bank) == []
+    image.close()
+
+    written = np.fromfile(image_file, dtype=np.uint8).reshape(8, 256)
+    assert np.array_equal(written[[1, 3]], original[[1, 3]] + 2)
+    assert np.array_equal(np.delete(written, [1, 3], axis=0), np.delete(original, [1, 3], axis=0))
+
+
+# END def test_write_back_writes_only_touched_slots() #
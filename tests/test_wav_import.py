@@ -0,0 +1,113 @@
+import wave
+
+import numpy as np
+import pytest
+
+from wav2bin.src.harmonics import decompose
+from wav2bin.src.wav_import import detect_period, find_wavs, import_directory, import_wav, load_wav_table
+
+
+@pytest.fixture
+def write_tone(tmp_path):
+    """Writes 16-bit mono .wav files of a tone (fundamental plus a third of its second harmonic)
+
+    :returns: Function taking (name, frequency, seconds, rate) and returning the path written
+    """
+
+    def write(name: str = "tone.wav", frequency: float = 440.0, seconds: float = 0.5, rate: int = 44100) -> str:
+        t = np.arange(int(seconds * rate)) / rate
+        signal = np.sin(2 * np.pi * frequency * t) + np.sin(4 * np.pi * frequency * t) / 3
+
+        path = str(tmp_path / name)
+        with wave.open(path, 'wb') as audio:
+            audio.setnchannels(1)
+            audio.setsampwidth(2)
+            audio.setframerate(rate)
+            audio.writeframes(np.rint(signal * 20000).astype('<i2').tobytes())
+
+        return path
+
+    return write
+
+
+# END def write_tone() #
+
+
+@pytest.mark.parametrize('frequency, rate', [(440.0, 44100), (110.0, 48000), (1234.5, 44100), (55.0, 22050)])
+def test_period_of_tone(frequency, rate):
+    t = np.arange(int(0.25 * rate)) / rate
+    signal = np.sin(2 * np.pi * frequency * t) + 0.5 * np.sin(6 * np.pi * frequency * t + 1)
+
+    assert detect_period(signal, rate) == pytest.approx(rate / frequency, rel=1e-3)
+
+
+# END def test_period_of_tone() #
+
+
+def test_period_ignores_strong_harmonic():
+    """A second harmonic louder than the fundamental still gives the fundamental's period"""
+
+    rate = 44100
+    t = np.arange(rate // 4) / rate
+    signal = 0.4 * np.sin(2 * np.pi * 200 * t) + np.sin(4 * np.pi * 200 * t)
+
+    assert detect_period(signal, rate) == pytest.approx(rate / 200, rel=1e-3)
+
+
+# END def test_period_ignores_strong_harmonic() #
+
+
+def test_period_of_silence_or_short_recording():
+    with pytest.raises(ValueError, match="silent"):
+        detect_period(np.zeros(10000), 44100)
+
+    with pytest.raises(ValueError, match="too short"):
+        detect_period(np.ones(4), 44100)
+
+
+# END def test_period_of_silence_or_short_recording() #
+
+
+def test_table_is_one_period(write_tone):
+    table = load_wav_table(write_tone(frequency=440.0), 256, start=0.1, periods=4)
+    magnitudes, phases, offsets = decompose(table, 4)
+
+    assert table.shape == (256,)
+    assert magnitudes / magnitudes[0] == pytest.approx([1, 1 / 3, 0, 0], abs=0.01)
+    assert abs(offsets) < 0.01
+
+
+# END def test_table_is_one_period() #
+
+
+def test_import_into_bank(bank, write_tone):
+    import_wav(bank, write_tone(), mix_func=False)
+
+    assert bank.line_set[0].drawn
+    assert bank.line_set[0].y.min() >= bank.y_min and bank.line_set[0].y.max() <= bank.y_max
+
+    bank.undo()
+    assert not bank.line_set[0].drawn
+
+
+# END def test_import_into_bank() #
+
+
+def test_import_directory(bank, write_tone, tmp_path):
+    for name, frequency in (("b.wav", 220.0), ("a.WAV", 330.0), ("c.txt", 0)):
+        if frequency:
+            write_tone(name, frequency)
+        else:
+            (tmp_path / name).write_text("not audio")
+
+    file_names = import_directory(bank, str(tmp_path), first_slot=2, jobs=1)
+
+    assert [name.rsplit('/', 1)[-1] for name in file_names] == ["a.WAV", "b.wav"]
+    assert find_wavs(str(tmp_path)) == file_names
+    assert bank.line_set.drawn_slots() == [2, 3]
+
+    with pytest.raises(ValueError):
+        import_directory(bank, file_names, first_slot=7)
+
+
+# END def test_import_directory() #
@@ -1,4 +1,29 @@
-from wav2bin.src.graphic_interface import *
-from wav2bin.src.draw_graph import *
 from wav2bin.src.helper_functions import *
-from wav2bin.src.splash_screen import *
+from wav2bin.src.rom_geometry import *
+from wav2bin.src.waveform_bank import *
+
+# GUI modules pull in matplotlib and tkinter, so they are only imported once referenced . . .
+GUI_MODULES = ('wav2bin.src.graphic_interface',
+               'wav2bin.src.draw_graph',
+               'wav2bin.src.splash_screen')
+
+
+def __getattr__(name: str):
+    """Looks up names from the GUI modules on first use
+
+    Keyword arguments:
+        :param name: Name of attribute being accessed
+
+    :returns: Attribute found within a GUI module
+    """
+
+    import importlib
+
+    for module_name in GUI_MODULES:
+        module = importlib.import_module(module_name)
+        if hasattr(module, name):
+            return getattr(module, name)
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+# END def __getattr__() #
@@ -1,24 +1,75 @@
-import tkinter as tk
-from wav2bin.src.graphic_interface import GraphicInterface
-from wav2bin.src.splash_screen import SplashScreen
+import multiprocessing
+import sys
+import threading
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+BUILD_COMMAND = 'build'
+IMPORT_COMMAND = 'import'
+RENDER_COMMAND = 'render'
+
+
+def load_graph_tool(loaded: dict):
+    """Imports the GUI modules and creates the graph tool (run in the background while the splash is up)
+
+    Keyword arguments:
+        :param loaded: Dictionary the 'DrawGraph' object is stored in (under 'graph_tool')
+    """
+
+    from wav2bin.src import graphic_interface
+
+    loaded['graph_tool'] = graphic_interface.DrawGraph()
+
+# END def load_graph_tool() #
 
 
 def main():
-    """Generates UI for the user"""
+    """Generates UI for the user (or runs 'wav2bin build' / 'import' / 'render' without any UI)
+
+    :returns: Exit status
+    """
+
+    # Worker processes (pdf reports, builds) start here when the program is frozen into an executable . . .
+    multiprocessing.freeze_support()
+
+    # Building from spec files (or importing/rendering audio) never touches tkinter or matplotlib . . .
+    if sys.argv[1:2] == [BUILD_COMMAND]:
+        from wav2bin.src.rom_builder import main as build_main
+        return build_main(sys.argv[2:])
+
+    if sys.argv[1:2] == [IMPORT_COMMAND]:
+        from wav2bin.src.wav_import import main as import_main
+        return import_main(sys.argv[2:])
+
+    if sys.argv[1:2] == [RENDER_COMMAND]:
+        from wav2bin.src.audition import main as render_main
+        return render_main(sys.argv[2:])
+
+    import tkinter as tk
+    from wav2bin.src.splash_screen import SplashScreen
 
     root = tk.Tk()
 
-    # Shows splash for a short time . . .
+    # Shows splash while the rest of the program loads . . .
+    loaded = {}
+    loader = threading.Thread(target=load_graph_tool, args=(loaded,), daemon=True)
+
     UI = SplashScreen(root)
     UI.add_features()
+    UI.close_when_loaded(loader)
     UI.mainloop()
 
+    loader.join()   # Splash may have been closed early . . .
+
+    from wav2bin.src.graphic_interface import GraphicInterface
+
     # After splash, goes to program . . .
-    UI = GraphicInterface(root)     # Creates graphics object . . .
+    UI = GraphicInterface(root, graph_tool=loaded.get('graph_tool'))   # Creates graphics object . . .
     UI.add_features()               # Adds graph, buttons, options, etc . . .
     UI.mainloop()                   # Starts UI . . .
 
+    return 0
+
 
 # Program begins execution here . . .
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
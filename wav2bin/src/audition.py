@@ -0,0 +1,231 @@
+import argparse
+import sys
+import wave
+
+import numpy as np
+
+from wav2bin.src.rom_geometry import RomGeometry
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+SAMPLE_RATE = 44100
+TONE_FREQUENCY = 440.0      # Times each waveform is played through per second . . .
+SLOT_DURATION = 2.0         # Seconds each waveform is played for . . .
+
+ACCUMULATOR_BITS = 32       # Width of the phase accumulator (the top bits address the ROM, as in a DDS) . . .
+CHUNK_FRAMES = 2 ** 16      # Frames rendered at a time (memory used doesn't grow with the length) . . .
+PCM_PEAK = 2 ** 15 - 1
+
+
+def pcm_table(data, geometry: RomGeometry) -> np.ndarray:
+    """Converts ROM samples into 16-bit audio, as the DAC would play them (centered on its mid point)
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param geometry: 'RomGeometry' the points were exported for
+
+    :returns: 2-D array of int16 samples (one row per waveform)
+    """
+
+    mid_point = geometry.y_max / 2
+    table = (np.asarray(data, dtype=np.float64) - mid_point) * (PCM_PEAK / mid_point)
+
+    return np.rint(table).astype(np.int16).reshape(-1, geometry.depth)
+
+
+# END def pcm_table() #
+
+
+def audible_slots(data) -> list:
+    """Finds the waveforms which aren't flat (flat ones, such as slots never drawn, are silent)
+
+    Keyword arguments:
+        :param data: 2-D array of points (one row per waveform)
+
+    :returns: List of slot indexes (just the first slot if every one is flat)
+    """
+
+    data = np.asarray(data)
+    audible = np.flatnonzero(data.min(axis=1) != data.max(axis=1)).tolist()
+
+    return audible if audible else [0]
+
+
+# END def audible_slots() #
+
+
+def render_frames(table, slots: list, sample_rate: int = SAMPLE_RATE, frequency: float = TONE_FREQUENCY,
+                  duration: float = SLOT_DURATION, chunk_frames: int = CHUNK_FRAMES):
+    """Plays waveforms in turn through a phase accumulator, yielding the audio a chunk at a time
+
+    Every frame the accumulator steps by 'frequency / sample_rate' of a whole waveform, and its top bits pick
+    the ROM address played (the sample is held until the address changes, like a DAC). The accumulator keeps
+    running from one waveform to the next, so changing waveforms doesn't click.
+
+    Keyword arguments:
+        :param table: 2-D array of samples (one row per waveform, 2 ** address_bits samples each)
+        :param slots: List of waveforms played, in order
+        :param sample_rate: Frames per second
+        :param frequency: Times each waveform is played through per second
+        :param duration: Seconds each waveform is played for
+        :param chunk_frames: Frames yielded at a time
+
+    :returns: Generator of 1-D arrays of samples
+    """
+
+    # Arguments are checked now, rather than once the first chunk is asked for . . .
+    if not 0 < frequency < sample_rate / 2:
+        raise ValueError("frequency must be between 0 and half the sample rate (%g Hz)" % (sample_rate / 2))
+    if not slots or not (0 <= min(slots) and max(slots) < len(table)):
+        raise ValueError("slots must be between 0 and %d" % (len(table) - 1))
+
+    return _render_chunks(table, slots, sample_rate, frequency, duration, chunk_frames)
+
+
+# END def render_frames() #
+
+
+def render_wav(data, f, geometry: RomGeometry, slots: list = None, sample_rate: int = SAMPLE_RATE,
+               frequency: float = TONE_FREQUENCY, duration: float = SLOT_DURATION) -> int:
+    """Writes waveforms as 16-bit mono audio, each played on a loop in turn
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) or name of file being written to
+        :param geometry: 'RomGeometry' the points were exported for
+        :param slots: List of waveforms played, in order (defaults to every waveform that isn't flat)
+        :param sample_rate: Frames per second
+        :param frequency: Times each waveform is played through per second
+        :param duration: Seconds each waveform is played for
+
+    :returns: Number of frames written
+    """
+
+    table = pcm_table(data, geometry)
+    if slots is None:
+        slots = audible_slots(data)
+
+    chunks = render_frames(table, slots, sample_rate, frequency, duration)
+
+    written = 0
+    with wave.open(f, 'wb') as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(2)
+        audio.setframerate(sample_rate)
+
+        # Length is known up front, so the header never has to be gone back to . . .
+        audio.setnframes(max(1, int(round(duration * sample_rate))) * len(slots))
+
+        for frames in chunks:
+            audio.writeframesraw(frames.astype('<i2', copy=False).tobytes())
+            written += frames.size
+
+    return written
+
+
+# END def render_wav() #
+
+
+def write_wav(data, f, geometry: RomGeometry) -> int:
+    """Writes exported waveform data as audio (every waveform that isn't flat, in turn), for 'EXPORTERS'
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) being written to
+        :param geometry: 'RomGeometry' used for the points
+
+    :returns: Number of bytes written
+    """
+
+    return 44 + 2 * render_wav(data, f, geometry)
+
+
+# END def write_wav() #
+
+
+def main(argv: list = None) -> int:
+    """Command line entry for 'wav2bin render'
+
+    Keyword arguments:
+        :param argv: List of arguments (after 'render')
+
+    :returns: Exit status
+    """
+
+    from wav2bin.src.project import Project, PROJECT_EXTENSION
+    from wav2bin.src.rom_image import RomImage
+    from wav2bin.src.waveform_bank import WaveformBank
+
+    parser = argparse.ArgumentParser(prog="wav2bin render",
+                                     description="Plays waveforms of a ROM image (or project) into a .wav file.")
+    parser.add_argument("image", help=".bin image or project (%s)" % PROJECT_EXTENSION)
+    parser.add_argument("-o", "--output", required=True, help=".wav file written")
+    parser.add_argument("-s", "--slot", type=int, action='append', dest='slots',
+                        help="waveform played (repeat to play several in turn; defaults to every one drawn)")
+    parser.add_argument("--rate", type=int, default=SAMPLE_RATE, help="sample rate (in Hz)")
+    parser.add_argument("--frequency", type=float, default=TONE_FREQUENCY, help="tone frequency (in Hz)")
+    parser.add_argument("--duration", type=float, default=SLOT_DURATION, help="seconds each waveform is played")
+    parser.add_argument("--address-bits", type=int, default=RomGeometry().address_bits)
+    parser.add_argument("--data-bits", type=int, default=RomGeometry().data_bits)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.image.endswith(PROJECT_EXTENSION):
+            rom_image = Project(args.image, mode='r')
+        else:
+            rom_image = RomImage(args.image, RomGeometry(args.address_bits, args.data_bits), mode='r')
+
+        bank = WaveformBank(waveform_count=len(rom_image), geometry=rom_image.geometry)
+        rom_image.attach(bank)
+        data = bank.export_data()
+        rom_image.close()
+
+        frames = render_wav(data, args.output, bank.geometry, args.slots, args.rate, args.frequency, args.duration)
+
+    except (OSError, ValueError, KeyError) as error:
+        print("wav2bin render: %s" % error, file=sys.stderr)
+        return 1
+
+    print("%s: %.1f s" % (args.output, frames / args.rate))
+
+    return 0
+
+
+# END def main() #
+
+
+def _render_chunks(table, slots: list, sample_rate: int, frequency: float, duration: float, chunk_frames: int):
+    """Generator behind 'render_frames' (see it for the arguments)"""
+
+    depth = table.shape[1]
+    address_bits = depth.bit_length() - 1
+
+    mask = np.uint64((1 << ACCUMULATOR_BITS) - 1)
+    shift = np.uint64(ACCUMULATOR_BITS - address_bits)
+    increment = np.uint64(max(1, round(frequency * (1 << ACCUMULATOR_BITS) / sample_rate)))
+
+    frames_per_slot = max(1, int(round(duration * sample_rate)))
+    total = frames_per_slot * len(slots)
+
+    # Each chunk's phases are the accumulator plus these steps (worked out once) . . .
+    steps = np.arange(chunk_frames, dtype=np.uint64) * increment
+    rows = np.asarray(slots, dtype=np.int64) * depth
+    flat_table = table.reshape(-1)
+
+    phase = np.uint64(0)
+    for start in range(0, total, chunk_frames):
+        frames = min(chunk_frames, total - start)
+
+        addresses = ((phase + steps[:frames]) & mask) >> shift
+        first_slot, last_slot = start // frames_per_slot, (start + frames - 1) // frames_per_slot
+
+        # Chunks within one waveform skip working out the waveform of every frame . . .
+        if first_slot == last_slot:
+            yield flat_table[rows[first_slot] + addresses.astype(np.int64)]
+        else:
+            frame_rows = rows[np.arange(start, start + frames) // frames_per_slot]
+            yield flat_table[frame_rows + addresses.astype(np.int64)]
+
+        phase = (phase + np.uint64(frames) * increment) & mask
+
+
+# END def _render_chunks() #
@@ -1,50 +1,50 @@
-import matplotlib
-
-matplotlib.use('TkAgg')
-from matplotlib import pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 
 import numpy as np
-import scipy.signal
-import warnings
 
-from collections import OrderedDict
+from collections import deque
+from time import perf_counter
 
-warnings.simplefilter('ignore', np.RankWarning)  # Turns off warning for large polynomial degrees . . .
+from wav2bin.src.history import History
+from wav2bin.src.instrumentation import traced, mark_latency
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.stroke_fit import fit_stroke, FIT_METHODS, DEFAULT_FIT
+from wav2bin.src.waveform_bank import WaveformBank, LinePoints, FUNCTIONS, WAVEFORM_COUNT, recorded
 
 # The variables below are set for quick changes without the hassle of sifting through code . . .
-POLY_DEG = 25
-
 x_AXIS_TITLE = "Sample # (ROM Address)"
 y_AXIS_TITLE = "Amplitude"
 
-x_MIN, x_MAX = 0, 255
-y_MIN, y_MAX = 0, 255
-
 x_MINOR_TICKS, x_MAJOR_TICKS = 61, 4
 y_MINOR_TICKS, y_MAJOR_TICKS = 29, 8
 
-WAVEFORM_COUNT = 32
-
-DRAW_WINDOW = 1.5  # Used to give user leeway when drawing on graph . . .
+DRAW_WINDOW = 0.006  # Fraction of the x axis used to give user leeway when drawing on graph . . .
 
-PAGES = 4
-FIG_COUNT = 8
+FRAME_TIME = 16                 # Milliseconds between redraws while hand drawing (about 60 per second) . . .
+DRAW_LATENCY_TARGET = 0.033     # Seconds from mouse event to paint aimed for while hand drawing . . .
+LATENCY_HISTORY = 512           # Number of event-to-paint latencies kept . . .
 
 
-class DrawGraph(object):
-    """Used in conjunction with tkinter to allow hand-drawn graphs to be generated
+class DrawGraph(WaveformBank):
+    """Used in conjunction with tkinter to allow hand-drawn graphs to be generated (wraps 'WaveformBank')
 
     Components:
         :param self.__Enter_cid: CID for entering axis
         :param self.__Exit_cid: CID for exiting axis
         :param self.__Motion_cid: CID for moving mouse
+        :param self.__background: Cached plot (without the line) used for blitting while hand drawing
+        :param self.__event_time: Time of the oldest mouse event not yet painted
+        :param self.__frame_timer: Timer which paints the line at most once per FRAME_TIME
         :param self.ax: Holds the axis within self.fig
         :param self.canvas: The visual plot on top of self.ax
         :param self.current_waveform: Index to keep track of current waveform
         :param self.current_x: Temp variable for hand drawing (for x)
+        :param self.draw_latencies: Recent event-to-paint latencies (in seconds) while hand drawing
         :param self.current_y: Temp variable for hand drawing (for y)
         :param self.fig: Holds figure lines will be in
+        :param self.fit_method: Name of fit (from 'FIT_METHODS') used for hand-drawn strokes
+        :param self.geometry: 'RomGeometry' describing the ROM being built
+        :param self.history: 'History' of changes made (used for undo/redo)
         :param self.line: Line plotted on axis
         :param self.line_set: List of 'LinePoints' objects
         :param self.x_max: Upper x bound
@@ -54,35 +54,32 @@ class DrawGraph(object):
         :param self.y_min: Lower y bound
     """
 
-    def __init__(self):
-        """ Initializes all necessary variables """
+    def __init__(self, geometry: RomGeometry = None, waveform_count: int = WAVEFORM_COUNT):
+        """ Initializes all necessary variables
+
+        Keyword arguments:
+            :param geometry: 'RomGeometry' used (defaults to 256 addresses of 8-bit data)
+            :param waveform_count: Number of waveforms held
+        """
+
+        WaveformBank.__init__(self, waveform_count=waveform_count, geometry=geometry, history=History())
 
-        self.fig = plt.figure()     # Generates a figure for the plot to lie on . . .
+        self.fig = Figure()     # Generates a figure for the plot to lie on (canvas is added by the GUI) . . .
 
         self.ax = create_graph(x_axis=x_AXIS_TITLE, y_axis=y_AXIS_TITLE,
-                               x_min=x_MIN, x_max=x_MAX,
-                               y_min=y_MIN, y_max=y_MAX,
+                               x_min=self.x_min, x_max=self.x_max,
+                               y_min=self.y_min, y_max=self.y_max,
                                x_major_ticks=x_MAJOR_TICKS, x_minor_ticks=x_MINOR_TICKS,
                                y_major_ticks=y_MAJOR_TICKS, y_minor_ticks=y_MINOR_TICKS,
                                fig=self.fig, subplot_section=[1, 1, 1])
 
-        # The minimum/maximum values for x and y plot points are recorded . . .
-        self.x_min = x_MIN
-        self.x_max = x_MAX
-        self.y_min = y_MIN
-        self.y_max = y_MAX
-
-        self.y_mid_point = (self.y_max + self.y_min) / 2
-
-        # To better differentiate plot points, a list of lines are kept . . .
-        self.line_set = [LinePoints() for i in range(WAVEFORM_COUNT)]
-
         self.line = self.ax.plot(0, 0)[0]  # Returns 1st (and only) line generated to graph . . .
 
         # Components not yet initialized in this class are listed below . . .
 
         self.canvas = None  # Canvas used for the user to draw graph on . . .
-        self.current_waveform = None  # Index used for keeping track of working waveform . . .
+
+        self.fit_method = DEFAULT_FIT  # Name of fit used on the next hand-drawn stroke . . .
 
         # Each event id is tracked for enabling/disabling proper events . . .
         self.__Motion_cid = None
@@ -93,145 +90,91 @@ class DrawGraph(object):
         self.current_x = None
         self.current_y = None
 
+        # Variables used to keep hand drawing responsive . . .
+        self.__background = None
+        self.__frame_timer = None
+        self.__event_time = None
+        self.draw_latencies = deque(maxlen=LATENCY_HISTORY)
+
     # END def __init__() #
 
-    def change_amp(self, amp: float):
-        """Changes the current waveform's amplitude
+    def change_function(self, name: str, mix_func: bool, cycles: float, wav_num: int = None) -> bool:
+        """Changes the current waveform by either mixing or overwriting waveform with function
 
         Keyword arguments:
-            :param amp: Amplitude factor used
-        """
+            :param name: Name of function being used
+            :param mix_func: Boolean used to control whether user mixes function or not
+            :param cycles: Provides number of cycles function will happen
+            :param wav_num: Used to index another waveform user created
 
-        # Multiplies given amplitude to the data . . .
-        self.line_set[self.current_waveform].y *= amp
+        :returns: Whether or not the current waveform was changed
+        """
 
-        # Changes if data is still in bounds (and takes action, if needed) . . .
-        self.__check_plot_details()
+        if not WaveformBank.change_function(self, name=name, mix_func=mix_func, cycles=cycles, wav_num=wav_num):
+            return False  # Does nothing if waveform was left untouched . . .
 
-    # END def change_amp() #
+        # Drawing is disabled once a waveform has been created . . .
+        if self.__Enter_cid is not None:
+            self.canvas.mpl_disconnect(self.__Enter_cid)
+            self.__Enter_cid = None
 
-    def change_freq(self, freq: int):
-        """Changes the current waveform's frequency
+        self.plot_current_data()
 
-        Keyword arguments:
-            :param freq: Frequency factor used
-        """
+        return True
 
-        append_data = 0  # Used for appending any missing points . . .
-        y_point = 0  # Keeps track of new y data point . . .
-        y_array = np.array([])  # Keeps track of set of new y data points . . .
+    # END def change_function() #
 
-        # Performs an averaging of the data points for frequency change . . .
-        for i in range(self.x_max - self.x_min + 1):
-            y_point += self.line_set[self.current_waveform].y[i]
+    def change_harmonics(self, magnitudes, phases=None, mix_func: bool = False):
+        """Changes the current waveform by either mixing or overwriting waveform with harmonics
 
-            if (i + 1) % freq == 0:  # Captures set of points and puts them in np.array . . .
-                y_array = np.append(y_array, [y_point / freq])
-                y_point = 0
+        Keyword arguments:
+            :param magnitudes: Magnitudes of harmonics 1, 2, ...
+            :param phases: Phases (in radians) of each harmonic (defaults to 0)
+            :param mix_func: Boolean used to control whether user mixes harmonics or not
+        """
 
-        # Creates any multiple copies of line for frequency change . . .
-        self.line_set[self.current_waveform].y = np.tile(y_array, [freq])
+        WaveformBank.change_harmonics(self, magnitudes=magnitudes, phases=phases, mix_func=mix_func)
 
-        # Fills in any missing data points (if needed) . . .
-        while self.line_set[self.current_waveform].y.size < (self.x_max - self.x_min + 1):
-            self.line_set[self.current_waveform].y = np.append(self.line_set[self.current_waveform].y,
-                                                               self.line_set[self.current_waveform].y[append_data])
-            append_data += 1
+        # Drawing is disabled once a waveform has been created . . .
+        if self.__Enter_cid is not None:
+            self.canvas.mpl_disconnect(self.__Enter_cid)
+            self.__Enter_cid = None
 
-        # Changes if data is still in bounds (and takes action, if needed) . . .
-        self.__check_plot_details()
+        self.plot_current_data()
 
-    # END def change_freq() #
+    # END def change_harmonics() #
 
-    def change_function(self, name: str, mix_func: bool, cycles: float, wav_num: int = None):
-        """Changes the current waveform by either mixing or overwriting waveform with function
+    def change_wav(self, file_name: str, mix_func: bool = False, start: float = 0.0, duration: float = None,
+                   periods: int = 1):
+        """Changes the current waveform by either mixing or overwriting waveform with part of a recording
 
         Keyword arguments:
-            :param name: Name of function being used
-            :param mix_func: Boolean used to control whether user mixes function or not
-            :param cycles: Provides number of cycles function will happen
-            :param wav_num: Used to index another waveform user created
+            :param file_name: Path to .wav file
+            :param mix_func: Boolean used to control whether user mixes the recording or not
+            :param start: Time (in seconds) the period or window starts at
+            :param duration: Length (in seconds) of the window (None to find a period)
+            :param periods: Number of periods averaged together
         """
 
-        x_array = np.linspace(self.x_min,
-                              self.x_max,
-                              self.x_max - self.x_min + 1)
-        y_array = np.array([])
-
-        # Looks at what function user has selected . . .
-        if name in {"Sine", "Cosine", "Square", "Sawtooth"}:
-            # To fill the graph, a custom frequency is generated (using name and cycles as an input)
-            freq = (cycles * 2 * np.pi) / (self.x_max - self.x_min)
-            y_array = (self.y_max - self.y_mid_point) * FUNCTIONS[name](freq * x_array) + self.y_mid_point
-
-        elif name == "Random":
-            # To use random, cycles will be casted as an int . . .
-            cycles = self.__round_int(cycles)
-            if cycles < 1:
-                cycles = 1
-
-            y_array = (self.y_max - self.y_min) * np.random.random_sample((x_array.size // cycles,)) + self.y_min
-            y_array = np.tile(y_array, [cycles])
-
-            # Makes sure there's enough y data points . . .
-            append_index = 0
-            while y_array.size < (self.x_max - self.x_min + 1):
-                y_array = np.append(y_array, y_array[append_index])
-
-        else:  # name == "Waveform"
-
-            # Checks to see if there is a waveform that can be copied . . .
-            if not self.line_set[wav_num].drawn:
-                return  # Does nothing if array is empty . . .
-
-            # To use random, cycles will be casted as an int . . .
-            cycles = self.__round_int(cycles)
-            if cycles < 1:
-                cycles = 1
-            y_point = 0
-
-            # Performs an averaging of the data points for frequency change . . .
-            for i in range(self.x_max - self.x_min + 1):
-                y_point += self.line_set[wav_num].y[i]
-
-                if (i + 1) % cycles == 0:  # Captures set of points and puts them in np.array . . .
-                    y_array = np.append(y_array, [y_point / cycles])
-                    y_point = 0
-
-            # Creates any multiple copies of line for frequency change . . .
-            y_array = np.tile(y_array, [cycles])
-
-            # Makes sure there's enough y data points . . .
-            append_index = 0
-            while y_array.size < (self.x_max - self.x_min + 1):
-                y_array = np.append(y_array, y_array[append_index])
-
-        # Checks whether the user selected to mix and if the line is drawn . . .
-        if mix_func and self.line_set[self.current_waveform].drawn:
-            self.line_set[self.current_waveform].y += y_array
-        else:
-            self.line_set[self.current_waveform].x = x_array
-            self.line_set[self.current_waveform].y = y_array
-            self.line_set[self.current_waveform].drawn = True
-
-            if self.__Enter_cid is not None:
-                self.canvas.mpl_disconnect(self.__Enter_cid)
-                self.__Enter_cid = None
-
-        self.__check_plot_details()
+        WaveformBank.change_wav(self, file_name, mix_func=mix_func, start=start, duration=duration, periods=periods)
+
+        # Drawing is disabled once a waveform has been created . . .
+        if self.__Enter_cid is not None:
+            self.canvas.mpl_disconnect(self.__Enter_cid)
+            self.__Enter_cid = None
+
         self.plot_current_data()
 
-    # END def change_function() #
+    # END def change_wav() #
 
-    def change_level(self, level: int):
+    def change_level(self, level: float):
         """Changes the level of the current plot
 
         Keyword Arguments:
             :param level: amount graph needs to move
         """
 
-        self.line_set[self.current_waveform].y += level  # Adds level value to graph . . .
-        self.__check_plot_details()
+        WaveformBank.change_level(self, level=level)
         self.plot_current_data()
 
     # END def change_level() #
@@ -240,11 +183,9 @@ class DrawGraph(object):
         """Clears 'LinePoints' data"""
 
         # No need to clear if graph is already cleared . . .
-        if not self.line_set[self.current_waveform].drawn:
+        if not self.clear_waveform():
             return
 
-        self.line_set[self.current_waveform] = LinePoints()  # Resets current line . . .
-
         # Re-references current_x and current_y for drawing . . .
         self.current_x = self.line_set[self.current_waveform].x
         self.current_y = self.line_set[self.current_waveform].y
@@ -256,69 +197,53 @@ class DrawGraph(object):
 
     # END def clear_graph() #
 
-    def export_data(self) -> list:
-        """Exports data from graph to a file provided
+    def undo(self) -> int:
+        """Undoes the most recent change (and shows the waveform changed)
 
-        returns: list of data from graph in binary form
+        :returns: Index of waveform changed (None if there's nothing to undo)
         """
 
-        data_to_return = []
-
-        for line in self.line_set:
-            if not line.drawn:
-                data_to_return.append([self.y_min] * (self.x_max - self.x_min + 1))
-            else:
-                data_to_return.append(np.rint(line.y).astype(int))  # Ensures ints are being received . . .
+        slot = WaveformBank.undo(self)
+        if slot is not None:
+            self.set_current_plot(slot)
 
-        return data_to_return
+        return slot
 
-    # END def export_data() #
+    # END def undo() #
 
-    def print_to_pdf(self, file_name: str):
-        """Exports graph data to pdfs
+    def redo(self) -> int:
+        """Redoes the most recently undone change (and shows the waveform changed)
 
-        Keyword arguments:
-            :param file_name: Name of file being saved to
+        :returns: Index of waveform changed (None if there's nothing to redo)
         """
 
-        # Opens pdf for printing graphs to . . .
-        pp = PdfPages(file_name)
-        fig = plt.figure()
+        slot = WaveformBank.redo(self)
+        if slot is not None:
+            self.set_current_plot(slot)
 
-        # Creates 'fig_count' amount of axis' for printing on same page . . .
-        ax = []
-        for i in range(FIG_COUNT):
+        return slot
 
-            # Creates graphs that look the same . . .
-            ax.append(create_graph(x_axis='', y_axis='',
-                                   x_min=x_MIN, x_max=x_MAX,
-                                   y_min=y_MIN, y_max=y_MAX,
-                                   x_major_ticks=x_MAJOR_TICKS, x_minor_ticks=x_MINOR_TICKS,
-                                   y_major_ticks=y_MAJOR_TICKS, y_minor_ticks=y_MINOR_TICKS,
-                                   fig=fig, subplot_section=[4, 2, i + 1]))
-            ax[i].set_yticklabels([])
-            ax[i].set_xticklabels([])
+    # END def redo() #
 
-        # Prepares each axis for each page . . .
-        for page in range(PAGES):
+    def print_to_pdf(self, file_name: str, mode: str = None, jobs: int = None) -> int:
+        """Exports graph data to pdfs
 
-            # Plots data . . .
-            for current_figure in range(FIG_COUNT):
-                ax[current_figure].plot(self.line_set[page * FIG_COUNT + current_figure].x,
-                                        self.line_set[page * FIG_COUNT + current_figure].y,
-                                        color='b')
+        Keyword arguments:
+            :param file_name: Name of file being saved to
+            :param mode: "vector" or "raster" pages (defaults to 'DEFAULT_REPORT_MODE')
+            :param jobs: Number of processes used (defaults to the number of CPUs)
 
-            # Saves current subplots to page . . .
-            pp.savefig()
+        :returns: Number of pages written
+        """
 
-            # Removes last plotted data . . .
-            for current_figure in range(FIG_COUNT):
-                ax[current_figure].lines.pop(0)
+        # Report renderer is only needed here, so it's loaded on first use . . .
+        from wav2bin.src.pdf_report import render_report, DEFAULT_REPORT_MODE
 
-        pp.close()
+        return render_report(self, file_name, mode=mode or DEFAULT_REPORT_MODE, jobs=jobs)
 
     # END def __print_to_pdf() #
 
+    @traced()
     def plot_current_data(self):
         """Plots current data"""
 
@@ -334,6 +259,10 @@ class DrawGraph(object):
             :param current_waveform: Index of waveform desired to be used
         """
 
+        # Slots left without a waveform don't need to be held on to . . .
+        if current_waveform != self.current_waveform:
+            self.line_set.release(self.current_waveform)
+
         self.current_waveform = current_waveform  # Current waveform number is updated . . .
         self.ax.set_title("Waveform %d" % current_waveform)  # Axis title is updated for current waveform . . .
         self.plot_current_data()
@@ -353,38 +282,28 @@ class DrawGraph(object):
             if self.__Enter_cid is None:
                 self.__Enter_cid = self.canvas.mpl_connect('axes_enter_event', self.__enter_axes)
 
-    # END def set_current_line() #
-
-    def __check_plot_details(self):
-        """Checks to make sure plot is right size and is made up of integers"""
+        # Drawing is disabled on waveforms already drawn (i.e. ones loaded from a .bin image) . . .
+        elif self.__Enter_cid is not None:
+            self.canvas.mpl_disconnect(self.__Enter_cid)
+            self.__Enter_cid = None
 
-        # Only go into here when a y value overflows over the desired boundaries . . .
-        if self.line_set[self.current_waveform].y.max() > self.y_max or \
-           self.line_set[self.current_waveform].y.min() < self.y_min:
-            self.__rescale_to_fit()
-
-    # END def __check_plot_details() #
+    # END def set_current_line() #
 
+    @traced()
+    @recorded
     def __curve_fit(self):
         """Creates a line of best fit for the current plotted data"""
 
-        # Converts x and y points to numpy array . . .
-        self.line_set[self.current_waveform].x = np.array(self.line_set[self.current_waveform].x)
-        self.line_set[self.current_waveform].y = np.array(self.line_set[self.current_waveform].y)
-
-        coefficients = np.polyfit(self.line_set[self.current_waveform].x,  # Creates coefficients for a polynomial of
-                                  self.line_set[self.current_waveform].y,  # of degree POLY_DEG . . .
-                                  POLY_DEG)
-
-        # Creates a function using the coefficients . . .
-        f = np.poly1d(coefficients)
+        # Fits the stroke onto an equally spaced set of x points (at every integer) . . .
+        self.line_set[self.current_waveform].y = fit_stroke(self.line_set[self.current_waveform].x,
+                                                            self.line_set[self.current_waveform].y,
+                                                            self.x_min, self.x_max,
+                                                            method=self.fit_method)
+        self.line_set[self.current_waveform].x = np.linspace(self.x_min,
+                                                             self.x_max,
+                                                             self.x_max - self.x_min + 1)
 
-        self.line_set[self.current_waveform].x = np.linspace(self.x_min,  # Creates an equally spaced set of x points
-                                                 self.x_max,  # at every integer . . .
-                                                 self.x_max - self.x_min + 1)
-        self.line_set[self.current_waveform].y = f(self.line_set[self.current_waveform].x)
-
-        self.__check_plot_details()
+        self._check_plot_details()
         self.plot_current_data()
         self.line_set[self.current_waveform].drawn = True  # A waveform is considered drawn at this point . . .
 
@@ -398,7 +317,7 @@ class DrawGraph(object):
         """
 
         # Makes sure user enters from left side of window . . .
-        if event.xdata <= self.x_min + DRAW_WINDOW:
+        if event.xdata <= self.x_min + DRAW_WINDOW * (self.x_max - self.x_min):
             self.current_x.append(event.xdata)
             self.current_y.append(event.ydata)
 
@@ -408,6 +327,9 @@ class DrawGraph(object):
             if self.__Exit_cid is None:
                 self.__Exit_cid = self.canvas.mpl_connect('axes_leave_event', self.__exit_axes)
 
+            if self.__background is None:
+                self.__start_blitting()
+
     # END def __enter_axes() #
 
     def __exit_axes(self, event):
@@ -423,6 +345,7 @@ class DrawGraph(object):
         self.canvas.mpl_disconnect(self.__Exit_cid)
 
         # Points are processed once the cursor leaves the axis . . .
+        self.__stop_blitting()
         self.__curve_fit()
 
         self.__Motion_cid = None
@@ -445,56 +368,61 @@ class DrawGraph(object):
             # A list append is much faster than a numpy append . . .
             self.current_x.append(event.xdata)
             self.current_y.append(event.ydata)
-            self.line.set_data(self.current_x, self.current_y)
-            self.canvas.draw()
 
-    # END def __hand_draw_on_graph() #
+            # Bursts of events are painted together on the next frame . . .
+            if self.__event_time is None:
+                self.__event_time = perf_counter()
+                self.__frame_timer.start()
 
-    def __rescale_to_fit(self):
-        """Corrects plot data that overflows over the y boundaries"""
+    # END def __hand_draw_on_graph() #
 
-        # Below, this algorithm is used to compress the graph . . .
-        overflow = (np.absolute(self.line_set[self.current_waveform].y - self.y_mid_point)).max()
+    @traced()
+    def __blit_line(self):
+        """Paints only the line being drawn on top of the cached plot"""
 
-        self.line_set[self.current_waveform].y -= self.y_mid_point
-        self.line_set[self.current_waveform].y *= (self.y_max - self.y_mid_point) / overflow
-        self.line_set[self.current_waveform].y += self.y_mid_point
+        if self.__background is None:
+            return  # Drawing finished before the frame came up . . .
 
-    # END def __rescale_to_fit() #
+        self.canvas.restore_region(self.__background)
+        self.line.set_data(self.current_x, self.current_y)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
 
-    @staticmethod
-    def __round_int(num: float) -> int:
-        """Rounds numbers to nearest integer
+        if self.__event_time is not None:
+            self.draw_latencies.append(perf_counter() - self.__event_time)
+            mark_latency("DrawGraph.hand_draw", self.__event_time)
+            self.__event_time = None
 
-        Keyword arguments:
-            :param num: Number to be rounded
+    # END def __blit_line() #
 
-        :returns: Rounded integer
-        """
+    @traced()
+    def __start_blitting(self):
+        """Caches the plot (without the line) so only the line is redrawn while hand drawing"""
 
-        return int(num + .5)
+        # Axes, grid, and ticks are drawn once, leaving out the (animated) line . . .
+        self.line.set_animated(True)
+        self.canvas.draw()
+        self.__background = self.canvas.copy_from_bbox(self.ax.bbox)
 
-        # END def __round_int() #
+        self.__frame_timer = self.canvas.new_timer(interval=FRAME_TIME)
+        self.__frame_timer.single_shot = True
+        self.__frame_timer.add_callback(self.__blit_line)
 
+    # END def __start_blitting() #
 
-class LinePoints(object):
-    """
-    Holds coordinates for x and y plots (along with if they were drawn or not)
+    def __stop_blitting(self):
+        """Goes back to full redraws once hand drawing is done"""
 
-    Components:
-        :param self.x: Holds all x plot data (first as a list, for speed reasons, then converted to numpy array)
-        :param self.y: Holds all y plot data (first as a list, for speed reasons, then converted to numpy array)
-        :param self.drawn: Indicates whether or not graph has been drawn
-    """
+        if self.__frame_timer is not None:
+            self.__frame_timer.stop()
 
-    def __init__(self):
-        """Initializes all necessary variables"""
+        self.__frame_timer = None
+        self.__background = None
+        self.__event_time = None
 
-        self.x = []
-        self.y = []
-        self.drawn = False
+        self.line.set_animated(False)
 
-        # END def __init__() #
+    # END def __stop_blitting() #
 
 
 def create_graph(x_axis: str, y_axis: str,
@@ -533,34 +461,25 @@ def create_graph(x_axis: str, y_axis: str,
     ax.set_autoscale_on(False)
 
     # Sets background ticks in the graph, for better visual appearance . . .
-    x_minor_ticks = np.linspace(0, 255, x_minor_ticks)
-    x_major_ticks = np.linspace(0, 255, x_major_ticks)
-    y_minor_ticks = np.linspace(0, 255, y_minor_ticks)
-    y_major_ticks = np.linspace(0, 255, y_major_ticks)
+    x_minor_ticks = np.linspace(x_min, x_max, x_minor_ticks)
+    x_major_ticks = np.linspace(x_min, x_max, x_major_ticks)
+    y_minor_ticks = np.linspace(y_min, y_max, y_minor_ticks)
+    y_major_ticks = np.linspace(y_min, y_max, y_major_ticks)
 
     ax.set_xticks(x_major_ticks)
     ax.set_xticks(x_minor_ticks, minor=True)
     ax.set_yticks(y_major_ticks)
     ax.set_yticks(y_minor_ticks, minor=True)
 
-    plt.grid(which='both')
+    ax.grid(which='both')
     ax.grid(which='minor', alpha=0.2)
     ax.grid(which='major', alpha=0.5)
 
     # Sets the graphs boundaries . . .
-    plt.xlim(x_min, x_max)
-    plt.ylim(y_min, y_max)
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
 
     return ax
 
 
 # END def create_graph() #
-
-
-# Dictionary used to hold all functions used . . .
-FUNCTIONS = OrderedDict([("Sine", np.sin),
-                         ("Cosine", np.cos),
-                         ("Square", scipy.signal.square),
-                         ("Sawtooth", scipy.signal.sawtooth),
-                         ("Random", None),
-                         ("Waveform", None)])
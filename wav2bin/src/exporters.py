@@ -0,0 +1,429 @@
+import os
+
+import numpy as np
+
+from collections import OrderedDict
+
+from wav2bin.src.audition import write_wav
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.waveform_bank import write_data
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+RECORD_BYTES = 16       # Data bytes per Intel HEX/S-record line . . .
+CHUNK_BYTES = 2 ** 16   # Bytes formatted at a time (a multiple of RECORD_BYTES, and one Intel HEX segment) . . .
+CHUNK_WORDS = 2 ** 16   # Samples formatted at a time by word-per-line formats . . .
+
+HEX_DIGITS = np.frombuffer(b'0123456789ABCDEF', dtype=np.uint8)
+HEX_PAIRS = np.stack([np.repeat(HEX_DIGITS, 16), np.tile(HEX_DIGITS, 16)], axis=1).view(np.uint16)[:, 0]   # Byte -> both digits . . .
+NEWLINE = ord('\n')
+
+
+def write_intel_hex(data, f, geometry: RomGeometry) -> int:
+    """Writes exported waveform data as Intel HEX (byte addressed, using extended linear address records)
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) being written to
+        :param geometry: 'RomGeometry' used for packing the points
+
+    :returns: Number of bytes written
+    """
+
+    image = _packed_bytes(data, geometry)
+    if image.size > 2 ** 32:
+        raise ValueError("Intel HEX holds at most 4 GiB (image is %d bytes)" % image.size)
+
+    written = 0
+    for start in range(0, image.size, CHUNK_BYTES):
+
+        # Upper 16 bits of the address change once per chunk . . .
+        if start >> 16:
+            upper = np.array([[0x02, 0x00, 0x00, 0x04, start >> 24, (start >> 16) & 0xFF]], dtype=np.uint8)
+            written += _write_records(f, b':', upper, _intel_checksum)
+
+        for offset, payload in _split_records(image[start:start + CHUNK_BYTES]):
+            address = (start + offset) & 0xFFFF
+            address = address + np.arange(len(payload), dtype=np.int64) * payload.shape[1]
+
+            fields = np.empty((len(payload), 4 + payload.shape[1]), dtype=np.uint8)
+            fields[:, 0] = payload.shape[1]
+            fields[:, 1] = address >> 8
+            fields[:, 2] = address & 0xFF
+            fields[:, 3] = 0x00     # Data record . . .
+            fields[:, 4:] = payload
+
+            written += _write_records(f, b':', fields, _intel_checksum)
+
+    f.write(b':00000001FF\n')   # End of file record . . .
+
+    return written + 12
+
+
+# END def write_intel_hex() #
+
+
+def write_srec(data, f, geometry: RomGeometry) -> int:
+    """Writes exported waveform data as Motorola S-records (S1/S2/S3, picked by the size of the image)
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) being written to
+        :param geometry: 'RomGeometry' used for packing the points
+
+    :returns: Number of bytes written
+    """
+
+    image = _packed_bytes(data, geometry)
+    if image.size > 2 ** 32:
+        raise ValueError("S-records hold at most 4 GiB (image is %d bytes)" % image.size)
+
+    # Smallest address that fits decides the record types (data, termination) . . .
+    address_size = 2 if image.size <= 2 ** 16 else 3 if image.size <= 2 ** 24 else 4
+    data_type, end_type = {2: (b'S1', b'S9'), 3: (b'S2', b'S8'), 4: (b'S3', b'S7')}[address_size]
+    shifts = 8 * np.arange(address_size - 1, -1, -1)
+
+    header = np.frombuffer(b'\x00\x00\x00' + b'WAV2BIN', dtype=np.uint8).copy()
+    header[0] = header.size     # Count byte includes the checksum, but not itself . . .
+    written = _write_records(f, b'S0', header[np.newaxis], _srec_checksum)
+
+    record_count = 0
+    for start in range(0, image.size, CHUNK_BYTES):
+        for offset, payload in _split_records(image[start:start + CHUNK_BYTES]):
+            address = start + offset + np.arange(len(payload), dtype=np.int64) * payload.shape[1]
+
+            fields = np.empty((len(payload), 1 + address_size + payload.shape[1]), dtype=np.uint8)
+            fields[:, 0] = address_size + payload.shape[1] + 1
+            fields[:, 1:1 + address_size] = (address[:, np.newaxis] >> shifts) & 0xFF
+            fields[:, 1 + address_size:] = payload
+
+            written += _write_records(f, data_type, fields, _srec_checksum)
+            record_count += len(payload)
+
+    # Record count (S5 or S6) is left out when it doesn't fit . . .
+    if record_count <= 0xFFFFFF:
+        count_size = 2 if record_count <= 0xFFFF else 3
+        count = np.empty((1, 1 + count_size), dtype=np.uint8)
+        count[0, 0] = count_size + 1
+        count[0, 1:] = (record_count >> 8 * np.arange(count_size - 1, -1, -1)) & 0xFF
+        written += _write_records(f, b'S5' if count_size == 2 else b'S6', count, _srec_checksum)
+
+    end = np.zeros((1, 1 + address_size), dtype=np.uint8)
+    end[0, 0] = address_size + 1
+    written += _write_records(f, end_type, end, _srec_checksum)
+
+    return written
+
+
+# END def write_srec() #
+
+
+def write_readmemh(data, f, geometry: RomGeometry) -> int:
+    """Writes exported waveform data for Verilog's $readmemh (one sample per line, word addressed)
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) being written to
+        :param geometry: 'RomGeometry' used for the points
+
+    :returns: Number of bytes written
+    """
+
+    header = b'// %d waveforms of %d x %d-bit samples\n' % (len(data), geometry.depth, geometry.data_bits)
+    f.write(header)
+    written = len(header)
+
+    for start, words in _word_chunks(data):
+        written += _write_columns(f, _hex(words, _digits(geometry.data_bits)), b'\n')
+
+    return written
+
+
+# END def write_readmemh() #
+
+
+def write_mif(data, f, geometry: RomGeometry) -> int:
+    """Writes exported waveform data as an Altera/Intel Memory Initialization File
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) being written to
+        :param geometry: 'RomGeometry' used for the points
+
+    :returns: Number of bytes written
+    """
+
+    depth = np.size(data)
+    address_digits = _digits(int(depth - 1).bit_length())
+    data_digits = _digits(geometry.data_bits)
+
+    header = (b'-- %d waveforms of %d samples\n'
+              b'WIDTH=%d;\nDEPTH=%d;\n\nADDRESS_RADIX=HEX;\nDATA_RADIX=HEX;\n\nCONTENT BEGIN\n' %
+              (len(data), geometry.depth, geometry.data_bits, depth))
+    f.write(header)
+    written = len(header)
+
+    for start, words in _word_chunks(data):
+        address = _hex(np.arange(start, start + words.size, dtype=np.int64), address_digits)
+        written += _write_columns(f, b'\t', address, b' : ', _hex(words, data_digits), b';\n')
+
+    f.write(b'END;\n')
+
+    return written + 5
+
+
+# END def write_mif() #
+
+
+def write_coe(data, f, geometry: RomGeometry) -> int:
+    """Writes exported waveform data as a Xilinx coefficient (.coe) file
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) being written to
+        :param geometry: 'RomGeometry' used for the points
+
+    :returns: Number of bytes written
+    """
+
+    header = (b'; %d waveforms of %d x %d-bit samples\n'
+              b'memory_initialization_radix=16;\nmemory_initialization_vector=\n' %
+              (len(data), geometry.depth, geometry.data_bits))
+    f.write(header)
+    written = len(header)
+
+    digits = _digits(geometry.data_bits)
+    depth = np.size(data)
+
+    for start, words in _word_chunks(data):
+        lines = np.empty((words.size, digits + 2), dtype=np.uint8)
+        lines[:, :digits] = _hex(words, digits)
+        lines[:, digits] = ord(',')
+        lines[:, -1] = NEWLINE
+
+        # Last value ends the vector . . .
+        if start + words.size == depth:
+            lines[-1, digits] = ord(';')
+
+        f.write(lines)
+        written += lines.nbytes
+
+    return written
+
+
+# END def write_coe() #
+
+
+# Exporters are found by file extension (descriptions are shown in save dialogs) . . .
+EXPORTERS = OrderedDict([
+    ('.bin', ("Generic Binary File", write_data)),
+    ('.hex', ("Intel HEX", write_intel_hex)),
+    ('.srec', ("Motorola S-Record", write_srec)),
+    ('.mem', ("Verilog $readmemh", write_readmemh)),
+    ('.mif', ("Altera Memory Initialization File", write_mif)),
+    ('.coe', ("Xilinx Coefficient File", write_coe)),
+    ('.wav', ("WAV Audio (every waveform in turn)", write_wav)),
+])
+
+
+def register_exporter(extension: str, description: str, writer):
+    """Adds (or replaces) the exporter used for an extension
+
+    Keyword arguments:
+        :param extension: File extension (i.e. '.hex')
+        :param description: Name shown in save dialogs
+        :param writer: Function taking (data, f, geometry) and returning the number of bytes written
+    """
+
+    EXPORTERS[extension.lower()] = (description, writer)
+
+
+# END def register_exporter() #
+
+
+def find_exporter(file_name: str):
+    """Finds the writer used for a file (by its extension)
+
+    Keyword arguments:
+        :param file_name: Name of file being exported to
+
+    :returns: Function taking (data, f, geometry)
+    """
+
+    extension = os.path.splitext(file_name)[1].lower()
+
+    if extension not in EXPORTERS:
+        raise ValueError("no exporter for '%s' files (choose from %s)" % (extension, ', '.join(EXPORTERS)))
+
+    return EXPORTERS[extension][1]
+
+
+# END def find_exporter() #
+
+
+def file_types() -> list:
+    """Lists every exporter as (description, pattern) pairs, as used by tkinter's file dialogs"""
+
+    return [("%s (*%s)" % (description, extension), '*' + extension)
+            for extension, (description, writer) in EXPORTERS.items()]
+
+
+# END def file_types() #
+
+
+def _digits(bits: int) -> int:
+    """Number of hex digits needed for a number of bits (at least one)"""
+
+    return max(1, -(-bits // 4))
+
+
+# END def _digits() #
+
+
+def _hex(values, digits: int) -> np.ndarray:
+    """Formats integers as upper case hex (every value at once)
+
+    Keyword arguments:
+        :param values: Array of non-negative integers (any shape)
+        :param digits: Number of hex digits per value
+
+    :returns: Array of ASCII codes with one more axis (of length 'digits') than 'values'
+    """
+
+    values = np.asarray(values)
+    byte_count = -(-digits // 2)
+    text = np.empty(values.shape + (byte_count,), dtype=np.uint16)
+
+    # Each byte is looked up as a pair of digits (the leading digit is dropped for odd widths) . . .
+    for byte in range(byte_count):
+        text[..., byte] = HEX_PAIRS[(values >> (8 * (byte_count - 1 - byte))) & 0xFF]
+
+    return text.view(np.uint8)[..., 2 * byte_count - digits:]
+
+
+# END def _hex() #
+
+
+def _intel_checksum(fields) -> np.ndarray:
+    """Two's complement of the sum of each record's bytes"""
+
+    return (-fields.sum(axis=1, dtype=np.int64)) & 0xFF
+
+
+# END def _intel_checksum() #
+
+
+def _packed_bytes(data, geometry: RomGeometry) -> np.ndarray:
+    """Lays exported waveform data out as the bytes of a ROM image
+
+    Keyword arguments:
+        :param data: 2-D array of points
+        :param geometry: 'RomGeometry' used for packing the points
+
+    :returns: 1-D array of bytes
+    """
+
+    return geometry.pack(data).reshape(-1).view(np.uint8)
+
+
+# END def _packed_bytes() #
+
+
+def _split_records(image) -> list:
+    """Splits bytes into whole records (and one shorter record holding what's left)
+
+    Keyword arguments:
+        :param image: 1-D array of bytes
+
+    :returns: List of (offset, 2-D array with one record per row) pairs
+    """
+
+    whole = image.size // RECORD_BYTES * RECORD_BYTES
+    records = []
+
+    if whole:
+        records.append((0, image[:whole].reshape(-1, RECORD_BYTES)))
+    if whole < image.size:
+        records.append((whole, image[whole:].reshape(1, -1)))
+
+    return records
+
+
+# END def _split_records() #
+
+
+def _srec_checksum(fields) -> np.ndarray:
+    """One's complement of the sum of each record's bytes"""
+
+    return 0xFF - (fields.sum(axis=1, dtype=np.int64) & 0xFF)
+
+
+# END def _srec_checksum() #
+
+
+def _word_chunks(data):
+    """Goes through the samples of exported waveform data a chunk at a time
+
+    Keyword arguments:
+        :param data: 2-D array of points
+
+    :returns: Generator of (address of first sample, 1-D array of samples) pairs
+    """
+
+    words = np.asarray(data).reshape(-1)
+
+    for start in range(0, words.size, CHUNK_WORDS):
+        yield start, words[start:start + CHUNK_WORDS].astype(np.int64)
+
+
+# END def _word_chunks() #
+
+
+def _write_columns(f, *columns) -> int:
+    """Writes lines made of columns side by side
+
+    Keyword arguments:
+        :param f: File (opened in binary mode) being written to
+        :param columns: 2-D arrays of ASCII codes (one line per row) or bytes repeated on every line
+
+    :returns: Number of bytes written
+    """
+
+    rows = next(len(column) for column in columns if isinstance(column, np.ndarray))
+    widths = [column.shape[1] if isinstance(column, np.ndarray) else len(column) for column in columns]
+
+    lines = np.empty((rows, sum(widths)), dtype=np.uint8)
+
+    position = 0
+    for column, width in zip(columns, widths):
+        lines[:, position:position + width] = column if isinstance(column, np.ndarray) else \
+            np.frombuffer(column, dtype=np.uint8)
+        position += width
+
+    f.write(lines)
+
+    return lines.nbytes
+
+
+# END def _write_columns() #
+
+
+def _write_records(f, prefix: bytes, fields, checksum) -> int:
+    """Writes records (prefix, hex of every field, checksum), one per line
+
+    Keyword arguments:
+        :param f: File (opened in binary mode) being written to
+        :param prefix: Bytes starting every record (i.e. b':' or b'S1')
+        :param fields: 2-D array of bytes, one record per row (without the checksum)
+        :param checksum: Function finding the checksum of every row
+
+    :returns: Number of bytes written
+    """
+
+    record = np.empty((len(fields), fields.shape[1] + 1), dtype=np.uint8)
+    record[:, :-1] = fields
+    record[:, -1] = checksum(fields)
+
+    return _write_columns(f, prefix, _hex(record, 2).reshape(len(record), -1), b'\n')
+
+
+# END def _write_records() #
@@ -0,0 +1,213 @@
+import ast
+import numpy as np
+
+from collections import OrderedDict
+from functools import lru_cache
+
+from wav2bin.src.waveform_bank import WaveformBank, FUNCTIONS, square_bl, sawtooth_bl
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+EXPRESSION_CACHE_SIZE = 256
+
+OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.UAdd, ast.USub)
+
+# Dictionary used to hold all functions usable within expressions (along with 'FUNCTIONS', in lower case) . . .
+EXPRESSION_FUNCTIONS = OrderedDict([("sin", np.sin),
+                                    ("cos", np.cos),
+                                    ("abs", np.abs),
+                                    ("exp", np.exp),
+                                    ("sign", np.sign),
+                                    ("tanh", np.tanh)])
+EXPRESSION_FUNCTIONS.update((name.lower(), function) for name, function in FUNCTIONS.items()
+                            if function is not None and name.lower().isidentifier())
+EXPRESSION_FUNCTIONS.update(square_bl=square_bl, sawtooth_bl=sawtooth_bl)
+
+# Names (other than functions) usable within expressions . . .
+EXPRESSION_CONSTANTS = {"pi": np.pi}
+
+
+class CompiledExpression(object):
+    """Expression checked and compiled once, to be evaluated over any number of waveforms
+
+    Components:
+        :param self.code: Compiled code of the expression
+        :param self.slots: Set of waveform slots referenced (through 'w[n]')
+        :param self.text: Text of the expression
+    """
+
+    def __init__(self, text: str):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param text: Expression being compiled
+        """
+
+        self.text = text
+
+        try:
+            tree = ast.parse(text.strip(), mode='eval')
+        except SyntaxError as error:
+            raise ValueError("invalid expression %r (%s)" % (text, error.msg))
+
+        self.slots = set()
+        self.__check(tree.body)
+
+        self.code = compile(tree, '<expression>', 'eval')
+
+    # END def __init__() #
+
+    def evaluate(self, bank: WaveformBank) -> np.ndarray:
+        """Evaluates the expression across a waveform of a bank
+
+        Keyword arguments:
+            :param bank: 'WaveformBank' giving the geometry and any waveforms referenced
+
+        :returns: Array of points (functions give values between -1 and 1)
+        """
+
+        for slot in self.slots:
+            if not 0 <= slot < len(bank.line_set):
+                raise ValueError("w[%d] is outside of 0 - %d" % (slot, len(bank.line_set) - 1))
+            if not bank.line_set[slot].drawn:
+                raise ValueError("w[%d] has not been drawn" % slot)
+
+        # t runs from 0 to 2*pi across the waveform . . .
+        x_array = bank.function_cache.grid(bank.geometry)
+        t = (x_array - bank.x_min) * (2 * np.pi / (bank.x_max - bank.x_min))
+
+        namespace = dict(EXPRESSION_FUNCTIONS)
+        namespace.update(EXPRESSION_CONSTANTS)
+        namespace.update(t=t, w=WaveformView(bank))
+
+        try:
+            y_array = eval(self.code, {'__builtins__': {}}, namespace)
+        except (TypeError, ArithmeticError) as error:  # i.e. unknown keyword, or division by zero . . .
+            raise ValueError("%r could not be evaluated (%s)" % (self.text, error))
+
+        # Constant expressions still fill the waveform . . .
+        return np.array(np.broadcast_to(y_array, t.shape), dtype=float)
+
+    # END def evaluate() #
+
+    def __check(self, node):
+        """Makes sure only numbers, t, pi, w[n], arithmetic, and known functions are used
+
+        Keyword arguments:
+            :param node: Node of the expression's syntax tree (numbers are changed into floats)
+        """
+
+        if isinstance(node, ast.BinOp) and isinstance(node.op, OPERATORS):
+            self.__check(node.left)
+            self.__check(node.right)
+
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, OPERATORS):
+            self.__check(node.operand)
+
+        elif isinstance(node, ast.Constant) and type(node.value) in {int, float}:
+            # Numbers are evaluated as floats, so '**' overflows rather than building huge whole numbers . . .
+            node.value = float(node.value)
+
+        elif isinstance(node, ast.Name) and (node.id == 't' or node.id in EXPRESSION_CONSTANTS):
+            pass
+
+        elif isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == 'w':
+            index = node.slice
+            if isinstance(index, getattr(ast, 'Index', ())):  # Python < 3.9 wraps the index . . .
+                index = index.value
+            if not (isinstance(index, ast.Constant) and type(index.value) is int):
+                raise ValueError("w[...] needs a whole number (in %r)" % self.text)
+            self.slots.add(index.value)
+
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and \
+                node.func.id in EXPRESSION_FUNCTIONS:
+            for argument in node.args:
+                self.__check(argument)
+            for keyword in node.keywords:
+                if keyword.arg is None:
+                    raise ValueError("'**' is not allowed (in %r)" % self.text)
+                self.__check(keyword.value)
+
+        else:
+            raise ValueError("%s is not allowed in %r (use numbers, t, pi, w[n], + - * / %% **, or %s)" %
+                             (type(node).__name__, self.text, ', '.join(EXPRESSION_FUNCTIONS)))
+
+    # END def __check() #
+
+
+class WaveformView(object):
+    """Gives expressions access to other waveforms of a bank (as 'w[n]', scaled between -1 and 1)
+
+    Components:
+        :param self.bank: 'WaveformBank' holding the waveforms
+    """
+
+    def __init__(self, bank: WaveformBank):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param bank: 'WaveformBank' holding the waveforms
+        """
+
+        self.bank = bank
+
+    # END def __init__() #
+
+    def __getitem__(self, slot: int) -> np.ndarray:
+        """Scales a waveform the same way functions are (y_min -> -1, y_max -> 1)
+
+        Keyword arguments:
+            :param slot: Index of waveform
+
+        :returns: Array of points
+        """
+
+        return (self.bank.line_set[slot].y - self.bank.y_mid_point) / (self.bank.y_max - self.bank.y_mid_point)
+
+    # END def __getitem__() #
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(text: str) -> CompiledExpression:
+    """Compiles an expression (repeated expressions come from the cache)
+
+    Keyword arguments:
+        :param text: Expression being compiled
+
+    :returns: 'CompiledExpression' object
+    """
+
+    return CompiledExpression(text)
+
+
+# END def compile_expression() #
+
+
+def render_expressions(bank: WaveformBank, expressions, mix_func: bool = False) -> list:
+    """Renders many expressions into a bank in one pass
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' being changed
+        :param expressions: Dictionary (or list of pairs) of waveform slot -> expression, run in order
+        :param mix_func: Boolean used to control whether expressions are mixed or not
+
+    :returns: List of slots changed
+    """
+
+    if isinstance(expressions, dict):
+        expressions = expressions.items()
+
+    current_waveform = bank.current_waveform
+    changed = []
+
+    try:
+        for slot, text in expressions:
+            bank.current_waveform = slot
+            WaveformBank.change_expression(bank, text, mix_func)
+            changed.append(slot)
+    finally:
+        bank.current_waveform = current_waveform
+
+    return changed
+
+
+# END def render_expressions() #
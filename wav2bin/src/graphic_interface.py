@@ -1,14 +1,25 @@
+import bisect
+import os
+import re
 import tkinter as tk
 import tkinter.filedialog as fd
 from tkinter import messagebox as mb
 from tkinter import ttk
 
-from wav2bin.src.draw_graph import DrawGraph, FUNCTIONS
+from wav2bin.src.draw_graph import DrawGraph, FUNCTIONS, FIT_METHODS
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from wav2bin.src.exporters import find_exporter, file_types
+from wav2bin.src.harmonics import decompose, HARMONIC_COUNT
 from wav2bin.src.helper_functions import resource_path
+from wav2bin.src.hex_view import HexRows
+from wav2bin.src.instrumentation import traced_event
+from wav2bin.src.project import Project, save_project, PROJECT_EXTENSION
+from wav2bin.src.quantize import QUANTIZERS
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.rom_image import RomImage
 
-from time import sleep
+import numpy as np
 
 # The variables below are set for quick changes without the hassle of sifting through code . . .
 INTERFACE_TITLE = "WAV2BIN (Version 1.3)"
@@ -18,7 +29,14 @@ STARTING_WAVEFORM = 0
 
 ROWS, COLS = 8, 6
 
-LINES_IN_DISPLAY = 4
+VIEW_ROWS = 40     # Rows of the exported data preview in view at once . . .
+WHEEL_ROWS = 3     # Rows scrolled by each turn of the mouse wheel . . .
+
+SELECTOR_ROWS = 50  # Waveforms listed at a time in the waveform selector . . .
+
+SHOW_HEX_PREVIEW = True  # Shows exported data in hex once it has been written . . .
+
+AUTOSAVE_TIME = 5000  # Milliseconds between writing changed waveforms back to an opened file . . .
 
 
 class GraphicInterface(tk.Frame):
@@ -31,21 +49,32 @@ class GraphicInterface(tk.Frame):
         :param self.current_waveform_func_var: Holds option for waveform func
         :param self.current_waveform_var: Holds option for current waveform
         :param self.cycles_entry_var: Holds entry for entering cycles
+        :param self.fit_method_var: Holds option for the fit used on hand-drawn strokes
         :param self.frequency_entry_var: Holds entry for entering frequency
         :param self.level_entry_var: Holds entry for entering level change
+        :param self.quantizer_var: Holds option for the quantizer used when exporting
+        :param self.geometry: 'RomGeometry' used by the graph tool
         :param self.graph_tool: Holds 'DrawGraph' object
+        :param self.rom_image: Holds 'RomImage' (or 'Project') opened for editing (if any)
         :param self.root: Holds graphics root figure
+        :param self.waveform_selector: Searchable selector of the current waveform
     """
 
-    def __init__(self, root):
+    def __init__(self, root, geometry: RomGeometry = None, graph_tool: DrawGraph = None):
         """Initializes all necessary variables
 
         Keyword arguments:
             :param root: Tkinter root that will be referenced in this object
+            :param geometry: 'RomGeometry' used (defaults to 256 addresses of 8-bit data)
+            :param graph_tool: 'DrawGraph' created ahead of time (i.e. while the splash is up)
         """
 
         self.root = root
 
+        if graph_tool is not None:
+            geometry = graph_tool.geometry
+        self.geometry = geometry if geometry is not None else RomGeometry()
+
         # Changes icon . . .
         icon = resource_path('imgs/' + ICON_NAME)
         root.iconbitmap(icon)
@@ -78,9 +107,12 @@ class GraphicInterface(tk.Frame):
         self.cycles_entry_var = tk.StringVar()          # Used for keeping track of cycles entry . . .
         self.frequency_entry_var = tk.StringVar()       # Used for keeping track of frequency entry . . .
         self.level_entry_var = tk.StringVar()           # Used for keeping track of level entry . . .
+        self.fit_method_var = tk.StringVar()            # Used for keeping track of drawing fit . . .
+        self.quantizer_var = tk.StringVar()             # Used for keeping track of export quantizer . . .
 
         # Components not yet initialized in this class are listed below . . .
-        self.graph_tool = None
+        self.graph_tool = graph_tool
+        self.rom_image = None
 
     # END def __init__() #
 
@@ -90,13 +122,21 @@ class GraphicInterface(tk.Frame):
         # Goes through and includes all features . . .
         self.__feature_graph_tool()
         self.__feature_waveform_menu()
+        self.__feature_fit_menu()
         self.__feature_user_graph_change()
         self.__feature_clear()
         self.__feature_modify_function()
+        self.__feature_open()
+        self.__feature_save()
         self.__feature_export()
+        self.__feature_quantize_menu()
+        self.__feature_undo()
+
+        self.__autosave()
 
     # END def add_features() #
 
+    @traced_event()
     def __amplitude_change(self, event):
         """Changes amplitude based on amplitude entry
 
@@ -114,51 +154,90 @@ class GraphicInterface(tk.Frame):
 
             # Plots current graph . . .
             self.graph_tool.plot_current_data()
+            self.__write_back()
 
         # Clears the text entry data . . .
         self.amplitude_entry_var.set("")
 
     # END def __amplitude_change() #
 
+    @traced_event()
     def __change_waveform(self, event):
-        """Changes the current line figure within the graph feature
+        """Changes the current line figure to the waveform chosen in the selector
 
         Keyword arguments:
-            :param event: Holds event data
+            :param event: Holds event data (unused)
         """
 
-        # Takes the 2nd argument in "Waveform %d" string minus 1 to find the current waveform . . .
-        # (i.e. "Waveform 0" -> index = 0)
-        self.graph_tool.set_current_plot(int(event.split()[1]))
+        # Takes the first number of the selection (i.e. "Waveform 12 (drawn)" -> index = 12) . . .
+        numbers = re.findall(r'\d+', self.current_waveform_var.get())
+
+        if numbers and int(numbers[0]) < len(self.graph_tool.line_set):
+            self.graph_tool.set_current_plot(int(numbers[0]))
+        else:
+            self.root.bell()
+
+        self.current_waveform_var.set("Waveform %d" % self.graph_tool.current_waveform)
 
     # END def change_waveform() #
 
+    def __autosave(self):
+        """Writes changed waveforms (i.e. hand-drawn strokes) back into the opened file every so often"""
+
+        self.__write_back()
+        self.root.after(AUTOSAVE_TIME, self.__autosave)
+
+    # END def __autosave() #
+
+    @traced_event()
     def __clear_graph(self):
         """Clears the current graph"""
 
         self.graph_tool.clear_graph()
+        self.__write_back()
 
     # END def clear_graph() #
 
+    @traced_event()
+    def __edit_harmonics(self):
+        """Opens the harmonic editor for the current waveform"""
+
+        HarmonicDialog(self.root, self.graph_tool, on_change=self.__write_back)
+
+    # END def __edit_harmonics() #
+
+    @traced_event()
     def __export(self):
-        """Exports data into a .bin file"""
+        """Exports data into a .bin file (or any other format found in 'EXPORTERS', by extension)"""
 
         # Ask user if they would like to print graphs to pdf . . .
         response = mb.askyesno(title="Save Waveforms", message="Would you like to save your waveforms as a PDF?", icon=mb.QUESTION)
 
+        file_name = fd.asksaveasfilename(initialfile='.bin', defaultextension=".bin", filetypes=file_types())
+        if not file_name:
+            return
+
         try:
-            with fd.asksaveasfile(mode='wb', initialfile='.bin', defaultextension=".bin", filetypes=[('Generic Binary File (*.bin)', '*.bin')]) as file:
+            # Exporter is found before the file is opened, so an unknown extension doesn't leave an empty file . . .
+            exporter = find_exporter(file_name)
+
+            # Print out graphs to pdf if result == True . . .
+            if response:
+                self.graph_tool.print_to_pdf(os.path.splitext(file_name)[0] + '.pdf')
 
-                # Print out graphs to pdf if result == True . . .
-                if response:
-                    file_path = '.'.join(file.name.split('.')[:-1])
-                    self.graph_tool.print_to_pdf(''.join([file_path, '.pdf']))
+            # Whole bank is exported at once (measuring the error quantizing leaves) . . .
+            data, report = self.graph_tool.export_data(report=True)
+            with open(file_name, 'wb') as file:
+                exporter(data, file, self.geometry)
 
-                dialog = PopupDialog(self.root)
-                dialog.list_data(self.graph_tool.export_data(), file)
-        except Exception:
+        except (OSError, ValueError) as error:
+            mb.showerror(title="Save Waveforms", message=str(error))
             return
 
+        if SHOW_HEX_PREVIEW:
+            dialog = PopupDialog(self.root)
+            dialog.list_data(data, self.geometry, report)
+
     # END def __export() #
 
     def __feature_clear(self):
@@ -174,30 +253,113 @@ class GraphicInterface(tk.Frame):
         """Adds a button for exporting the graph data"""
 
         export_button = ttk.Button(self.root, text="Export", command=self.__export, style='W.TButton')
-        export_button.config(width=150)
-        export_button.grid(row=7, column=0, columnspan=6, padx=25, pady=10)
+        export_button.config(width=50)
+        export_button.grid(row=7, column=4, columnspan=2, padx=25, pady=10)
 
     # END def __feature_export #
 
+    def __feature_open(self):
+        """Adds a button for opening a .bin image or project"""
+
+        open_button = ttk.Button(self.root, text="Open", command=self.__open, style='W.TButton')
+        open_button.config(width=50)
+        open_button.grid(row=7, column=0, columnspan=2, padx=25, pady=10)
+
+    # END def __feature_open #
+
+    def __feature_save(self):
+        """Adds a button for saving the bank as a project"""
+
+        save_button = ttk.Button(self.root, text="Save", command=self.__save, style='W.TButton')
+        save_button.config(width=50)
+        save_button.grid(row=7, column=2, columnspan=2, padx=25, pady=10)
+
+    # END def __feature_save #
+
+    def __feature_undo(self):
+        """Adds key bindings for undoing/redoing changes"""
+
+        self.root.bind('<Control-z>', self.__undo)
+        self.root.bind('<Control-y>', self.__redo)
+        self.root.bind('<Control-Z>', self.__redo)  # Ctrl+Shift+Z . . .
+
+    # END def __feature_undo() #
+
     def __feature_waveform_menu(self):
-        """Adds an options menu for changing current waveform"""
+        """Adds a searchable selector for changing current waveform (listing one page of waveforms at a time)"""
 
-        # List of options generated . . .
         current_waveform_label = ttk.Label(self.root, text="Current Waveform", background='white')
         current_waveform_label.grid(row=4, column=0, sticky='e', padx=10)
-        options = ["Waveform %d" % i for i in range(len(self.graph_tool.line_set))]
 
-        current_waveform = ttk.OptionMenu(self.root, self.current_waveform_var, options[0], *options,
-                                          command=self.__change_waveform)
-        current_waveform.config(width=15)
+        # Typing a number lists the page starting there, and typing "drawn" lists drawn waveforms . . .
+        current_waveform = ttk.Combobox(self.root, textvariable=self.current_waveform_var,
+                                        postcommand=self.__page_waveforms)
+        current_waveform.bind('<<ComboboxSelected>>', self.__change_waveform)
+        current_waveform.bind('<Return>', self.__change_waveform)
+        current_waveform.config(width=18)
         current_waveform.grid(row=4, column=1, columnspan=2, sticky='w', padx=20, pady=15)
 
+        self.waveform_selector = current_waveform
+        self.current_waveform_var.set("Waveform %d" % STARTING_WAVEFORM)
+
     # END def feature_option_menu() #
 
+    def __page_waveforms(self):
+        """Fills the waveform selector with the page of waveforms matching what's typed"""
+
+        text = self.current_waveform_var.get().lower()
+        numbers = [int(number) for number in re.findall(r'\d+', text)]
+        drawn = self.graph_tool.line_set.drawn_slots()
+
+        if "drawn" in text:
+            # Drawn waveforms from the typed number onwards . . .
+            start = bisect.bisect_left(drawn, numbers[0] if numbers else 0)
+            slots = drawn[start:start + SELECTOR_ROWS]
+        else:
+            # Page starting at the typed number (or holding the current waveform) . . .
+            start = numbers[0] if numbers and text.strip().isdigit() else \
+                self.graph_tool.current_waveform - self.graph_tool.current_waveform % SELECTOR_ROWS
+            slots = range(start, min(start + SELECTOR_ROWS, len(self.graph_tool.line_set)))
+
+        drawn = set(drawn)
+        self.waveform_selector['values'] = ["Waveform %d%s" % (slot, " (drawn)" if slot in drawn else "")
+                                            for slot in slots]
+
+    # END def __page_waveforms() #
+
+    def __feature_fit_menu(self):
+        """Adds an options menu for changing the fit used on hand-drawn strokes"""
+
+        fit_label = ttk.Label(self.root, text="Drawing Fit", background='white')
+        fit_label.grid(row=4, column=3, sticky='e', padx=10)
+        options = [key for key in FIT_METHODS]
+
+        fit_method = ttk.OptionMenu(self.root, self.fit_method_var, self.graph_tool.fit_method, *options,
+                                    command=self.__fit_method_changed)
+        fit_method.config(width=15)
+        fit_method.grid(row=4, column=4, columnspan=2, sticky='w', padx=20, pady=15)
+
+    # END def __feature_fit_menu() #
+
+    def __feature_quantize_menu(self):
+        """Adds an options menu for changing how waveforms are rounded onto the DAC's levels when exported"""
+
+        quantize_label = ttk.Label(self.root, text="Export Rounding", background='white')
+        quantize_label.grid(row=8, column=3, sticky='e', padx=10)
+        options = [key for key in QUANTIZERS]
+
+        quantizer = ttk.OptionMenu(self.root, self.quantizer_var, self.graph_tool.quantizer, *options,
+                                   command=self.__quantizer_changed)
+        quantizer.config(width=15)
+        quantizer.grid(row=8, column=4, columnspan=2, sticky='w', padx=20, pady=(0, 15))
+
+    # END def __feature_quantize_menu() #
+
     def __feature_graph_tool(self):
         """Adds the graph tool ('DrawGraph')"""
 
-        self.graph_tool = DrawGraph()
+        if self.graph_tool is None:
+            self.graph_tool = DrawGraph(geometry=self.geometry)
 
         self.graph_tool.canvas = FigureCanvasTkAgg(self.graph_tool.fig, master=self.root)
         self.graph_tool.canvas.get_tk_widget().grid(row=0, column=0, rowspan=4, columnspan=4, sticky='nesw')
@@ -225,10 +387,11 @@ class GraphicInterface(tk.Frame):
         current_function.grid(row=5, column=1, columnspan=2, sticky='sw', padx=20, pady=20)
 
         # Select Waveform
-        options = [i for i in range(len(self.graph_tool.line_set))]
-
-        self.current_waveform_func = ttk.OptionMenu(self.root, self.current_waveform_func_var, options[0], *options)
-        self.current_waveform_func.config(width=3)
+        vcmd = (self.register(self.__validate_positive_int), '%S')  # %S checks entry currently being typed . . .
+        self.current_waveform_func = ttk.Spinbox(self.root, textvariable=self.current_waveform_func_var,
+                                                 from_=0, to=len(self.graph_tool.line_set) - 1,
+                                                 validate="key", validatecommand=vcmd)
+        self.current_waveform_func.config(width=6)
         self.current_waveform_func.grid(row=5, column=3, sticky='sw', pady=20)
         self.current_waveform_func.grid_remove()  # Hides select Waveform options in the beginning . . .
 
@@ -251,6 +414,11 @@ class GraphicInterface(tk.Frame):
         overwrite_func_button.config(width=20)
         overwrite_func_button.grid(row=6, column=4, columnspan=2, sticky='nwe', padx=25, pady=20)
 
+        # Harmonic Editor
+        harmonics_button = ttk.Button(self.root, text="Harmonics", command=self.__edit_harmonics, style='W.TButton')
+        harmonics_button.config(width=12)
+        harmonics_button.grid(row=6, column=3, sticky='nw', pady=20)
+
     # END def __feature_modify_function() #
 
     def __feature_user_graph_change(self):
@@ -289,6 +457,7 @@ class GraphicInterface(tk.Frame):
 
     # END __feature_user_graph_change() #
 
+    @traced_event()
     def __change_level(self, event):
         """Changes the level of the graph by a specific value
 
@@ -297,12 +466,38 @@ class GraphicInterface(tk.Frame):
         """
         if self.graph_tool.line_set[self.graph_tool.current_waveform].drawn:
             self.graph_tool.change_level(float(self.level_entry_var.get()))
+            self.__write_back()
 
         # Clears the text entry data . . .
         self.level_entry_var.set("")
 
     # END def __change_level() #
 
+    @traced_event()
+    def __fit_method_changed(self, event):
+        """Called when a drawing fit selection has been made
+
+        Keyword arguments:
+            :param event: Holds event data (unused)
+        """
+
+        self.graph_tool.fit_method = self.fit_method_var.get()
+
+    # END def __fit_method_changed() #
+
+    @traced_event()
+    def __quantizer_changed(self, event):
+        """Called when an export rounding selection has been made
+
+        Keyword arguments:
+            :param event: Holds event data (unused)
+        """
+
+        self.graph_tool.quantizer = self.quantizer_var.get()
+
+    # END def __quantizer_changed() #
+
+    @traced_event()
     def __frequency_change(self, event):
         """Used to change current waveforms frequency
 
@@ -329,12 +524,14 @@ class GraphicInterface(tk.Frame):
 
             # Plots current graph . . .
             self.graph_tool.plot_current_data()
+            self.__write_back()
 
         # Clears the text entry data . . .
         self.frequency_entry_var.set("")
 
     # END def __frequency_change() #
 
+    @traced_event()
     def __function_changed(self, event):
         """Called when a function selection has been made
 
@@ -352,6 +549,7 @@ class GraphicInterface(tk.Frame):
 
     # END __function_change() #
 
+    @traced_event()
     def __mix_function(self):
         """Mixes current waveform with current function selected"""
 
@@ -362,17 +560,20 @@ class GraphicInterface(tk.Frame):
                 self.graph_tool.change_function(name=self.current_function_var.get(),
                                                 mix_func=True,
                                                 cycles=float(self.cycles_entry_var.get()),
-                                                wav_num=self.current_waveform_func_var.get())
+                                                wav_num=self.__source_waveform())
             else:
                 self.graph_tool.change_function(name=self.current_function_var.get(),
                                                 mix_func=True,
                                                 cycles=float(self.cycles_entry_var.get()))
 
+            self.__write_back()
+
         # Clears the text entry data . . .
         self.cycles_entry_var.set("")
 
     # END def __mix_function() #
 
+    @traced_event()
     def __overwrite_function(self):
         """Overwrites current waveform with current function selected"""
 
@@ -383,25 +584,190 @@ class GraphicInterface(tk.Frame):
                 self.graph_tool.change_function(name=self.current_function_var.get(),
                                                 mix_func=False,
                                                 cycles=float(self.cycles_entry_var.get()),
-                                                wav_num=self.current_waveform_func_var.get())
+                                                wav_num=self.__source_waveform())
             else:
                 self.graph_tool.change_function(name=self.current_function_var.get(),
                                                 mix_func=False,
                                                 cycles=float(self.cycles_entry_var.get()))
 
+            self.__write_back()
+
         # Clears the text entry data . . .
         self.cycles_entry_var.set("")
 
     # END def __overwrite_function() #
 
+    @traced_event()
+    def __open(self):
+        """Opens a .bin image (or project) so its waveforms can be edited in place, or imports a .wav recording
+        into the current waveform"""
+
+        file_name = fd.askopenfilename(defaultextension=".bin",
+                                       filetypes=[('Generic Binary File (*.bin)', '*.bin'),
+                                                  ('WAV2BIN Project (*%s)' % PROJECT_EXTENSION, '*' + PROJECT_EXTENSION),
+                                                  ('WAV Audio (*.wav)', '*.wav')])
+        if not file_name:
+            return
+
+        # Recordings are cut down to one cycle, replacing the current waveform . . .
+        if file_name.lower().endswith('.wav'):
+            try:
+                self.graph_tool.change_wav(file_name)
+            except (OSError, ValueError) as error:
+                mb.showerror(title="Import Recording", message=str(error))
+                return
+
+            self.__write_back()
+            return
+
+        try:
+            if file_name.endswith(PROJECT_EXTENSION):
+                rom_image = Project(file_name)
+            else:
+                rom_image = RomImage(file_name, self.geometry)
+        except (OSError, ValueError, KeyError) as error:
+            mb.showerror(title="Open Waveforms", message=str(error))
+            return
+
+        if rom_image.geometry != self.geometry:
+            rom_image.close()
+            mb.showerror(title="Open Waveforms", message="%s uses %r, but the graph uses %r" %
+                                                         (file_name, rom_image.geometry, self.geometry))
+            return
+
+        # Bank grows to fit images holding more waveforms (i.e. multi-bank EEPROMs) . . .
+        if len(rom_image) > len(self.graph_tool.line_set):
+            self.graph_tool.line_set.resize(len(rom_image))
+
+        self.__replace_image(rom_image)
+
+    # END def __open() #
+
+    @traced_event()
+    def __redo(self, event):
+        """Redoes the most recently undone change
+
+        Keyword arguments:
+            :param event: Holds event data (unused)
+        """
+
+        self.__show_history_change(self.graph_tool.redo())
+
+    # END def __redo() #
+
+    def __show_history_change(self, slot: int):
+        """Follows an undo/redo to the waveform it changed
+
+        Keyword arguments:
+            :param slot: Index of waveform changed (None if nothing changed)
+        """
+
+        if slot is not None:
+            self.current_waveform_var.set("Waveform %d" % slot)
+            self.__write_back()
+
+    # END def __show_history_change() #
+
+    @traced_event()
+    def __undo(self, event):
+        """Undoes the most recent change
+
+        Keyword arguments:
+            :param event: Holds event data (unused)
+        """
+
+        self.__show_history_change(self.graph_tool.undo())
+
+    # END def __undo() #
+
+    def __replace_image(self, rom_image: RomImage):
+        """Attaches the graph to a newly opened image (saving and closing the last one)
+
+        Keyword arguments:
+            :param rom_image: 'RomImage' (or 'Project') being edited from now on
+        """
+
+        # Any changes to the last image are saved before it's let go . . .
+        if self.rom_image is not None:
+            self.__write_back()
+            if self.rom_image is not rom_image:
+                self.rom_image.close()
+
+        self.rom_image = rom_image
+        self.rom_image.attach(self.graph_tool)
+
+        # Projects bring their own number of slots . . .
+        self.current_waveform_func.config(to=len(self.graph_tool.line_set) - 1)
+
+        self.graph_tool.history.clear()  # Changes made before opening can't be undone into the image . . .
+        self.graph_tool.current_waveform = min(self.graph_tool.current_waveform, len(self.graph_tool.line_set) - 1)
+        self.graph_tool.set_current_plot(self.graph_tool.current_waveform)
+        self.current_waveform_var.set("Waveform %d" % self.graph_tool.current_waveform)
+
+    # END def __replace_image() #
+
     def __quit_program(self):
         """Closes current running program"""
 
+        if self.rom_image is not None:
+            self.__write_back()
+            self.rom_image.close()
+
         self.quit()  # Stops mainloop and prevents "Fatal Python Error: PyEval_RestoreThread: NULL tstate"
         self.destroy()  # on Windows . . .
 
     # END def __quit_program() #
 
+    @traced_event()
+    def __save(self):
+        """Saves every waveform as a project (which is then edited in place, like an opened .bin image)"""
+
+        if isinstance(self.rom_image, Project):
+            self.__write_back()
+            return
+
+        file_name = fd.asksaveasfilename(initialfile=PROJECT_EXTENSION, defaultextension=PROJECT_EXTENSION,
+                                         filetypes=[('WAV2BIN Project (*%s)' % PROJECT_EXTENSION,
+                                                     '*' + PROJECT_EXTENSION)])
+        if not file_name:
+            return
+
+        # Changes are saved to the last image before the bank moves over to the project . . .
+        self.__write_back()
+
+        try:
+            project = save_project(self.graph_tool, file_name)
+        except (OSError, ValueError) as error:
+            mb.showerror(title="Save Waveforms", message=str(error))
+            return
+
+        self.__replace_image(project)
+
+    # END def __save() #
+
+    def __write_back(self):
+        """Writes any changed waveforms back into the opened .bin image (or project)"""
+
+        if self.rom_image is not None:
+            self.rom_image.write_back(self.graph_tool)
+
+    # END def __write_back() #
+
+    def __source_waveform(self) -> int:
+        """Finds the waveform chosen to copy from (kept within the bank)
+
+        :returns: Index of waveform
+        """
+
+        try:
+            slot = self.current_waveform_func_var.get()
+        except tk.TclError:  # Entry was left empty . . .
+            slot = 0
+
+        return min(max(slot, 0), len(self.graph_tool.line_set) - 1)
+
+    # END def __source_waveform() #
+
     def __validate_float(self, value: str) -> bool:
         """Validates if user entry is a valid float
 
@@ -425,7 +791,7 @@ class GraphicInterface(tk.Frame):
     # END def __validate_float() #
 
     def __validate_level(self, value: str) -> bool:
-        """Validates if user entry is between -256 and 255
+        """Validates if user entry is within the y range (i.e. between -256 and 255 for 8-bit data)
 
         Keyword Arguments:
             :param value: String holding potential candidate for value
@@ -439,7 +805,7 @@ class GraphicInterface(tk.Frame):
         else:
             try:
                 value = float(value)
-                if value > 255.0 or value < -256.0:
+                if value > self.geometry.y_max or value < -(self.geometry.y_max + 1):
                     self.bell()
                     return False
                 else:
@@ -493,10 +859,16 @@ class GraphicInterface(tk.Frame):
 
 
 class PopupDialog(object):
-    """Dialog used during execution of a tkinter window
+    """Dialog used to preview exported data (without blocking the tkinter window)
+
+    Only the rows in view are formatted, so images of any size scroll at the same speed.
 
     Components:
-        :param: self.top: Figure used on top of a root figure
+        :param self.first_row: Index of the row at the top of the view
+        :param self.rows: 'HexRows' formatting the exported image
+        :param self.scrollbar: Scrollbar moving through every row (not only those in view)
+        :param self.text: Text widget holding the rows in view
+        :param self.top: Figure used on top of a root figure
     """
 
     def __init__(self, parent):
@@ -507,65 +879,191 @@ class PopupDialog(object):
         """
 
         self.top = tk.Toplevel(parent)
-        self.top.protocol("WM_DELETE_WINDOW", self._on_close)   # Redirects the windows close button to function . . .
-        self.top.resizable(False, False)                        # Prevents window from being re-sized . . .
-
-        self.key_pressed = False                                # Variable used to keep track of key press . . .
+        self.top.wm_title("Exported Data")
+        self.top.resizable(False, False)    # Prevents window from being re-sized . . .
 
         icon = resource_path('imgs/' + ICON_NAME)
         self.top.iconbitmap(icon)
 
+        # Components not yet initialized in this class are listed below . . .
+        self.first_row = 0
+        self.rows = None
+        self.scrollbar = None
+        self.text = None
+
     # END def __init__() #
 
-    def list_data(self, data_points: list, f):
-        """Exports the given data to a file and displays the waveform values in hex
+    def list_data(self, data_points, geometry: RomGeometry, report: dict = None):
+        """Displays the exported image in hex (and ASCII)
 
         Keyword arguments:
-            :param data_points: List of points given to encode and display
-            :param f: File being written to
+            :param data_points: 2-D array of points given to display
+            :param geometry: 'RomGeometry' used for the points
+            :param report: Error of each drawn waveform (as returned by 'WaveformBank.export_data'), if any
         """
 
-        listbox = tk.Listbox(self.top, width=165, height=50, font=(None, 10))
-        listbox.bind("<Key>", self.__key)       # Binds key events to function . . .
-        listbox.pack()
+        # Worst waveform of the export is shown above the data . . .
+        if report is not None and len(report["slots"]):
+            worst = int(np.argmin(report["snr"]))
+            ttk.Label(self.top, text="Worst SNR %.1f dB (waveform %d), max error %.2f levels" %
+                                     (report["snr"][worst], report["slots"][worst],
+                                      report["max_error"].max())).pack(side=tk.TOP, anchor='w', padx=5, pady=5)
 
-        for index in range(len(data_points)):
+        # Bytes are shown as they're laid out in the image, grouped by sample . . .
+        self.rows = HexRows(geometry.pack(data_points), geometry.bytes_per_sample)
 
-            # Waits until user presses another key to unlock . . .
-            while self.key_pressed:
-                listbox.update()
+        self.text = tk.Text(self.top, width=self.rows.width, height=VIEW_ROWS, font=('Courier', 10), wrap=tk.NONE)
+        self.scrollbar = ttk.Scrollbar(self.top, orient=tk.VERTICAL, command=self.__scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT)
 
-            # Write data to file . . .
-            f.write(bytearray(data_points[index]))
+        # Scrolling is handled here, as the text widget only ever holds the rows in view . . .
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.text.bind(sequence, self.__wheel)
+        for sequence, rows in (('<Prior>', -VIEW_ROWS), ('<Next>', VIEW_ROWS), ('<Up>', -1), ('<Down>', 1)):
+            self.text.bind(sequence, lambda event, rows=rows: self.__show(self.first_row + rows) or 'break')
+        self.text.bind('<Home>', lambda event: self.__show(0) or 'break')
+        self.text.bind('<End>', lambda event: self.__show(len(self.rows)) or 'break')
 
-            display = ['{0:02x}'.format(data) for data in data_points[index]]
-            listbox.insert(tk.END, "Waveform %d:" % index)
+        self.__show(0)
+        self.text.focus_set()
 
-            for i in range(LINES_IN_DISPLAY):
-                listbox.insert(tk.END, ' '.join(display[i * len(display) // LINES_IN_DISPLAY:
-                                                       (i+1) * len(display) // LINES_IN_DISPLAY]))
-                listbox.yview(tk.END)
-                self.top.update()
-                sleep(0.1)
+    # END def list_data() #
 
-        self.top.destroy()
+    def __scroll(self, *args):
+        """Moves the view as asked by the scrollbar
 
-    # END def list_data() #
+        Keyword arguments:
+            :param args: Either ('moveto', fraction) or ('scroll', count, 'units'/'pages')
+        """
 
-    def __key(self, event):
-        """Function used to detect key press
+        if args[0] == tk.MOVETO:
+            self.__show(int(float(args[1]) * len(self.rows)))
+        elif args[0] == tk.SCROLL:
+            self.__show(self.first_row + int(args[1]) * (VIEW_ROWS if args[2] == tk.PAGES else 1))
 
-        Keyword Arguments:
-            :param event: Holds event data (unused)
+    # END def __scroll() #
+
+    def __show(self, first_row: int):
+        """Formats the rows in view (starting at 'first_row') and moves the scrollbar to match
+
+        Keyword arguments:
+            :param first_row: Index of row shown at the top (kept within the image)
         """
 
-        self.key_pressed = not self.key_pressed
+        row_count = len(self.rows)
+        self.first_row = max(0, min(first_row, row_count - VIEW_ROWS))
+
+        self.text.config(state=tk.NORMAL)
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', self.rows.format(self.first_row, self.first_row + VIEW_ROWS))
+        self.text.config(state=tk.DISABLED)
 
-    # END def __key() #
+        self.scrollbar.set(self.first_row / row_count, min(self.first_row + VIEW_ROWS, row_count) / row_count)
+
+    # END def __show() #
+
+    def __wheel(self, event) -> str:
+        """Scrolls the view with the mouse wheel
+
+        Keyword arguments:
+            :param event: Holds event data (wheel direction)
+
+        :returns: 'break' (so the text widget doesn't scroll itself)
+        """
+
+        if event.num in (4, 5):
+            rows = WHEEL_ROWS if event.num == 5 else -WHEEL_ROWS    # X11 . . .
+        else:
+            rows = -WHEEL_ROWS * (1 if event.delta > 0 else -1)
+
+        self.__show(self.first_row + rows)
+
+        return 'break'
+
+    # END def __wheel() #
+
+
+class HarmonicDialog(object):
+    """Dialog used to edit the harmonics (magnitudes and phases) of the current waveform
+
+    Components:
+        :param self.graph_tool: 'DrawGraph' being changed
+        :param self.magnitudes_var: Holds entry for magnitudes
+        :param self.on_change: Function called after the waveform is changed
+        :param self.phases_var: Holds entry for phases (in degrees)
+        :param self.top: Figure used on top of a root figure
+    """
+
+    def __init__(self, parent, graph_tool: DrawGraph, on_change=None):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param parent: Tkinter root that will be referenced in this object
+            :param graph_tool: 'DrawGraph' being changed
+            :param on_change: Function called after the waveform is changed
+        """
+
+        self.graph_tool = graph_tool
+        self.on_change = on_change
+        slot = graph_tool.current_waveform
+
+        self.top = tk.Toplevel(parent)
+        self.top.wm_title("Harmonics")
+        self.top.resizable(False, False)    # Prevents window from being re-sized . . .
+
+        icon = resource_path('imgs/' + ICON_NAME)
+        self.top.iconbitmap(icon)
+
+        self.magnitudes_var = tk.StringVar()
+        self.phases_var = tk.StringVar()
+
+        # Starts from the harmonics of the current waveform (if there is one), scaled like functions . . .
+        if graph_tool.line_set[slot].drawn:
+            y = (graph_tool.line_set[slot].y - graph_tool.y_mid_point) / (graph_tool.y_max - graph_tool.y_mid_point)
+            magnitudes, phases, offset = decompose(y, HARMONIC_COUNT)
+            self.magnitudes_var.set(' '.join("%.3g" % value for value in magnitudes))
+            self.phases_var.set(' '.join("%.4g" % value for value in np.degrees(phases)))
+        else:
+            self.magnitudes_var.set("1")
+
+        ttk.Label(self.top, text="Magnitudes (harmonic 1, 2, ...)").grid(row=0, column=0, sticky='e', padx=10, pady=10)
+        ttk.Entry(self.top, textvariable=self.magnitudes_var, width=80).grid(row=0, column=1, columnspan=2, padx=10)
+
+        ttk.Label(self.top, text="Phases (degrees)").grid(row=1, column=0, sticky='e', padx=10, pady=10)
+        ttk.Entry(self.top, textvariable=self.phases_var, width=80).grid(row=1, column=1, columnspan=2, padx=10)
+
+        ttk.Button(self.top, text="Mix Harmonics",
+                   command=lambda: self.__apply(mix_func=True)).grid(row=2, column=1, sticky='we', padx=10, pady=10)
+        ttk.Button(self.top, text="Overwrite Harmonics",
+                   command=lambda: self.__apply(mix_func=False)).grid(row=2, column=2, sticky='we', padx=10, pady=10)
+
+    # END def __init__() #
+
+    def __apply(self, mix_func: bool):
+        """Synthesizes the entered harmonics into the current waveform
+
+        Keyword arguments:
+            :param mix_func: Boolean used to control whether harmonics are mixed or not
+        """
+
+        try:
+            magnitudes = [float(value) for value in self.magnitudes_var.get().replace(',', ' ').split()]
+            phases = [float(value) for value in self.phases_var.get().replace(',', ' ').split()]
+
+            if not magnitudes:
+                raise ValueError("enter at least one magnitude")
+
+            # Missing phases are taken as 0 (and extra ones are ignored) . . .
+            phases = np.radians((phases + [0.0] * len(magnitudes))[:len(magnitudes)])
+
+            self.graph_tool.change_harmonics(magnitudes, phases, mix_func=mix_func)
+
+        except ValueError as error:
+            mb.showerror(title="Harmonics", message=str(error), parent=self.top)
+            return
 
-    @staticmethod
-    def _on_close():
-        """Prevents user from closing dialog window"""
-        return
+        if self.on_change is not None:
+            self.on_change()
 
-    # END def _on_close() #
+    # END def __apply() #
@@ -0,0 +1,153 @@
+import numpy as np
+
+from wav2bin.src.waveform_bank import WaveformBank
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+HARMONIC_COUNT = 16  # Harmonics found when decomposing (and shown in the harmonic editor) . . .
+
+
+def synthesize(magnitudes, phases=None, size: int = 256) -> np.ndarray:
+    """Additive synthesis of harmonics (one inverse FFT for any number of waveforms)
+
+    Harmonic k (starting at 1) adds magnitude * sin(k*t + phase), where t runs over one period across the
+    'size' points (so the waveform loops seamlessly when the ROM is played back).
+
+    Keyword arguments:
+        :param magnitudes: Magnitudes of harmonics 1, 2, ... (2-D arrays give one waveform per row)
+        :param phases: Phases (in radians) of each harmonic (defaults to 0)
+        :param size: Number of points per waveform
+
+    :returns: Array of points with the shape of 'magnitudes' (but 'size' points along the last axis)
+    """
+
+    magnitudes = np.asarray(magnitudes, dtype=float)
+    phases = np.zeros_like(magnitudes) if phases is None else np.asarray(phases, dtype=float)
+    magnitudes, phases = np.broadcast_arrays(magnitudes, phases)
+
+    harmonic_count = magnitudes.shape[-1]
+    if harmonic_count > (size - 1) // 2:
+        raise ValueError("%d harmonics don't fit in %d points (at most %d)" % (harmonic_count, size, (size - 1) // 2))
+
+    # sin(k*t + phase) is the k-th bin holding -i*(size/2)*e^(i*phase) . . .
+    spectrum = np.zeros(magnitudes.shape[:-1] + (size // 2 + 1,), dtype=complex)
+    spectrum[..., 1:harmonic_count + 1] = -0.5j * size * magnitudes * np.exp(1j * phases)
+
+    return np.fft.irfft(spectrum, n=size, axis=-1)
+
+
+# END def synthesize() #
+
+
+def decompose(y, harmonic_count: int = HARMONIC_COUNT) -> tuple:
+    """Finds the harmonics of waveforms (the reverse of 'synthesize', in one FFT)
+
+    Keyword arguments:
+        :param y: Array of points (2-D arrays give one waveform per row)
+        :param harmonic_count: Number of harmonics found
+
+    :returns: Magnitudes, phases (in radians), and offsets (the mean of each waveform)
+    """
+
+    y = np.asarray(y, dtype=float)
+    size = y.shape[-1]
+
+    harmonic_count = min(harmonic_count, (size - 1) // 2)
+
+    spectrum = np.fft.rfft(y, axis=-1)
+    coefficients = spectrum[..., 1:harmonic_count + 1] * (2j / size)
+
+    return np.absolute(coefficients), np.angle(coefficients), spectrum[..., 0].real / size
+
+
+# END def decompose() #
+
+
+def decompose_bank(bank: WaveformBank, harmonic_count: int = HARMONIC_COUNT) -> tuple:
+    """Finds the harmonics of every waveform of a bank (scaled like functions, y_min -> -1 and y_max -> 1)
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' holding the waveforms
+        :param harmonic_count: Number of harmonics found
+
+    :returns: Magnitudes, phases, and offsets, one row per slot (rows of slots not drawn are NaN)
+    """
+
+    size = bank.x_max - bank.x_min + 1
+    drawn = bank.line_set.drawn_slots()
+
+    # Waveforms are stacked so the whole bank goes through one FFT . . .
+    y = np.empty((len(drawn), size))
+    for row, slot in enumerate(drawn):
+        y[row] = bank.line_set[slot].y
+    y -= bank.y_mid_point
+    y /= bank.y_max - bank.y_mid_point
+
+    magnitudes, phases, offsets = decompose(y, harmonic_count)
+
+    results = []
+    for found in (magnitudes, phases, offsets):
+        array = np.full((len(bank.line_set),) + found.shape[1:], np.nan)
+        array[drawn] = found
+        results.append(array)
+
+    return tuple(results)
+
+
+# END def decompose_bank() #
+
+
+def render_harmonics(bank: WaveformBank, spectra, mix_func: bool = False) -> list:
+    """Synthesizes many waveforms into a bank in one inverse FFT
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' being changed
+        :param spectra: Dictionary (or list of pairs) of waveform slot -> magnitudes or (magnitudes, phases)
+        :param mix_func: Boolean used to control whether waveforms are mixed or not
+
+    :returns: List of slots changed
+    """
+
+    if isinstance(spectra, dict):
+        spectra = spectra.items()
+
+    slots, magnitudes, phases = [], [], []
+    for slot, spectrum in spectra:
+        if not 0 <= slot < len(bank.line_set):
+            raise ValueError("slot %d is outside of 0 - %d" % (slot, len(bank.line_set) - 1))
+
+        magnitude, phase = spectrum if isinstance(spectrum, tuple) else (spectrum, None)
+        magnitude = np.atleast_1d(np.asarray(magnitude, dtype=float))
+        phase = np.zeros_like(magnitude) if phase is None else np.atleast_1d(np.asarray(phase, dtype=float))
+
+        slots.append(slot)
+        magnitudes.append(magnitude)
+        phases.append(np.broadcast_to(phase, magnitude.shape))
+
+    if not slots:
+        return []
+
+    # Spectra are padded to the same number of harmonics, so every row goes through together . . .
+    harmonic_count = max(magnitude.size for magnitude in magnitudes)
+    magnitude_rows = np.zeros((len(slots), harmonic_count))
+    phase_rows = np.zeros((len(slots), harmonic_count))
+    for row, (magnitude, phase) in enumerate(zip(magnitudes, phases)):
+        magnitude_rows[row, :magnitude.size] = magnitude
+        phase_rows[row, :phase.size] = phase
+
+    y_rows = synthesize(magnitude_rows, phase_rows, bank.x_max - bank.x_min + 1)
+    y_rows *= bank.y_max - bank.y_mid_point
+    y_rows += bank.y_mid_point
+
+    current_waveform = bank.current_waveform
+
+    try:
+        for slot, y_array in zip(slots, y_rows):
+            bank.current_waveform = slot
+            bank.apply_waveform(y_array, mix_func)
+    finally:
+        bank.current_waveform = current_waveform
+
+    return slots
+
+
+# END def render_harmonics() #
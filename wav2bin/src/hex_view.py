@@ -0,0 +1,99 @@
+import numpy as np
+
+from wav2bin.src.exporters import HEX_PAIRS
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+BYTES_PER_ROW = 16
+OFFSET_DIGITS = 8
+
+
+class HexRows(object):
+    """Formats rows of a hex/ASCII dump on demand (only the rows asked for are ever formatted)
+
+    Every row is laid out the same (offset, hex bytes grouped by sample, then ASCII), so a blank row and the
+    column of every byte are worked out once; formatting rows is then a few array lookups.
+
+    Components:
+        :param self.bytes_per_row: Number of bytes shown on each row
+        :param self.group: Number of bytes grouped together (bytes per sample)
+        :param self.image: 1-D array of bytes being shown
+        :param self.width: Number of characters per row
+        :param self.__ascii_columns: Column of each byte's ASCII character
+        :param self.__blank: Row with every column not holding a byte filled in
+        :param self.__hex_columns: Column of each byte's first hex digit
+    """
+
+    def __init__(self, image, group: int = 1, bytes_per_row: int = BYTES_PER_ROW):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param image: Bytes (or any array, viewed as bytes) being shown
+            :param group: Number of bytes grouped together (bytes per sample)
+            :param bytes_per_row: Number of bytes shown on each row (a multiple of 'group')
+        """
+
+        self.image = np.asarray(image).reshape(-1).view(np.uint8)
+        self.group = group
+        self.bytes_per_row = bytes_per_row
+
+        # Hex digits are split into groups by a space, with an extra space half way along the row . . .
+        byte = np.arange(bytes_per_row)
+        self.__hex_columns = OFFSET_DIGITS + 2 + 2 * byte + byte // group + (byte >= bytes_per_row // 2)
+        self.__ascii_columns = self.__hex_columns[-1] + 5 + byte
+        self.width = int(self.__ascii_columns[-1]) + 2
+
+        self.__blank = np.full(self.width, ord(' '), dtype=np.uint8)
+        self.__blank[self.__ascii_columns[0] - 1] = ord('|')
+        self.__blank[-1] = ord('|')
+
+    # END def __init__() #
+
+    def __len__(self) -> int:
+        """Number of rows"""
+
+        return -(-self.image.size // self.bytes_per_row)
+
+    # END def __len__() #
+
+    def format(self, start: int, stop: int) -> str:
+        """Formats rows (rows past the end are left out)
+
+        Keyword arguments:
+            :param start: Index of first row
+            :param stop: Index after the last row
+
+        :returns: Rows joined by newlines
+        """
+
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return ''
+
+        # Rows are padded out to whole rows (the padding is blanked afterwards) . . .
+        chunk = self.image[start * self.bytes_per_row:stop * self.bytes_per_row]
+        values = np.zeros((stop - start) * self.bytes_per_row, dtype=np.uint8)
+        values[:chunk.size] = chunk
+        values = values.reshape(-1, self.bytes_per_row)
+
+        lines = np.empty((stop - start, self.width + 1), dtype=np.uint8)
+        lines[:, :-1] = self.__blank
+        lines[:, -1] = ord('\n')
+
+        offsets = (np.arange(start, stop, dtype=np.int64) * self.bytes_per_row)[:, np.newaxis]
+        shifts = 8 * np.arange(OFFSET_DIGITS // 2 - 1, -1, -1)
+        lines[:, :OFFSET_DIGITS] = HEX_PAIRS[(offsets >> shifts) & 0xFF].view(np.uint8)
+
+        digits = HEX_PAIRS[values].view(np.uint8).reshape(len(lines), -1, 2)
+        lines[:, self.__hex_columns] = digits[..., 0]
+        lines[:, self.__hex_columns + 1] = digits[..., 1]
+        lines[:, self.__ascii_columns] = np.where((values >= 0x20) & (values < 0x7F), values, ord('.'))
+
+        # Bytes past the end of the image are left blank . . .
+        missing = (stop - start) * self.bytes_per_row - chunk.size
+        if missing:
+            for column in (self.__hex_columns, self.__hex_columns + 1, self.__ascii_columns):
+                lines[-1, column[-missing:]] = ord(' ')
+
+        return lines.tobytes()[:-1].decode('ascii')
+
+    # END def format() #
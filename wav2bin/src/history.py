@@ -0,0 +1,415 @@
+import numpy as np
+
+from collections import deque
+
+from wav2bin.src.waveform_bank import LinePoints, AFFINE_EDIT, GENERATED_EDIT
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+HISTORY_BYTES = 32 * 2 ** 20  # Memory kept for undo/redo . . .
+ENTRY_BYTES = 64              # Memory counted for entries which don't keep any points . . .
+
+
+class History(object):
+    """Undo/redo history of waveform edits, kept within a memory budget
+
+    Each edit only records the slot it changed. Edits of a known shape copy no points at all: amplitude and
+    level changes share the slot's stored points and keep the pending scale and offset, and generated
+    waveforms share the points from before the edit and keep how to generate them again. Shared points are
+    copied on write by the slot (see 'LinePoints.share'), so undo puts them back exactly. Other edits keep
+    the points which changed when few samples change (so undo and redo cost the number of changed samples),
+    or otherwise the slot's before and after points.
+
+    Components:
+        :param self.max_bytes: Memory the history is allowed to hold
+        :param self.nbytes: Memory the history currently holds (shared points are counted once)
+        :param self.__held: Dictionary of id -> [points, number of entries holding them] for shared points
+        :param self.__pending: Slot, edit description, and state captured before the edit in progress
+        :param self.__redo: Entries which can be redone (most recent last)
+        :param self.__undo: Entries which can be undone (most recent last)
+    """
+
+    def __init__(self, max_bytes: int = HISTORY_BYTES):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param max_bytes: Memory the history is allowed to hold
+        """
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+        self.__undo = deque()
+        self.__redo = deque()
+        self.__held = {}
+        self.__pending = None
+
+    # END def __init__() #
+
+    @property
+    def can_undo(self) -> bool:
+        """Whether or not there's an edit to undo"""
+
+        return bool(self.__undo)
+
+    # END def can_undo() #
+
+    @property
+    def can_redo(self) -> bool:
+        """Whether or not there's an edit to redo"""
+
+        return bool(self.__redo)
+
+    # END def can_redo() #
+
+    @property
+    def recording(self) -> bool:
+        """Whether or not an edit is in progress"""
+
+        return self.__pending is not None
+
+    # END def recording() #
+
+    def begin(self, line_set: list, slot: int, edit: tuple = None):
+        """Captures a slot before it's edited
+
+        Keyword arguments:
+            :param line_set: List of 'LinePoints' objects
+            :param slot: Index of waveform being edited
+            :param edit: How the edit is recorded (see 'recorded'), or None to keep the slot's points
+        """
+
+        line = line_set[slot]
+
+        # Points are shared rather than copied, and only copied by the slot if it changes them . . .
+        if edit is not None and edit[0] == AFFINE_EDIT and line.drawn:
+            self.__pending = (slot, edit, line.share())
+
+        elif edit is not None and edit[0] == GENERATED_EDIT:
+            mix_func = edit[2] and line.drawn
+            self.__pending = (slot, (GENERATED_EDIT, edit[1], mix_func), line.share() if line.drawn else None)
+
+        else:
+            self.__pending = (slot, None, _points(line))
+
+    # END def begin() #
+
+    def end(self, line_set: list):
+        """Records the edit started by 'begin' (nothing is recorded if the slot didn't change)
+
+        Keyword arguments:
+            :param line_set: List of 'LinePoints' objects
+        """
+
+        slot, edit, before = self.__pending
+        self.__pending = None
+
+        line = line_set[slot]
+        if edit is None:
+            entry = HistoryEntry(slot, before, _points(line))
+        elif edit[0] == AFFINE_EDIT:
+            entry = AffineEntry(slot, before, line.share())
+        else:
+            entry = GeneratedEntry(slot, edit[1], edit[2], before, line.pending)
+
+        if entry.nbytes is None:
+            return  # Slot is unchanged . . .
+
+        self.__undo.append(entry)
+        self.__count(entry, 1)
+
+        # A new edit replaces anything which could have been redone . . .
+        while self.__redo:
+            self.__count(self.__redo.pop(), -1)
+
+        # Oldest edits are forgotten until the history fits . . .
+        while self.nbytes > self.max_bytes and self.__undo:
+            self.__count(self.__undo.popleft(), -1)
+
+    # END def end() #
+
+    def undo(self, line_set: list, x_array) -> int:
+        """Undoes the most recent edit
+
+        Keyword arguments:
+            :param line_set: List of 'LinePoints' objects
+            :param x_array: x points given to restored waveforms
+
+        :returns: Index of waveform changed (None if there's nothing to undo)
+        """
+
+        if not self.__undo:
+            return None
+
+        entry = self.__undo.pop()
+        entry.apply(line_set, x_array, undo=True)
+        self.__redo.append(entry)
+
+        return entry.slot
+
+    # END def undo() #
+
+    def redo(self, line_set: list, x_array) -> int:
+        """Redoes the most recently undone edit
+
+        Keyword arguments:
+            :param line_set: List of 'LinePoints' objects
+            :param x_array: x points given to restored waveforms
+
+        :returns: Index of waveform changed (None if there's nothing to redo)
+        """
+
+        if not self.__redo:
+            return None
+
+        entry = self.__redo.pop()
+        entry.apply(line_set, x_array, undo=False)
+        self.__undo.append(entry)
+
+        return entry.slot
+
+    # END def redo() #
+
+    def clear(self):
+        """Forgets every edit"""
+
+        self.__undo.clear()
+        self.__redo.clear()
+        self.__held.clear()
+        self.__pending = None
+        self.nbytes = 0
+
+    # END def clear() #
+
+    def __count(self, entry, change: int):
+        """Adds (or takes away) the memory an entry holds, counting points shared by several entries once
+
+        Keyword arguments:
+            :param entry: Entry added to (or dropped from) the history
+            :param change: 1 when the entry is added, -1 when it's dropped
+        """
+
+        self.nbytes += change * entry.nbytes
+
+        for points in entry.held:
+            held = self.__held.setdefault(id(points), [points, 0])
+            if held[1] == 0:
+                self.nbytes += points.nbytes
+
+            held[1] += change
+            if held[1] == 0:
+                self.nbytes -= points.nbytes
+                del self.__held[id(points)]
+
+    # END def __count() #
+
+
+class HistoryEntry(object):
+    """A single edit of a single waveform slot
+
+    Components:
+        :param self.after: Points after the edit (only the changed ones if 'self.index' is set)
+        :param self.before: Points before the edit (only the changed ones if 'self.index' is set)
+        :param self.held: Points shared with the slot (none, as the entry keeps its own copies)
+        :param self.index: Indexes of changed points (None when whole waveforms are kept)
+        :param self.nbytes: Memory held by the entry (None if nothing changed)
+        :param self.slot: Index of waveform edited
+    """
+
+    held = ()
+
+    def __init__(self, slot: int, before, after):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param slot: Index of waveform edited
+            :param before: Points before the edit (None if the waveform wasn't drawn)
+            :param after: Points after the edit (None if the waveform isn't drawn)
+        """
+
+        self.slot = slot
+        self.index = None
+        self.before = before
+        self.after = after
+
+        if before is None or after is None or before.shape != after.shape:
+            if before is None and after is None:
+                self.nbytes = None
+            else:
+                self.nbytes = sum(points.nbytes for points in (before, after) if points is not None)
+            return
+
+        changed = np.flatnonzero(before != after)
+
+        if changed.size == 0:
+            self.nbytes = None
+
+        # Changed points are kept on their own when it's less than whole waveforms . . .
+        elif changed.size * (changed.itemsize + 2 * before.itemsize) < before.nbytes + after.nbytes:
+            self.index = changed
+            self.before = before[changed]
+            self.after = after[changed]
+            self.nbytes = changed.nbytes + self.before.nbytes + self.after.nbytes
+
+        else:
+            self.nbytes = before.nbytes + after.nbytes
+
+    # END def __init__() #
+
+    def apply(self, line_set: list, x_array, undo: bool):
+        """Puts the waveform back to how it was before (undo) or after (redo) the edit
+
+        Keyword arguments:
+            :param line_set: List of 'LinePoints' objects
+            :param x_array: x points given to restored waveforms
+            :param undo: Whether the edit is undone (or redone)
+        """
+
+        points = self.before if undo else self.after
+        line = line_set[self.slot]
+
+        if self.index is not None:
+            y = line.y
+            y[self.index] = points
+            line.y = y  # Lets lines tracking changes (i.e. 'RomLinePoints') know . . .
+
+        elif points is None:
+            line_set[self.slot] = LinePoints()
+
+        else:
+            line.x = x_array
+            line.y = points.copy()  # History's copy is never edited in place . . .
+            line.drawn = True
+
+    # END def apply() #
+
+
+class AffineEntry(object):
+    """A single edit which scaled and offset a waveform (y = scale * y + offset), kept as the slot's stored
+    points (shared, not copied) and the scale and offset pending on them before and after the edit
+
+    Components:
+        :param self.after: State of the slot after the edit (see 'LinePoints.share')
+        :param self.before: State of the slot before the edit (see 'LinePoints.share')
+        :param self.held: Stored points shared with the slot
+        :param self.nbytes: Memory held by the entry, besides 'self.held' (None if nothing changed)
+        :param self.slot: Index of waveform edited
+    """
+
+    def __init__(self, slot: int, before: tuple, after: tuple):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param slot: Index of waveform edited
+            :param before: State of the slot before the edit
+            :param after: State of the slot after the edit
+        """
+
+        self.slot = slot
+        self.before = before
+        self.after = after
+
+        # Scaling only changes what's pending, so the stored points are almost always the same array . . .
+        self.held = (before[0],) if before[0] is after[0] else (before[0], after[0])
+
+        unchanged = before[0] is after[0] and before[1:3] == after[1:3]
+        self.nbytes = None if unchanged else ENTRY_BYTES
+
+    # END def __init__() #
+
+    def apply(self, line_set: list, x_array, undo: bool):
+        """Puts the waveform back to how it was before (undo) or after (redo) the edit
+
+        Keyword arguments:
+            :param line_set: List of 'LinePoints' objects
+            :param x_array: x points (unused, as the waveform is only scaled)
+            :param undo: Whether the edit is undone (or redone)
+        """
+
+        line_set[self.slot].restore(self.before if undo else self.after)
+
+    # END def apply() #
+
+
+class GeneratedEntry(object):
+    """A single edit which mixed in (or overwrote with) points which can be generated again
+
+    The slot's points from before the edit are shared (not copied) and put back when undone; when redone,
+    the points are generated and mixed in (or written) again, followed by any rescaling the edit did.
+
+    Components:
+        :param self.before: State of the slot before the edit (None if the waveform wasn't drawn)
+        :param self.generate: Function returning the generated y points
+        :param self.held: Stored points shared with the slot
+        :param self.mix_func: Whether the points were mixed in (or written over the waveform)
+        :param self.nbytes: Memory held by the entry, besides 'self.held'
+        :param self.offset: Amount added to the waveform after the points were mixed in (or written)
+        :param self.scale: Factor the waveform was multiplied by after the points were mixed in (or written)
+        :param self.slot: Index of waveform edited
+    """
+
+    def __init__(self, slot: int, generate, mix_func: bool, before, after: tuple):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param slot: Index of waveform edited
+            :param generate: Function returning the generated y points
+            :param mix_func: Whether the points were mixed in (or written over the waveform)
+            :param before: State of the slot before the edit (None if the waveform wasn't drawn)
+            :param after: Scale and offset pending on the waveform after the edit
+        """
+
+        self.slot = slot
+        self.generate = generate
+        self.mix_func = mix_func
+        self.before = before
+        self.scale, self.offset = after
+
+        self.held = () if before is None else (before[0],)
+        self.nbytes = ENTRY_BYTES
+
+    # END def __init__() #
+
+    def apply(self, line_set: list, x_array, undo: bool):
+        """Puts the waveform back to how it was before (undo) or after (redo) the edit
+
+        Keyword arguments:
+            :param line_set: List of 'LinePoints' objects
+            :param x_array: x points given to restored waveforms
+            :param undo: Whether the edit is undone (or redone)
+        """
+
+        line = line_set[self.slot]
+
+        if undo and self.before is None:
+            line_set[self.slot] = LinePoints()
+
+        elif undo:
+            line.restore(self.before)
+
+        else:
+            # Same steps as the edit took, so the points come out exactly the same . . .
+            if self.mix_func:
+                line.y += self.generate()
+            else:
+                line.x = x_array
+                line.y = np.array(self.generate(), dtype=float)
+                line.drawn = True
+
+            line.transform(self.scale, self.offset)
+
+    # END def apply() #
+
+
+def _points(line: LinePoints):
+    """Copies the points of a line (None if it isn't drawn)
+
+    Keyword arguments:
+        :param line: 'LinePoints' object
+
+    :returns: Array of y points or None
+    """
+
+    return np.array(line.y, dtype=float) if line.drawn else None
+
+
+# END def _points() #
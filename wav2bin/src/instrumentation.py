@@ -0,0 +1,352 @@
+import atexit
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+
+import numpy as np
+
+from functools import wraps
+from time import perf_counter
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+TRACE_ENV = 'WAV2BIN_TRACE'             # Set to a file name (or 1) to trace the program . . .
+TRACE_FILE = 'wav2bin_trace.json'       # Trace written when TRACE_ENV is 1 . . .
+
+RING_SIZE = 2 ** 16                     # Events kept (the oldest are overwritten) . . .
+PERCENTILES = (50, 90, 99)
+
+HISTOGRAM_BUCKETS = np.array([0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000])  # Upper edges (in ms) . . .
+HISTOGRAM_SHADES = " .:-=+*#%@"
+
+SPAN, LATENCY = 0, 1    # Kinds of events (time spent in a function, time from queued to painted) . . .
+
+
+class Tracer(object):
+    """Ring buffer of timed events (wall time and allocated blocks of each call, or latency of each event)
+
+    Events are kept in preallocated arrays, so tracing takes the same memory however long the program runs.
+
+    Components:
+        :param self.count: Number of events recorded (including any overwritten)
+        :param self.names: List of event names (events hold an index into it)
+        :param self.origin: 'perf_counter' time the tracer started at
+        :param self.size: Number of events kept
+        :param self.__blocks: Change in allocated memory blocks of each event
+        :param self.__durations: Duration (in seconds) of each event
+        :param self.__kinds: Kind of each event (SPAN or LATENCY)
+        :param self.__name_ids: Dictionary of event name -> index in 'self.names'
+        :param self.__names: Index of the name of each event
+        :param self.__starts: Start of each event (in seconds from 'self.origin')
+    """
+
+    def __init__(self, size: int = RING_SIZE):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param size: Number of events kept
+        """
+
+        self.size = size
+        self.count = 0
+        self.origin = perf_counter()
+
+        self.names = []
+        self.__name_ids = {}
+
+        self.__names = np.zeros(size, dtype=np.int32)
+        self.__starts = np.zeros(size)
+        self.__durations = np.zeros(size)
+        self.__blocks = np.zeros(size, dtype=np.int64)
+        self.__kinds = np.zeros(size, dtype=np.uint8)
+
+    # END def __init__() #
+
+    def record(self, name: str, start: float, duration: float, blocks: int = 0, kind: int = SPAN):
+        """Adds an event (overwriting the oldest once the buffer is full)
+
+        Keyword arguments:
+            :param name: Name of event
+            :param start: 'perf_counter' time the event started at
+            :param duration: Duration of the event (in seconds)
+            :param blocks: Change in allocated memory blocks during the event
+            :param kind: SPAN or LATENCY
+        """
+
+        name_id = self.__name_ids.get(name)
+        if name_id is None:
+            name_id = self.__name_ids[name] = len(self.names)
+            self.names.append(name)
+
+        index = self.count % self.size
+        self.__names[index] = name_id
+        self.__starts[index] = start - self.origin
+        self.__durations[index] = duration
+        self.__blocks[index] = blocks
+        self.__kinds[index] = kind
+
+        self.count += 1
+
+    # END def record() #
+
+    def latency(self, name: str, queued: float):
+        """Adds the time from an event being queued until now (i.e. until it's painted)
+
+        Keyword arguments:
+            :param name: Name of event
+            :param queued: 'perf_counter' time the event was queued at
+        """
+
+        self.record(name, queued, perf_counter() - queued, kind=LATENCY)
+
+    # END def latency() #
+
+    def events(self) -> tuple:
+        """Finds the events kept, oldest first
+
+        :returns: Arrays of name indexes, starts, durations, blocks, and kinds
+        """
+
+        kept = min(self.count, self.size)
+        order = (np.arange(kept) + (self.count - kept)) % self.size
+
+        return (self.__names[order], self.__starts[order], self.__durations[order],
+                self.__blocks[order], self.__kinds[order])
+
+    # END def events() #
+
+    def summary(self) -> list:
+        """Finds the percentiles of every event name
+
+        :returns: List of dictionaries (name, kind, count, percentiles in seconds, max, mean blocks, histogram)
+        """
+
+        names, starts, durations, blocks, kinds = self.events()
+        rows = []
+
+        for name_id, name in enumerate(self.names):
+            for kind in (SPAN, LATENCY):
+                found = (names == name_id) & (kinds == kind)
+                if not found.any():
+                    continue
+
+                times = durations[found]
+                rows.append({"name": name, "kind": "latency" if kind == LATENCY else "span",
+                             "count": int(times.size),
+                             "percentiles": dict(zip(PERCENTILES, np.percentile(times, PERCENTILES).tolist())),
+                             "max": float(times.max()),
+                             "blocks": float(blocks[found].mean()),
+                             "histogram": np.bincount(np.searchsorted(HISTOGRAM_BUCKETS, times * 1e3),
+                                                      minlength=HISTOGRAM_BUCKETS.size + 1).tolist()})
+
+        return rows
+
+    # END def summary() #
+
+    def print_summary(self, file=None):
+        """Prints the percentiles of every event name, each with a histogram of its durations
+
+        Keyword arguments:
+            :param file: File printed to (defaults to stderr)
+        """
+
+        file = sys.stderr if file is None else file
+
+        edges = ' '.join("%g" % edge for edge in HISTOGRAM_BUCKETS)
+        print("%-44s %-7s %7s %9s %9s %9s %9s %8s  histogram (ms: %s)" %
+              ("event", "kind", "count", "p50 (ms)", "p90 (ms)", "p99 (ms)", "max (ms)", "blocks", edges), file=file)
+
+        for row in self.summary():
+            histogram = np.array(row["histogram"])
+            shades = np.ceil(histogram / histogram.max() * (len(HISTOGRAM_SHADES) - 1)).astype(int)
+
+            print("%-44s %-7s %7d %9.3f %9.3f %9.3f %9.3f %8.1f  |%s|" %
+                  (row["name"], row["kind"], row["count"],
+                   *(row["percentiles"][percentile] * 1e3 for percentile in PERCENTILES),
+                   row["max"] * 1e3, row["blocks"], ''.join(HISTOGRAM_SHADES[shade] for shade in shades)),
+                  file=file)
+
+        if self.count > self.size:
+            print("(only the last %d of %d events were kept)" % (self.size, self.count), file=file)
+
+    # END def print_summary() #
+
+    def write_chrome_trace(self, file_name: str) -> int:
+        """Writes the events kept as a Chrome trace (open with chrome://tracing or Perfetto)
+
+        Keyword arguments:
+            :param file_name: Name of file being saved to
+
+        :returns: Number of events written
+        """
+
+        names, starts, durations, blocks, kinds = self.events()
+
+        events = [{"name": self.names[name_id], "cat": "latency" if kind == LATENCY else "span", "ph": "X",
+                   "ts": start * 1e6, "dur": duration * 1e6, "pid": os.getpid(), "tid": int(kind),
+                   "args": {"blocks": block}}
+                  for name_id, start, duration, block, kind in zip(names.tolist(), starts.tolist(),
+                                                                   durations.tolist(), blocks.tolist(),
+                                                                   kinds.tolist())]
+
+        with open(file_name, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+        return len(events)
+
+    # END def write_chrome_trace() #
+
+    def start_worker(self, file_name: str):
+        """Starts the trace of a worker process over (run in each worker as it starts)
+
+        Forked workers inherit the events recorded so far and leave through 'os._exit' (which skips 'atexit'),
+        so the inherited events are dropped and the trace is written by a finalizer the worker runs as it exits.
+
+        Keyword arguments:
+            :param file_name: Name of trace file
+        """
+
+        self.count = 0
+        multiprocessing.util.Finalize(self, self.finish, args=(file_name,), exitpriority=0)
+
+    # END def start_worker() #
+
+    def finish(self, file_name: str):
+        """Writes the trace and prints its summary (registered to run on exit)
+
+        Worker processes (i.e. of a process pool) inherit the environment, so they trace too; each writes its own
+        file, named after its process ID, rather than overwriting the main trace.
+
+        Keyword arguments:
+            :param file_name: Name of trace file
+        """
+
+        if not self.count:
+            return
+
+        # Workers only know they're workers once they've started, so it's checked here rather than in 'enable' . . .
+        if multiprocessing.parent_process() is not None:
+            root, extension = os.path.splitext(file_name)
+            file_name = "%s.%d%s" % (root, os.getpid(), extension)
+
+        self.write_chrome_trace(file_name)
+        self.print_summary()
+        print("Trace of %d events written to %s" % (min(self.count, self.size), file_name), file=sys.stderr)
+
+        # Spawned workers may finish twice (by finalizer and 'atexit'), so the trace is only written once . . .
+        self.count = 0
+
+    # END def finish() #
+
+
+def enable(file_name: str = TRACE_FILE, size: int = RING_SIZE) -> Tracer:
+    """Starts tracing (only functions decorated after this are traced, so call it before importing them)
+
+    Keyword arguments:
+        :param file_name: Name of trace file written on exit (None to not write one)
+        :param size: Number of events kept
+
+    :returns: 'Tracer' events are recorded into
+    """
+
+    global TRACER
+
+    if TRACER is None:
+        TRACER = Tracer(size)
+        if file_name is not None:
+            atexit.register(TRACER.finish, file_name)
+            multiprocessing.util.register_after_fork(TRACER, lambda tracer: tracer.start_worker(file_name))
+
+    return TRACER
+
+
+# END def enable() #
+
+
+def traced(name: str = None):
+    """Decorator timing each call of a function (the function is left untouched unless tracing is on)
+
+    Keyword arguments:
+        :param name: Name of event (defaults to the function's qualified name)
+
+    :returns: Decorator
+    """
+
+    def decorate(function):
+        if TRACER is None:
+            return function
+
+        event_name = function.__qualname__ if name is None else name
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            blocks = sys.getallocatedblocks()
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                TRACER.record(event_name, start, perf_counter() - start, sys.getallocatedblocks() - blocks)
+
+        return wrapper
+
+    return decorate
+
+
+# END def traced() #
+
+
+def traced_event(name: str = None):
+    """Decorator for tkinter handlers, timing each call and the latency until the window is idle again
+
+    The handler's widget (its first argument) is asked to run a callback once every pending event and
+    redraw has been processed; the time from the handler starting until then is recorded as latency.
+
+    Keyword arguments:
+        :param name: Name of event (defaults to the function's qualified name)
+
+    :returns: Decorator
+    """
+
+    def decorate(function):
+        if TRACER is None:
+            return function
+
+        event_name = function.__qualname__ if name is None else name
+        function = traced(event_name)(function)
+
+        @wraps(function)
+        def wrapper(widget, *args, **kwargs):
+            queued = perf_counter()
+            try:
+                return function(widget, *args, **kwargs)
+            finally:
+                widget.after_idle(TRACER.latency, event_name, queued)
+
+        return wrapper
+
+    return decorate
+
+
+# END def traced_event() #
+
+
+def mark_latency(name: str, queued: float):
+    """Records the time from an event being queued until now (does nothing unless tracing is on)
+
+    Keyword arguments:
+        :param name: Name of event
+        :param queued: 'perf_counter' time the event was queued at
+    """
+
+    if TRACER is not None:
+        TRACER.latency(name, queued)
+
+
+# END def mark_latency() #
+
+
+# Tracing is switched on (before anything is decorated) by the environment . . .
+TRACER = None
+if os.environ.get(TRACE_ENV):
+    enable(TRACE_FILE if os.environ[TRACE_ENV] == '1' else os.environ[TRACE_ENV])
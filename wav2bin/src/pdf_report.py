@@ -0,0 +1,487 @@
+import os
+import zlib
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from wav2bin.src.instrumentation import traced
+from wav2bin.src.waveform_bank import WaveformBank
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+REPORT_MODES = ("vector", "raster")
+DEFAULT_REPORT_MODE = "vector"
+
+PANEL_ROWS, PANEL_COLS = 4, 2   # Waveforms laid out on each page . . .
+PAGE_SIZE = (612, 792)          # Letter, in points . . .
+MARGIN = 36
+GUTTER = (18, 24)               # Space between panels (x, y), leaving room for each title . . .
+
+x_MINOR_TICKS, x_MAJOR_TICKS = 61, 4
+y_MINOR_TICKS, y_MAJOR_TICKS = 29, 8
+
+THUMBNAIL_DPI = 100             # Resolution of pages in "raster" mode . . .
+PAGES_PER_TASK = 4              # Pages rendered by a process at a time . . .
+
+# Raster renderer of a worker process (set up by '_start_worker', and gone with the pool) . . .
+_RENDERER = None
+
+
+def render_report(bank: WaveformBank, file_name: str, mode: str = DEFAULT_REPORT_MODE, jobs: int = None) -> int:
+    """Prints every waveform of a bank to a pdf (PANEL_ROWS * PANEL_COLS waveforms to a page)
+
+    Pages are rendered in a process pool, reading the bank from shared memory, and written into one pdf as
+    they come back. "vector" pages are drawn as pdf paths (sharing one grid); "raster" pages are rendered
+    by matplotlib as images at THUMBNAIL_DPI.
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' being printed
+        :param file_name: Name of file being saved to
+        :param mode: One of REPORT_MODES
+        :param jobs: Number of processes used (defaults to the number of CPUs)
+
+    :returns: Number of pages written
+    """
+
+    if mode not in REPORT_MODES:
+        raise ValueError("unknown report mode %r (use %s)" % (mode, ', '.join(REPORT_MODES)))
+
+    panels = PANEL_ROWS * PANEL_COLS
+    page_count = -(-len(bank.line_set) // panels)
+    depth = bank.x_max - bank.x_min + 1
+
+    # Drawn waveforms are packed into rows (slots never drawn aren't copied) . . .
+    drawn = bank.line_set.drawn_slots()
+    rows = dict((slot, row) for row, slot in enumerate(drawn))
+    bounds = (bank.x_min, bank.x_max, bank.y_min, bank.y_max)
+
+    tasks = []
+    for first_page in range(0, page_count, PAGES_PER_TASK):
+        pages = []
+        for page in range(first_page, min(first_page + PAGES_PER_TASK, page_count)):
+            slots = range(page * panels, min((page + 1) * panels, len(bank.line_set)))
+            pages.append([(slot, rows.get(slot, -1)) for slot in slots])
+
+        tasks.append({'mode': mode, 'pages': pages, 'bounds': bounds})
+
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    memory = data = renderer = None
+
+    try:
+        if jobs > 1:
+            memory = shared_memory.SharedMemory(create=True, size=max(len(drawn) * depth * 8, 1))
+            data = np.ndarray((len(drawn), depth), dtype=float, buffer=memory.buf)
+        else:
+            data = np.empty((len(drawn), depth))
+
+        for row, slot in enumerate(drawn):
+            data[row] = bank.line_set[slot].y
+
+        with open(file_name, 'wb') as f:
+            writer = _PdfWriter(f)
+            if mode == "vector":
+                writer.add_grid(_grid_stream())
+
+            if jobs > 1:
+                for task in tasks:
+                    task.update(memory=memory.name, shape=data.shape)
+
+                # Each worker sets up its renderer once, and reuses it for every task . . .
+                with ProcessPoolExecutor(max_workers=jobs, initializer=_start_worker,
+                                         initargs=(mode, bounds)) as executor:
+                    for rendered in executor.map(_render_pages, tasks):
+                        writer.add_pages(rendered)
+            else:
+                if mode == "raster":
+                    renderer = _RasterRenderer(bounds)
+
+                for task in tasks:
+                    task.update(data=data)
+                    writer.add_pages(_render_pages(task, renderer))
+
+            writer.close()
+
+    finally:
+        if renderer is not None:
+            renderer.close()
+
+        if memory is not None:
+            data = None     # Shared memory can't be closed while an array still uses it . . .
+            memory.close()
+            memory.unlink()
+
+    return page_count
+
+
+# END def render_report() #
+
+
+def _start_worker(mode: str, bounds: tuple):
+    """Sets up a worker process of 'render_report' (run once, as the process starts)
+
+    Keyword arguments:
+        :param mode: One of REPORT_MODES
+        :param bounds: x_min, x_max, y_min, y_max of the bank
+    """
+
+    global _RENDERER
+
+    if mode == "raster":
+        _RENDERER = _RasterRenderer(bounds)
+
+
+# END def _start_worker() #
+
+
+@traced()
+def _render_pages(task: dict, renderer=None) -> list:
+    """Renders a run of pages (run within a worker process, or in-process for a single job)
+
+    Keyword arguments:
+        :param task: Dictionary holding 'mode', 'bounds', 'pages' (list of (slot, row) pairs for each page),
+                     and either 'data' (array of drawn waveforms) or 'memory' and 'shape' (shared memory)
+        :param renderer: '_RasterRenderer' used for "raster" pages (defaults to the worker's)
+
+    :returns: List of rendered pages (content stream, plus an image for "raster" pages)
+    """
+
+    memory = None
+    if 'data' in task:
+        data = task['data']
+    else:
+        memory = shared_memory.SharedMemory(name=task['memory'])
+        data = np.ndarray(task['shape'], dtype=float, buffer=memory.buf)
+
+    try:
+        if task['mode'] == "vector":
+            return [(_vector_page(page, data, task['bounds']), None) for page in task['pages']]
+
+        renderer = _RENDERER if renderer is None else renderer
+
+        return [renderer.render(page, data) for page in task['pages']]
+
+    finally:
+        if memory is not None:
+            del data
+            memory.close()
+
+
+# END def _render_pages() #
+
+
+def _panel_origins() -> tuple:
+    """Finds the lower-left corner of each panel on a page (left to right, top to bottom)
+
+    :returns: List of (x, y) points and the (width, height) of a panel
+    """
+
+    width = (PAGE_SIZE[0] - 2 * MARGIN - (PANEL_COLS - 1) * GUTTER[0]) / PANEL_COLS
+    height = (PAGE_SIZE[1] - 2 * MARGIN - PANEL_ROWS * GUTTER[1]) / PANEL_ROWS
+
+    origins = []
+    for panel in range(PANEL_ROWS * PANEL_COLS):
+        row, col = divmod(panel, PANEL_COLS)
+        origins.append((MARGIN + col * (width + GUTTER[0]),
+                        PAGE_SIZE[1] - MARGIN - (row + 1) * (height + GUTTER[1])))
+
+    return origins, (width, height)
+
+
+# END def _panel_origins() #
+
+
+def _grid_stream() -> bytes:
+    """Draws the grid and frame shared by every panel (as a pdf form)
+
+    :returns: Content stream of the grid
+    """
+
+    origins, (width, height) = _panel_origins()
+    lines = []
+
+    # Minor lines are lighter than major lines, like the graph in the GUI . . .
+    for ticks_x, ticks_y, gray in ((x_MINOR_TICKS, y_MINOR_TICKS, 0.9), (x_MAJOR_TICKS, y_MAJOR_TICKS, 0.7)):
+        lines.append("%.2f G 0.3 w" % gray)
+        lines.extend("%.2f 0 m %.2f %.2f l S" % (x, x, height) for x in np.linspace(0, width, ticks_x))
+        lines.extend("0 %.2f m %.2f %.2f l S" % (y, width, y) for y in np.linspace(0, height, ticks_y))
+
+    lines.append("0 G 0.6 w 0 0 %.2f %.2f re S" % (width, height))
+
+    return '\n'.join(lines).encode('ascii')
+
+
+# END def _grid_stream() #
+
+
+def _vector_page(page: list, data, bounds: tuple) -> bytes:
+    """Draws a page of waveforms as pdf paths
+
+    Keyword arguments:
+        :param page: List of (slot, row) pairs (row is -1 for slots not drawn)
+        :param data: Array of drawn waveforms
+        :param bounds: x_min, x_max, y_min, y_max of the bank
+
+    :returns: Content stream of the page
+    """
+
+    x_min, x_max, y_min, y_max = bounds
+    origins, (width, height) = _panel_origins()
+
+    x_points = np.linspace(0, width, data.shape[1]) if data.shape[1] > 1 else np.zeros(1)
+    parts = []
+
+    for (slot, row), (x0, y0) in zip(page, origins):
+        parts.append("q 1 0 0 1 %.2f %.2f cm /Grid Do" % (x0, y0))
+        parts.append("BT /F1 8 Tf 0 %.2f Td (Waveform %d) Tj ET" % (height + 4, slot))
+
+        if row >= 0:
+            y_points = (np.clip(data[row], y_min, y_max) - y_min) * (height / (y_max - y_min))
+            points = np.column_stack((x_points, y_points)).ravel()
+
+            # Whole path is formatted in one go . . .
+            parts.append("0 0 1 RG 0.5 w %.2f %.2f m" % (points[0], points[1]))
+            parts.append(("%.2f %.2f l\n" * (points.size // 2 - 1)) % tuple(points[2:]) + "S")
+
+        parts.append("Q")
+
+    return zlib.compress('\n'.join(parts).encode('ascii'))
+
+
+# END def _vector_page() #
+
+
+class _RasterRenderer(object):
+    """Renders pages of waveforms as images with matplotlib
+
+    Axes, grids, and ticks are drawn once and cached; each page only paints its lines and titles on top
+    (the same way hand drawing is blitted in 'DrawGraph').
+
+    Components:
+        :param self.axes: List of axes (one per panel)
+        :param self.background: Cached page (without any lines or titles)
+        :param self.canvas: Agg canvas of 'self.fig'
+        :param self.fig: Figure the size of a page
+        :param self.lines: List of lines (one per panel)
+        :param self.titles: List of titles (one per panel)
+        :param self.x_array: x points of every waveform
+    """
+
+    def __init__(self, bounds: tuple):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param bounds: x_min, x_max, y_min, y_max of the bank
+        """
+
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from wav2bin.src.draw_graph import create_graph
+
+        x_min, x_max, y_min, y_max = bounds
+
+        self.fig = Figure(figsize=(PAGE_SIZE[0] / 72, PAGE_SIZE[1] / 72), dpi=THUMBNAIL_DPI)
+        self.canvas = FigureCanvasAgg(self.fig)
+
+        self.axes = []
+        self.lines = []
+        self.titles = []
+        for i in range(PANEL_ROWS * PANEL_COLS):
+            ax = create_graph(x_axis='', y_axis='',
+                              x_min=x_min, x_max=x_max,
+                              y_min=y_min, y_max=y_max,
+                              x_major_ticks=x_MAJOR_TICKS, x_minor_ticks=x_MINOR_TICKS,
+                              y_major_ticks=y_MAJOR_TICKS, y_minor_ticks=y_MINOR_TICKS,
+                              fig=self.fig, subplot_section=[PANEL_ROWS, PANEL_COLS, i + 1])
+            ax.set_yticklabels([])
+            ax.set_xticklabels([])
+
+            # Lines and titles are left out of the cached page . . .
+            self.axes.append(ax)
+            self.lines.append(ax.plot([], [], color='b', animated=True)[0])
+            self.titles.append(ax.text(0, 1.02, '', fontsize=8, transform=ax.transAxes, animated=True))
+
+        self.x_array = np.linspace(x_min, x_max, x_max - x_min + 1)
+
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    # END def __init__() #
+
+    def render(self, page: list, data) -> tuple:
+        """Renders a page of waveforms
+
+        Keyword arguments:
+            :param page: List of (slot, row) pairs (row is -1 for slots not drawn)
+            :param data: Array of drawn waveforms
+
+        :returns: Content stream of the page and its image (width, height, compressed RGB data)
+        """
+
+        if len(page) == len(self.axes):
+            self.canvas.restore_region(self.background)
+
+        else:
+            # Last page may be partly filled, so it's drawn without the unused panels . . .
+            for ax in self.axes[len(page):]:
+                ax.set_visible(False)
+            self.canvas.draw()
+            for ax in self.axes[len(page):]:
+                ax.set_visible(True)
+
+        for (slot, row), ax, line, title in zip(page, self.axes, self.lines, self.titles):
+            title.set_text("Waveform %d" % slot)
+            ax.draw_artist(title)
+
+            if row >= 0:
+                line.set_data(self.x_array, data[row])
+                ax.draw_artist(line)
+
+        rgba = np.asarray(self.canvas.buffer_rgba())
+
+        image = (rgba.shape[1], rgba.shape[0], zlib.compress(np.ascontiguousarray(rgba[..., :3]).tobytes()))
+        stream = zlib.compress(("q %d 0 0 %d 0 0 cm /Page Do Q" % PAGE_SIZE).encode('ascii'))
+
+        return stream, image
+
+    # END def render() #
+
+    def close(self):
+        """Frees the figure and cached page (the renderer can't be used afterwards)"""
+
+        self.fig.clear()
+        self.axes, self.lines, self.titles = [], [], []
+        self.background = None
+
+    # END def close() #
+
+
+class _PdfWriter(object):
+    """Writes pages (already rendered into content streams) straight into a pdf file
+
+    Components:
+        :param self.f: File (opened in binary mode) being written to
+        :param self.grid: Object number of the shared grid (None if there isn't one)
+        :param self.offsets: Dictionary of object number -> location within the file
+        :param self.pages: List of object numbers of each page
+        :param self.__last: Last object number given out
+    """
+
+    CATALOG, PAGES, FONT = 1, 2, 3
+
+    def __init__(self, f):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param f: File (opened in binary mode) being written to
+        """
+
+        self.f = f
+        self.offsets = {}
+        self.pages = []
+        self.grid = None
+        self.__last = self.FONT
+
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+        self.__object(self.CATALOG, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self.__object(self.FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    # END def __init__() #
+
+    def add_grid(self, stream: bytes):
+        """Adds the grid shared by every panel
+
+        Keyword arguments:
+            :param stream: Content stream of the grid
+        """
+
+        origins, (width, height) = _panel_origins()
+
+        self.grid = self.__next()
+        self.__stream(self.grid, "/Type /XObject /Subtype /Form /BBox [0 0 %.2f %.2f]" % (width, height),
+                      zlib.compress(stream))
+
+    # END def add_grid() #
+
+    def add_pages(self, rendered: list):
+        """Adds rendered pages (in order)
+
+        Keyword arguments:
+            :param rendered: List of (content stream, image) pairs (image is None for vector pages)
+        """
+
+        for stream, image in rendered:
+            xobjects = "/Grid %d 0 R" % self.grid if self.grid is not None else ""
+
+            if image is not None:
+                width, height, pixels = image
+                number = self.__next()
+                self.__stream(number, "/Type /XObject /Subtype /Image /Width %d /Height %d "
+                                      "/ColorSpace /DeviceRGB /BitsPerComponent 8" % (width, height), pixels)
+                xobjects += " /Page %d 0 R" % number
+
+            content = self.__next()
+            self.__stream(content, "", stream)
+
+            page = self.__next()
+            self.__object(page, ("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+                                 "/Resources << /Font << /F1 3 0 R >> /XObject << %s >> >> >>" %
+                                 (PAGE_SIZE[0], PAGE_SIZE[1], content, xobjects)).encode('ascii'))
+            self.pages.append(page)
+
+    # END def add_pages() #
+
+    def close(self):
+        """Writes the page tree, cross-reference table, and trailer"""
+
+        kids = ' '.join("%d 0 R" % page for page in self.pages)
+        self.__object(self.PAGES, ("<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.pages))).encode('ascii'))
+
+        count = self.__last + 1
+        xref = self.f.tell()
+
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % count)
+        self.f.write(b''.join(b"%010d 00000 n \n" % self.offsets[number] for number in range(1, count)))
+        self.f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref))
+
+    # END def close() #
+
+    def __next(self) -> int:
+        """Reserves the next object number
+
+        :returns: Object number
+        """
+
+        self.__last += 1
+
+        return self.__last
+
+    # END def __next() #
+
+    def __object(self, number: int, body: bytes):
+        """Writes an object
+
+        Keyword arguments:
+            :param number: Object number
+            :param body: Object's contents
+        """
+
+        self.offsets[number] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    # END def __object() #
+
+    def __stream(self, number: int, dictionary: str, data: bytes):
+        """Writes a (compressed) stream object
+
+        Keyword arguments:
+            :param number: Object number
+            :param dictionary: Entries added to the stream's dictionary
+            :param data: Compressed data of the stream
+        """
+
+        self.__object(number, b"<< %s /Length %d /Filter /FlateDecode >>\nstream\n" %
+                      (dictionary.encode('ascii'), len(data)) + data + b"\nendstream")
+
+    # END def __stream() #
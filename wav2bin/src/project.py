@@ -0,0 +1,222 @@
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.rom_image import RomImage
+from wav2bin.src.waveform_bank import WaveformBank, LineSet
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+PROJECT_EXTENSION = '.w2b'
+PROJECT_MAGIC = b'WAV2BIN\0'
+PROJECT_VERSION = 1
+
+ALIGNMENT = 64  # Arrays within the file start on multiples of this many bytes . . .
+
+SLOT_DTYPE = np.dtype([('drawn', 'u1')])    # Metadata kept for each slot . . .
+
+# Layout of the file:
+#   PROJECT_MAGIC, header length (little-endian uint32), JSON header,
+#   bank (float64, one row per slot, starting on ALIGNMENT), then slot metadata (SLOT_DTYPE, on ALIGNMENT)
+
+
+class Project(RomImage):
+    """Memory-mapped project file, holding the whole bank (at full precision) and which slots are drawn
+
+    Opening a project only reads its header; waveforms are read as they're used, and changed slots are
+    written back in place (see 'RomImage.write_back'), which makes autosaving cheap.
+
+    Components:
+        :param self.file_name: Path to the project
+        :param self.geometry: 'RomGeometry' of the bank
+        :param self.header: Dictionary holding the project's JSON header
+        :param self.header_size: Length of the JSON header (in bytes)
+        :param self.map: 'np.memmap' of the whole file
+        :param self.metadata: View of 'self.map' holding each slot's metadata ('SLOT_DTYPE')
+        :param self.slots: 2-D view of 'self.map' (one row per waveform)
+    """
+
+    def __init__(self, file_name: str, mode: str = 'r+'):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param file_name: Path to project
+            :param mode: 'r+' to write changes back to the project, 'r' for read only, 'c' for copy-on-write
+        """
+
+        with open(file_name, 'rb') as f:
+            magic = f.read(len(PROJECT_MAGIC))
+            if magic != PROJECT_MAGIC:
+                raise ValueError("%s is not a WAV2BIN project" % file_name)
+
+            self.header_size, = struct.unpack('<I', f.read(4))
+            self.header = json.loads(f.read(self.header_size).decode('utf-8'))
+
+        if self.header.get("version", 0) > PROJECT_VERSION:
+            raise ValueError("%s was saved by a newer version (project version %d)" %
+                             (file_name, self.header["version"]))
+
+        RomImage.__init__(self, file_name, RomGeometry(**self.header["geometry"]), mode)
+
+    # END def __init__() #
+
+    def _map(self, mode: str) -> tuple:
+        """Maps the file into memory (along with each slot's metadata)
+
+        Keyword arguments:
+            :param mode: Mode the file is mapped with
+
+        :returns: 'np.memmap' of the whole file and a 2-D view of the bank (one row per waveform)
+        """
+
+        count = self.header["waveform_count"]
+        bank_offset, metadata_offset, size = _layout(self.header_size, count, self.geometry.depth)
+
+        project = np.memmap(self.file_name, dtype=np.uint8, mode=mode)
+        if project.size < size:
+            raise ValueError("%s is cut short (%d of %d bytes)" % (self.file_name, project.size, size))
+
+        self.metadata = project[metadata_offset:size].view(SLOT_DTYPE)
+
+        return project, project[bank_offset:metadata_offset].view('<f8').reshape(count, self.geometry.depth)
+
+    # END def _map() #
+
+    def _prepare_bank(self, bank: WaveformBank) -> int:
+        """Replaces every slot of a bank with the project's (growing or shrinking the bank to fit)
+
+        Keyword arguments:
+            :param bank: 'WaveformBank' being attached
+
+        :returns: Number of slots attached
+        """
+
+        bank.line_set = LineSet(len(self))
+
+        return len(self)
+
+    # END def _prepare_bank() #
+
+    def _stored_slots(self, count: int):
+        """Finds the slots holding a waveform
+
+        Keyword arguments:
+            :param count: Number of slots attached
+
+        :returns: List of slot indexes
+        """
+
+        return np.flatnonzero(self.metadata['drawn'][:count]).tolist()
+
+    # END def _stored_slots() #
+
+    def _write_slot(self, index: int, y, bank: WaveformBank):
+        """Writes a waveform into a slot (at full precision)
+
+        Keyword arguments:
+            :param index: Index of slot
+            :param y: Array of y points
+            :param bank: 'WaveformBank' the waveform belongs to (unused)
+        """
+
+        self.slots[index] = y
+        self.metadata['drawn'][index] = 1
+
+    # END def _write_slot() #
+
+    def _clear_slot(self, index: int, bank: WaveformBank) -> bool:
+        """Marks a slot as not drawn
+
+        Keyword arguments:
+            :param index: Index of slot
+            :param bank: 'WaveformBank' the slot belongs to (unused)
+
+        :returns: Whether or not anything was written
+        """
+
+        if not self.metadata['drawn'][index]:
+            return False
+
+        self.metadata['drawn'][index] = 0
+
+        return True
+
+    # END def _clear_slot() #
+
+
+def save_project(bank: WaveformBank, file_name: str) -> Project:
+    """Saves a whole bank as a project (replacing the file in one go, once it's complete)
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' being saved
+        :param file_name: Path to project
+
+    :returns: 'Project' opened on the saved file (attach it to keep editing the bank in place)
+    """
+
+    count = len(bank.line_set)
+    depth = bank.geometry.depth
+
+    header = json.dumps({"version": PROJECT_VERSION,
+                         "geometry": {"address_bits": bank.geometry.address_bits,
+                                      "data_bits": bank.geometry.data_bits,
+                                      "byteorder": bank.geometry.byteorder},
+                         "waveform_count": count,
+                         "bank_dtype": '<f8',
+                         "slot_dtype": SLOT_DTYPE.descr}).encode('utf-8')
+
+    bank_offset, metadata_offset, size = _layout(len(header), count, depth)
+
+    # Written beside the old file, so a failed save never leaves a broken project . . .
+    handle, temp_name = tempfile.mkstemp(suffix=PROJECT_EXTENSION, dir=os.path.dirname(os.path.abspath(file_name)))
+
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(PROJECT_MAGIC + struct.pack('<I', len(header)) + header)
+            f.truncate(size)    # Slots never drawn are left as zeros (without being written) . . .
+
+            for index in bank.line_set.drawn_slots():
+                f.seek(bank_offset + index * depth * 8)
+                f.write(np.ascontiguousarray(bank.line_set[index].y, dtype='<f8').tobytes())
+
+            metadata = np.zeros(count, dtype=SLOT_DTYPE)
+            metadata['drawn'][bank.line_set.drawn_slots()] = 1
+            f.seek(metadata_offset)
+            f.write(metadata.tobytes())
+
+        os.replace(temp_name, file_name)
+
+    except BaseException:
+        os.remove(temp_name)
+        raise
+
+    return Project(file_name)
+
+
+# END def save_project() #
+
+
+def _layout(header_size: int, count: int, depth: int) -> tuple:
+    """Finds where each part of a project sits within the file
+
+    Keyword arguments:
+        :param header_size: Length of the JSON header (in bytes)
+        :param count: Number of slots
+        :param depth: Number of points per waveform
+
+    :returns: Offset of the bank, offset of the slot metadata, and size of the file
+    """
+
+    def align(offset):
+        return -(-offset // ALIGNMENT) * ALIGNMENT
+
+    bank_offset = align(len(PROJECT_MAGIC) + 4 + header_size)
+    metadata_offset = align(bank_offset + count * depth * 8)
+
+    return bank_offset, metadata_offset, metadata_offset + count * SLOT_DTYPE.itemsize
+
+
+# END def _layout() #
@@ -0,0 +1,150 @@
+import numpy as np
+
+from collections import OrderedDict
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+DEFAULT_QUANTIZER = "Round"
+
+
+def quantize(y, y_min: int, y_max: int, method: str = DEFAULT_QUANTIZER) -> np.ndarray:
+    """Rounds waveforms onto the DAC's levels
+
+    Keyword arguments:
+        :param y: 2-D array of points (one row per waveform)
+        :param y_min: Lowest level
+        :param y_max: Highest level
+        :param method: Name of quantizer used (key of 'QUANTIZERS')
+
+    :returns: 2-D array of levels (as floats holding whole numbers)
+    """
+
+    y = np.asarray(y, dtype=np.float64).reshape(-1, np.shape(y)[-1])
+
+    # Levels are clipped where they are (banks can be large, so the copies are kept to a minimum) . . .
+    levels = QUANTIZERS[method](y)
+
+    return np.clip(levels, y_min, y_max, out=levels)
+
+
+# END def quantize() #
+
+
+def quantize_round(y) -> np.ndarray:
+    """Rounds each point to the nearest level (the error follows the waveform, so it's heard as distortion)
+
+    Keyword arguments:
+        :param y: 2-D array of points (one row per waveform)
+
+    :returns: 2-D array of levels
+    """
+
+    return np.rint(y)
+
+
+# END def quantize_round() #
+
+
+def quantize_tpdf(y) -> np.ndarray:
+    """Adds triangular (TPDF) dither of +/- 1 level before rounding, turning the error into steady noise
+
+    Keyword arguments:
+        :param y: 2-D array of points (one row per waveform)
+
+    :returns: 2-D array of levels
+    """
+
+    return np.rint(y + _tpdf(y.shape))
+
+
+# END def quantize_tpdf() #
+
+
+def quantize_shaped(y) -> np.ndarray:
+    """Dithers, then feeds each point's error into the next (first order), pushing the noise up to harmonics
+    the DAC's reconstruction filter removes
+
+    Error feedback rounds 'y[n] - e[n-1]', where 'e' is the error left by each point, so the levels always add
+    up to the running sum of 'y' rounded. Rounding the running sum directly gives the same levels without a
+    loop over points. Whole numbers are summed apart from the fractions left over, so long waveforms keep
+    their precision, and the sum is wrapped around so the error shaping carries on as the waveform loops.
+
+    Keyword arguments:
+        :param y: 2-D array of points (one row per waveform)
+
+    :returns: 2-D array of levels
+    """
+
+    levels = np.rint(y)
+    sums = np.subtract(y, levels)
+    np.cumsum(sums, axis=1, out=sums)
+    total = np.rint(sums[:, -1])
+
+    # Running sums are dithered and rounded where they are, then turned back into levels . . .
+    sums += _tpdf(y.shape)
+    np.rint(sums, out=sums)
+
+    levels[:, 1:] += sums[:, 1:]
+    levels[:, 1:] -= sums[:, :-1]
+    levels[:, 0] += sums[:, 0] - (sums[:, -1] - total)
+
+    return levels
+
+
+# END def quantize_shaped() #
+
+
+def quantization_report(y, levels) -> dict:
+    """Measures the error quantizing left in each waveform
+
+    Keyword arguments:
+        :param y: 2-D array of points (one row per waveform)
+        :param levels: 2-D array of the levels they were quantized to
+
+    :returns: Dictionary of arrays (one value per waveform): "snr" (in dB, against the waveform's AC power)
+              and "max_error" (in levels)
+    """
+
+    y = np.asarray(y, dtype=np.float64)
+    error = levels - y
+
+    signal = np.square(y - y.mean(axis=1, keepdims=True)).sum(axis=1)
+    noise = np.square(error).sum(axis=1)
+
+    # Waveforms quantized without any error have an infinite SNR . . .
+    with np.errstate(divide='ignore', invalid='ignore'):
+        snr = 10 * np.log10(signal / noise)
+    snr[noise == 0] = np.inf
+
+    return {"snr": snr, "max_error": np.absolute(error).max(axis=1, initial=0)}
+
+
+# END def quantization_report() #
+
+
+def _tpdf(shape: tuple) -> np.ndarray:
+    """Triangular dither between -1 and 1 (the difference of two uniform values)
+
+    Uniform values are 16-bit halves of raw 64-bit draws, which is far quicker than drawing floats (and is
+    finer than dither needs). The generator is seeded from 'np.random', so spec seeds reproduce the dither.
+
+    Keyword arguments:
+        :param shape: Shape of array
+
+    :returns: Array of dither
+    """
+
+    size = int(np.prod(shape))
+    generator = np.random.default_rng(np.random.randint(2 ** 32))
+
+    halves = generator.bit_generator.random_raw(-(-size // 2)).view(np.uint16).reshape(-1, 2)[:size]
+    dither = halves[:, 0].astype(np.float32) - halves[:, 1]
+
+    return (dither * np.float32(2 ** -16)).reshape(shape)
+
+
+# END def _tpdf() #
+
+
+QUANTIZERS = OrderedDict([("Round", quantize_round),
+                          ("TPDF Dither", quantize_tpdf),
+                          ("Noise Shaped", quantize_shaped)])
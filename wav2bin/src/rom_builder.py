@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from wav2bin.src.exporters import find_exporter
+from wav2bin.src.quantize import QUANTIZERS
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.waveform_bank import WaveformBank, FUNCTIONS, WAVEFORM_COUNT
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+STEP_KEYS = ("function", "expression", "harmonics", "amplitude", "level", "frequency")
+
+
+def load_spec(file_name: str) -> dict:
+    """Reads a ROM spec file
+
+    A spec file is JSON laid out like so (only "waveforms" is required, and the extension of "output" picks
+    its format, i.e. .bin, .hex, .srec, .mem, .mif, .coe, or .wav):
+
+        {
+            "output": "lab3.bin",
+            "geometry": {"address_bits": 8, "data_bits": 8, "byteorder": "little"},
+            "waveform_count": 32,
+            "seed": 1,
+            "quantizer": "Noise Shaped",
+            "waveforms": [
+                {"slot": 0, "steps": [{"function": "Sine", "cycles": 3},
+                                      {"function": "Square", "cycles": 5, "mix": true},
+                                      {"amplitude": 0.5},
+                                      {"level": -20},
+                                      {"frequency": 2}]},
+                {"slot": 1, "steps": [{"function": "Waveform", "waveform": 0, "cycles": 2}]},
+                {"slot": 2, "steps": [{"expression": "0.6*sin(3*t) + 0.3*square(5*t, duty=0.25) + 0.1*w[0]"}]},
+                {"slot": 3, "steps": [{"harmonics": [0.8, 0, 0.27, 0, 0.16], "phases": [0, 0, 3.14, 0, 0]}]}
+            ]
+        }
+
+    Keyword arguments:
+        :param file_name: Path to spec file
+
+    :returns: Dictionary holding the spec
+    """
+
+    with open(file_name) as f:
+        spec = json.load(f)
+
+    if not isinstance(spec, dict) or not isinstance(spec.get("waveforms"), list):
+        raise ValueError("%s: spec must be an object with a \"waveforms\" list" % file_name)
+
+    return spec
+
+
+# END def load_spec() #
+
+
+def build_bank(spec: dict) -> WaveformBank:
+    """Creates a 'WaveformBank' by running each step of a spec (the same way the GUI handlers do)
+
+    Keyword arguments:
+        :param spec: Dictionary holding the spec (see 'load_spec')
+
+    :returns: 'WaveformBank' holding every waveform of the spec
+    """
+
+    geometry = RomGeometry(**spec.get("geometry", {}))
+    bank = WaveformBank(waveform_count=spec.get("waveform_count", WAVEFORM_COUNT), geometry=geometry)
+
+    # Allows "Random" waveforms (and dither) to be reproduced between builds . . .
+    if "seed" in spec:
+        np.random.seed(spec["seed"])
+
+    bank.quantizer = spec.get("quantizer", bank.quantizer)
+    if bank.quantizer not in QUANTIZERS:
+        raise ValueError("unknown quantizer %r (choose from %s)" % (bank.quantizer, ', '.join(QUANTIZERS)))
+
+    for waveform in spec["waveforms"]:
+        slot = waveform["slot"]
+        if not 0 <= slot < len(bank.line_set):
+            raise ValueError("slot %d is outside of 0 - %d" % (slot, len(bank.line_set) - 1))
+
+        bank.current_waveform = slot
+
+        for step in waveform.get("steps", []):
+            _run_step(bank, step)
+
+    return bank
+
+
+# END def build_bank() #
+
+
+def build_spec(file_name: str, output_dir: str = None) -> str:
+    """Builds the ROM file described by a spec file
+
+    Keyword arguments:
+        :param file_name: Path to spec file
+        :param output_dir: Directory the ROM file is written to (defaults to the spec's directory)
+
+    :returns: Path of the ROM file written
+    """
+
+    spec = load_spec(file_name)
+
+    # The output is named after the spec unless told otherwise . . .
+    output = spec.get("output", os.path.splitext(os.path.basename(file_name))[0] + '.bin')
+    if output_dir is None:
+        output_dir = os.path.dirname(os.path.abspath(file_name))
+    output = os.path.join(output_dir, output)
+
+    try:
+        writer = find_exporter(output)
+    except ValueError as error:
+        raise ValueError("%s: %s" % (file_name, error))
+
+    try:
+        bank = build_bank(spec)
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError("%s: %s" % (file_name, error))
+
+    with open(output, 'wb') as f:
+        writer(bank.export_data(), f, bank.geometry)
+
+    return output
+
+
+# END def build_spec() #
+
+
+def build_specs(file_names: list, output_dir: str = None, jobs: int = None) -> list:
+    """Builds many spec files, spreading them across a process pool
+
+    Keyword arguments:
+        :param file_names: List of paths to spec files
+        :param output_dir: Directory the ROM files are written to (defaults to each spec's directory)
+        :param jobs: Number of processes used (defaults to the number of CPUs)
+
+    :returns: List of paths of the ROM files written (in the same order as 'file_names')
+    """
+
+    # A pool isn't worth starting for a single spec . . .
+    if jobs == 1 or len(file_names) < 2:
+        return [build_spec(file_name, output_dir) for file_name in file_names]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(build_spec, file_names, [output_dir] * len(file_names)))
+
+
+# END def build_specs() #
+
+
+def main(argv: list = None) -> int:
+    """Command line entry for 'wav2bin build'
+
+    Keyword arguments:
+        :param argv: List of arguments (after 'build')
+
+    :returns: Exit status
+    """
+
+    parser = argparse.ArgumentParser(prog="wav2bin build",
+                                     description="Builds ROM images (.bin, .hex, .srec, .mem, .mif, or .coe) "
+                                                 "from JSON spec files (without the GUI).")
+    parser.add_argument("specs", nargs='+', help="spec files to build")
+    parser.add_argument("-o", "--output-dir", help="directory ROM files are written to")
+    parser.add_argument("-j", "--jobs", type=int, help="number of processes used (defaults to CPU count)")
+    args = parser.parse_args(argv)
+
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    try:
+        outputs = build_specs(args.specs, output_dir=args.output_dir, jobs=args.jobs)
+    except (OSError, ValueError) as error:
+        print("wav2bin build: %s" % error, file=sys.stderr)
+        return 1
+
+    for output in outputs:
+        print(output)
+
+    return 0
+
+
+# END def main() #
+
+
+def _run_step(bank: WaveformBank, step: dict):
+    """Runs a single spec step on the current waveform
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' being changed
+        :param step: Dictionary holding one of "function", "expression", "harmonics", "amplitude", "level", or
+                     "frequency"
+    """
+
+    keys = [key for key in STEP_KEYS if key in step]
+    if len(keys) != 1:
+        raise ValueError("each step needs exactly one of %s (got %r)" % (', '.join(STEP_KEYS), step))
+
+    line = bank.line_set[bank.current_waveform]
+
+    if keys[0] == "function":
+        if step["function"] not in FUNCTIONS:
+            raise ValueError("unknown function %r" % step["function"])
+        if step["function"] == "Waveform" and not 0 <= step.get("waveform", -1) < len(bank.line_set):
+            raise ValueError("\"Waveform\" steps need a \"waveform\" slot to copy from")
+
+        cycles = float(step.get("cycles", 1))
+        if cycles <= 0:
+            raise ValueError("cycles must be positive")
+
+        bank.change_function(name=step["function"],
+                             mix_func=bool(step.get("mix", False)),
+                             cycles=cycles,
+                             wav_num=step.get("waveform"))
+
+    elif keys[0] == "expression":
+        bank.change_expression(str(step["expression"]), mix_func=bool(step.get("mix", False)))
+
+    elif keys[0] == "harmonics":
+        magnitudes = np.atleast_1d(np.asarray(step["harmonics"], dtype=float))
+        phases = step.get("phases")
+        if magnitudes.ndim != 1 or (phases is not None and np.shape(phases) != magnitudes.shape):
+            raise ValueError("\"harmonics\" needs a list of magnitudes (and \"phases\" one phase for each)")
+
+        bank.change_harmonics(magnitudes, phases, mix_func=bool(step.get("mix", False)))
+
+    # Like the GUI, the remaining steps are ignored when there's no waveform . . .
+    elif not line.drawn:
+        return
+
+    elif keys[0] == "amplitude":
+        bank.change_amp(float(step["amplitude"]))
+
+    elif keys[0] == "level":
+        bank.change_level(float(step["level"]))
+
+    else:  # keys[0] == "frequency"
+        # Frequency is kept between 1 and the domain size . . .
+        freq = min(max(int(step["frequency"]), 1), bank.x_max - bank.x_min + 1)
+        bank.change_freq(freq)
+
+
+# END def _run_step() #
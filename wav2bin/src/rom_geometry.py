@@ -0,0 +1,117 @@
+import numpy as np
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+ADDRESS_BITS = 8
+DATA_BITS = 8
+BYTEORDER = 'little'
+
+MAX_ADDRESS_BITS = 24
+MAX_DATA_BITS = 32
+
+BYTEORDERS = {'little': '<', 'big': '>'}
+
+
+class RomGeometry(object):
+    """Describes the ROM waveforms are written to (samples per waveform and bits per sample)
+
+    Components:
+        :param self.address_bits: Number of address bits per waveform (depth = 2 ** address_bits)
+        :param self.byteorder: Byte order used when packing samples wider than 8 bits
+        :param self.data_bits: Number of bits per sample (DAC width)
+        :param self.depth: Number of samples per waveform
+        :param self.dtype: Smallest unsigned integer type able to hold a sample
+        :param self.packed_dtype: 'self.dtype' with 'self.byteorder' applied (used for writing to files)
+        :param self.x_max: Upper x bound
+        :param self.x_min: Lower x bound
+        :param self.y_max: Upper y bound
+        :param self.y_min: Lower y bound
+    """
+
+    def __init__(self, address_bits: int = ADDRESS_BITS, data_bits: int = DATA_BITS, byteorder: str = BYTEORDER):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param address_bits: Number of address bits per waveform
+            :param data_bits: Number of bits per sample
+            :param byteorder: Either 'little' or 'big'
+        """
+
+        if not 1 <= address_bits <= MAX_ADDRESS_BITS:
+            raise ValueError("address_bits must be between 1 and %d" % MAX_ADDRESS_BITS)
+        if not 1 <= data_bits <= MAX_DATA_BITS:
+            raise ValueError("data_bits must be between 1 and %d" % MAX_DATA_BITS)
+        if byteorder not in BYTEORDERS:
+            raise ValueError("byteorder must be one of %s" % ', '.join(sorted(BYTEORDERS)))
+
+        self.address_bits = address_bits
+        self.data_bits = data_bits
+        self.byteorder = byteorder
+
+        self.depth = 1 << address_bits
+
+        # The minimum/maximum values for x and y plot points are recorded . . .
+        self.x_min, self.x_max = 0, self.depth - 1
+        self.y_min, self.y_max = 0, (1 << data_bits) - 1
+
+        # Samples are stored in the smallest type that fits the DAC width . . .
+        if data_bits <= 8:
+            self.dtype = np.dtype(np.uint8)
+        elif data_bits <= 16:
+            self.dtype = np.dtype(np.uint16)
+        else:
+            self.dtype = np.dtype(np.uint32)
+
+        self.packed_dtype = self.dtype.newbyteorder(BYTEORDERS[byteorder])
+
+    # END def __init__() #
+
+    def __eq__(self, other) -> bool:
+        """Checks if two geometries describe the same ROM
+
+        Keyword arguments:
+            :param other: Object being compared against
+
+        :returns: Whether or not both geometries match
+        """
+
+        return isinstance(other, RomGeometry) and \
+            (self.address_bits, self.data_bits, self.byteorder) == \
+            (other.address_bits, other.data_bits, other.byteorder)
+
+    # END def __eq__() #
+
+    def __hash__(self) -> int:
+        """Hashes the geometry so it can be used as a key"""
+
+        return hash((self.address_bits, self.data_bits, self.byteorder))
+
+    # END def __hash__() #
+
+    def __repr__(self) -> str:
+        """Shows the geometry as it would be constructed"""
+
+        return "RomGeometry(address_bits=%d, data_bits=%d, byteorder=%r)" % \
+               (self.address_bits, self.data_bits, self.byteorder)
+
+    # END def __repr__() #
+
+    @property
+    def bytes_per_sample(self) -> int:
+        """Number of bytes each sample takes up in a ROM image"""
+
+        return self.dtype.itemsize
+
+    # END def bytes_per_sample() #
+
+    def pack(self, data) -> np.ndarray:
+        """Packs samples into a contiguous array laid out as they appear in a ROM image
+
+        Keyword arguments:
+            :param data: Array of samples (any shape)
+
+        :returns: C-contiguous array using 'self.packed_dtype' (usable through the buffer protocol)
+        """
+
+        return np.ascontiguousarray(data, dtype=self.packed_dtype)
+
+    # END def pack() #
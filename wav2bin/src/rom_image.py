@@ -0,0 +1,297 @@
+import numpy as np
+
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.waveform_bank import WaveformBank, LinePoints
+
+
+class RomImage(object):
+    """Memory-mapped .bin image, split into waveform slots which can be edited in place
+
+    The image holds integer levels while waveforms are edited as floats, so each slot is read into a float
+    copy the first time it's used (untouched slots are never read). Edits reach the image through
+    'write_back', which writes only the slots that changed.
+
+    Components:
+        :param self.file_name: Path to the image
+        :param self.geometry: 'RomGeometry' used to split the image
+        :param self.map: 'np.memmap' of the whole image
+        :param self.slots: 2-D view of 'self.map' (one row per waveform)
+        :param self.__lines: 'LinePoints' last written to each slot (used to spot replaced lines)
+    """
+
+    def __init__(self, file_name: str, geometry: RomGeometry = None, mode: str = 'r+'):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param file_name: Path to .bin image
+            :param geometry: 'RomGeometry' used (defaults to 256 addresses of 8-bit data)
+            :param mode: 'r+' to write edits back to the image, 'r' for read only, 'c' for copy-on-write
+        """
+
+        self.file_name = file_name
+        self.geometry = geometry if geometry is not None else RomGeometry()
+
+        self.map, self.slots = self._map(mode)
+
+        self.__lines = {}
+
+    # END def __init__() #
+
+    def _map(self, mode: str) -> tuple:
+        """Maps the file into memory
+
+        Keyword arguments:
+            :param mode: Mode the file is mapped with
+
+        :returns: 'np.memmap' of the whole file and a 2-D view of it (one row per waveform)
+        """
+
+        image = np.memmap(self.file_name, dtype=self.geometry.packed_dtype, mode=mode)
+
+        # Image must be made up of whole waveforms . . .
+        if image.size % self.geometry.depth:
+            raise ValueError("%s does not hold a whole number of %d sample waveforms" %
+                             (self.file_name, self.geometry.depth))
+
+        return image, image.reshape(-1, self.geometry.depth)
+
+    # END def _map() #
+
+    def __len__(self) -> int:
+        """Number of waveform slots within the image"""
+
+        return len(self.slots)
+
+    # END def __len__() #
+
+    def attach(self, bank: WaveformBank) -> int:
+        """Fills a bank's 'line_set' with views of the image (nothing is read until a slot is used)
+
+        Keyword arguments:
+            :param bank: 'WaveformBank' using the same geometry
+
+        :returns: Number of slots attached
+        """
+
+        if bank.geometry != self.geometry:
+            raise ValueError("bank uses %r, but image uses %r" % (bank.geometry, self.geometry))
+
+        count = self._prepare_bank(bank)
+
+        for index in self._stored_slots(count):
+            bank.line_set[index] = RomLinePoints(self.slots[index], bank.x_min, bank.x_max)
+            self.__lines[index] = bank.line_set[index]
+
+        return count
+
+    # END def attach() #
+
+    def write_back(self, bank: WaveformBank) -> list:
+        """Writes every changed slot of a bank back into the image and flushes it
+
+        Only slots that were edited (or replaced, e.g. cleared and redrawn) are written, so untouched
+        pages of the image are never read or flushed.
+
+        Keyword arguments:
+            :param bank: 'WaveformBank' previously attached
+
+        :returns: List of slot indexes written
+        """
+
+        written = []
+
+        # Slots drawn since attaching are written along with the attached ones . . .
+        drawn = [index for index in bank.line_set.drawn_slots() if index < len(self) and index not in self.__lines]
+
+        for index in sorted(list(self.__lines) + drawn):
+            attached = self.__lines.get(index)
+            line = bank.line_set[index]
+
+            if line is attached and not (isinstance(line, RomLinePoints) and line.dirty):
+                continue  # Slot is untouched . . .
+
+            if not line.drawn:
+                if self._clear_slot(index, bank):
+                    written.append(index)
+                self.__lines[index] = line
+                continue
+
+            self._write_slot(index, line.y, bank)
+            written.append(index)
+
+            # Slot is re-bound to the image (keeping any float precision of the line) . . .
+            if line is not attached or not isinstance(line, RomLinePoints):
+                y = line.y
+                line = RomLinePoints(self.slots[index], bank.x_min, bank.x_max)
+                line.y = y
+                bank.line_set[index] = line
+
+            line.dirty = False
+            self.__lines[index] = line
+
+        if written and self.map.mode != 'r':
+            self.map.flush()
+
+        return written
+
+    # END def write_back() #
+
+    def _prepare_bank(self, bank: WaveformBank) -> int:
+        """Readies a bank for attaching
+
+        Keyword arguments:
+            :param bank: 'WaveformBank' being attached
+
+        :returns: Number of slots attached
+        """
+
+        return min(len(bank.line_set), len(self))
+
+    # END def _prepare_bank() #
+
+    def _stored_slots(self, count: int):
+        """Finds the slots holding a waveform
+
+        Keyword arguments:
+            :param count: Number of slots attached
+
+        :returns: Iterable of slot indexes
+        """
+
+        return range(count)
+
+    # END def _stored_slots() #
+
+    def _write_slot(self, index: int, y, bank: WaveformBank):
+        """Writes a waveform into a slot
+
+        Keyword arguments:
+            :param index: Index of slot
+            :param y: Array of y points
+            :param bank: 'WaveformBank' the waveform belongs to
+        """
+
+        self.slots[index] = np.clip(np.rint(y), bank.y_min, bank.y_max)
+
+    # END def _write_slot() #
+
+    def _clear_slot(self, index: int, bank: WaveformBank) -> bool:
+        """Clears a slot
+
+        Keyword arguments:
+            :param index: Index of slot
+            :param bank: 'WaveformBank' the slot belongs to
+
+        :returns: Whether or not anything was written
+        """
+
+        # Cleared slots are exported at the lowest value . . .
+        if np.any(self.slots[index] != bank.y_min):
+            self.slots[index] = bank.y_min
+            return True
+
+        return False
+
+    # END def _clear_slot() #
+
+    def close(self):
+        """Flushes and releases the image"""
+
+        if self.map.mode != 'r':
+            self.map.flush()
+
+        self.__lines = {}
+        self.slots = None
+        self.map = None
+
+    # END def close() #
+
+
+class RomLinePoints(LinePoints):
+    """
+    'LinePoints' backed by a slot of a 'RomImage' (y data is read into a float copy once it's first used)
+
+    Components:
+        :param self.dirty: Indicates whether or not y has changed since it was last written
+        :param self.drawn: Indicates whether or not graph has been drawn (always True for an image)
+        :param self.rom_row: View of the slot within the image
+        :param self.x: Holds all x plot data (created on first use)
+        :param self.y: Holds all y plot data (read from 'self.rom_row' on first use)
+    """
+
+    def __init__(self, rom_row, x_min: int, x_max: int):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param rom_row: View of the slot within the image
+            :param x_min: Lower x bound
+            :param x_max: Upper x bound
+        """
+
+        LinePoints.__init__(self)
+
+        self.rom_row = rom_row
+        self.drawn = True
+        self.dirty = False
+
+        self.__x_bounds = (x_min, x_max)
+
+    # END def __init__() #
+
+    @property
+    def x(self):
+        """Holds all x plot data"""
+
+        if self.__x is None:
+            x_min, x_max = self.__x_bounds
+            self.__x = np.linspace(x_min, x_max, x_max - x_min + 1)
+
+        return self.__x
+
+    # END def x() #
+
+    @x.setter
+    def x(self, value):
+        self.__x = None if isinstance(value, list) and not value else value
+
+    # END def x() #
+
+    def transform(self, scale: float, offset: float):
+        """Scales then offsets y (y = scale * y + offset), once y is next used
+
+        Keyword arguments:
+            :param scale: Factor y is multiplied by
+            :param offset: Amount added to y (after scaling)
+        """
+
+        LinePoints.transform(self, scale, offset)
+        self.dirty = True
+
+    # END def transform() #
+
+    def _load_y(self):
+        """Gives the stored y points (read from 'self.rom_row' on first use)"""
+
+        if self.__y is None:
+            self.__y = self.rom_row.astype(float)
+
+        return self.__y
+
+    # END def _load_y() #
+
+    def _store_y(self, value):
+        """Stores y points
+
+        Keyword arguments:
+            :param value: List or array of y points
+        """
+
+        # 'LinePoints.__init__' sets an empty list, which means the slot hasn't been read yet . . .
+        if isinstance(value, list) and not value:
+            self.__y = None
+            return
+
+        self.__y = value
+        self.dirty = True
+
+    # END def _store_y() #
@@ -8,12 +8,16 @@ INTERFACE_TITLE = "WAV2BIN (Version 1.3)"
 ICON_NAME = 'App_Icon.ico'
 IMAGE_NAME = 'App_Icon.gif'
 
+MINIMUM_SPLASH_TIME = 500   # Milliseconds the splash is shown for (at the least) . . .
+LOADER_CHECK_TIME = 50      # Milliseconds between checks on the loader . . .
+
 
 class SplashScreen(tk.Frame):
     """Used to create a splash screen with an image and text
 
     Components:
         :param self.graphic: Label which holds an image for window
+        :param self.loader: Thread loading the program while the splash is up
         :param self.name_label: Label which holds text (for name)
         :param self.root: Holds graphics root figure
     """
@@ -40,8 +44,8 @@ class SplashScreen(tk.Frame):
 
         self.root.resizable(False, False)   # Prevents window from being resized . . .
 
-        # Quit after 4 seconds . . .
-        self.root.after(4000, self.__quit_program)
+        # Components not yet initialized in this class are listed below . . .
+        self.loader = None
 
     # END def __init__() #
 
@@ -54,6 +58,30 @@ class SplashScreen(tk.Frame):
 
     # END def add_features() #
 
+    def close_when_loaded(self, loader):
+        """Starts loading the program and keeps the splash up until it's done
+
+        Keyword arguments:
+            :param loader: 'threading.Thread' (not yet started) which loads the program
+        """
+
+        self.loader = loader
+        self.loader.start()
+
+        self.root.after(MINIMUM_SPLASH_TIME, self.__check_loader)
+
+    # END def close_when_loaded() #
+
+    def __check_loader(self):
+        """Closes the splash once the loader has finished"""
+
+        if self.loader.is_alive():
+            self.root.after(LOADER_CHECK_TIME, self.__check_loader)
+        else:
+            self.__quit_program()
+
+    # END def __check_loader() #
+
     def __feature_image(self):
         """Adds an image in window"""
 
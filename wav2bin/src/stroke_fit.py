@@ -0,0 +1,172 @@
+import numpy as np
+import warnings
+
+from collections import OrderedDict
+
+try:
+    from numpy.exceptions import RankWarning
+except ImportError:  # NumPy < 1.25 . . .
+    from numpy import RankWarning
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+POLY_DEG = 25
+
+SAVGOL_POLY_ORDER = 3
+SAVGOL_WINDOW = 1 / 16  # Fraction of the stroke used as the filter window . . .
+
+MIN_SPLINE_POINTS = 5   # Strokes with fewer points fall back to "Linear" . . .
+
+DEFAULT_FIT = "Savitzky-Golay"
+
+
+def fit_stroke(x, y, x_min: int, x_max: int, method: str = DEFAULT_FIT) -> np.ndarray:
+    """Fits a hand-drawn stroke onto the sample grid
+
+    Keyword arguments:
+        :param x: x points of the stroke (increasing)
+        :param y: y points of the stroke
+        :param x_min: Lower x bound of the grid
+        :param x_max: Upper x bound of the grid
+        :param method: Name of fit used (key of 'FIT_METHODS')
+
+    :returns: Array of y points at every integer between x_min and x_max
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Repeated x points (which mouse events can produce) are dropped . . .
+    keep = np.concatenate(([True], np.diff(x) > 0))
+    x, y = x[keep], y[keep]
+
+    grid = np.linspace(x_min, x_max, x_max - x_min + 1)
+
+    return FIT_METHODS[method](x, y, grid)
+
+
+# END def fit_stroke() #
+
+
+def fit_linear(x, y, grid) -> np.ndarray:
+    """Straight lines between each point of the stroke (ends are held flat)
+
+    Keyword arguments:
+        :param x: x points of the stroke (strictly increasing)
+        :param y: y points of the stroke
+        :param grid: x points to fit onto
+
+    :returns: Array of y points on the grid
+    """
+
+    return np.interp(grid, x, y)
+
+
+# END def fit_linear() #
+
+
+def fit_monotone(x, y, grid) -> np.ndarray:
+    """Monotone cubic (PCHIP) through each point of the stroke, which never overshoots
+
+    Keyword arguments:
+        :param x: x points of the stroke (strictly increasing)
+        :param y: y points of the stroke
+        :param grid: x points to fit onto
+
+    :returns: Array of y points on the grid
+    """
+
+    if x.size < 3:
+        return fit_linear(x, y, grid)
+
+    from scipy.interpolate import PchipInterpolator
+
+    # Grid points outside of the stroke are held flat (like "Linear") . . .
+    return PchipInterpolator(x, y, extrapolate=False)(np.clip(grid, x[0], x[-1]))
+
+
+# END def fit_monotone() #
+
+
+def fit_smoothing_spline(x, y, grid) -> np.ndarray:
+    """Cubic smoothing spline (smoothing is picked from the hand jitter found in the stroke)
+
+    Keyword arguments:
+        :param x: x points of the stroke (strictly increasing)
+        :param y: y points of the stroke
+        :param grid: x points to fit onto
+
+    :returns: Array of y points on the grid
+    """
+
+    if x.size < MIN_SPLINE_POINTS:
+        return fit_linear(x, y, grid)
+
+    from scipy.interpolate import UnivariateSpline
+
+    # Second differences of a smooth curve are tiny, so what's left is mostly jitter . . .
+    jitter = np.median(np.absolute(np.diff(y, 2))) / (0.6745 * np.sqrt(6))
+
+    spline = UnivariateSpline(x, y, k=3, s=x.size * jitter ** 2)
+
+    return spline(np.clip(grid, x[0], x[-1]))
+
+
+# END def fit_smoothing_spline() #
+
+
+def fit_savgol(x, y, grid) -> np.ndarray:
+    """Savitzky-Golay filter run over the stroke (evenly re-spaced), then fit onto the grid with "Linear"
+
+    Keyword arguments:
+        :param x: x points of the stroke (strictly increasing)
+        :param y: y points of the stroke
+        :param grid: x points to fit onto
+
+    :returns: Array of y points on the grid
+    """
+
+    # Window has to be odd and larger than the polynomial order . . .
+    window = max(int(x.size * SAVGOL_WINDOW) | 1, SAVGOL_POLY_ORDER + 2 | 1)
+    if window > x.size:
+        return fit_linear(x, y, grid)
+
+    from scipy.signal import savgol_filter
+
+    # Filter is run at the stroke's resolution, so the cost doesn't grow with the grid . . .
+    x_even = np.linspace(x[0], x[-1], x.size)
+    y_even = savgol_filter(np.interp(x_even, x, y), window, SAVGOL_POLY_ORDER, mode='interp')
+
+    return fit_linear(x_even, y_even, grid)
+
+
+# END def fit_savgol() #
+
+
+def fit_polynomial(x, y, grid) -> np.ndarray:
+    """Polynomial of degree POLY_DEG (the original fit)
+
+    Keyword arguments:
+        :param x: x points of the stroke (strictly increasing)
+        :param y: y points of the stroke
+        :param grid: x points to fit onto
+
+    :returns: Array of y points on the grid
+    """
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RankWarning)  # Turns off warning for large polynomial degrees . . .
+        coefficients = np.polyfit(x, y, POLY_DEG)
+
+    # Creates a function using the coefficients . . .
+    return np.poly1d(coefficients)(grid)
+
+
+# END def fit_polynomial() #
+
+
+# Dictionary used to hold all fits used . . .
+FIT_METHODS = OrderedDict([("Linear", fit_linear),
+                           ("Monotone", fit_monotone),
+                           ("Smoothing Spline", fit_smoothing_spline),
+                           ("Savitzky-Golay", fit_savgol),
+                           ("Polynomial", fit_polynomial)])
@@ -0,0 +1,401 @@
+import argparse
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from wav2bin.src.instrumentation import traced
+from wav2bin.src.rom_geometry import RomGeometry
+from wav2bin.src.waveform_bank import WaveformBank
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+CHUNK_SAMPLES = 2 ** 18     # Samples read from the recording at a time . . .
+OVERSAMPLE = 16             # Long windows are averaged down to this many points per ROM sample first . . .
+
+ANALYSIS_TIME = 0.25        # Seconds of audio searched for a period . . .
+MIN_FREQUENCY = 20.0        # Lowest pitch found (in Hz) . . .
+MAX_FREQUENCY = 5000.0      # Highest pitch found (in Hz) . . .
+PEAK_RATIO = 0.9            # Earliest autocorrelation peak this close to the highest is the period . . .
+
+
+def read_wav(file_name: str) -> tuple:
+    """Opens a .wav file without reading it (samples are memory mapped where possible)
+
+    Keyword arguments:
+        :param file_name: Path to .wav file
+
+    :returns: Sample rate and array of samples (one column per channel, if more than one)
+    """
+
+    from scipy.io import wavfile
+
+    try:
+        return wavfile.read(file_name, mmap=True)
+    except ValueError:
+        return wavfile.read(file_name)  # i.e. 24-bit samples, which can't be memory mapped . . .
+
+
+# END def read_wav() #
+
+
+def detect_period(signal, rate: float, min_frequency: float = MIN_FREQUENCY,
+                  max_frequency: float = MAX_FREQUENCY) -> float:
+    """Finds the period of a pitched signal (from the peaks of its autocorrelation)
+
+    Keyword arguments:
+        :param signal: 1-D array of samples
+        :param rate: Sample rate (in Hz)
+        :param min_frequency: Lowest pitch found (in Hz)
+        :param max_frequency: Highest pitch found (in Hz)
+
+    :returns: Period (in samples, to a fraction of a sample)
+    """
+
+    signal = np.asarray(signal, dtype=float)
+    signal = signal - signal.mean()
+    size = signal.size
+
+    shortest = max(2, int(rate / max_frequency))
+    longest = min(size // 2, int(np.ceil(rate / min_frequency)) + 1)
+    if longest <= shortest + 1:
+        raise ValueError("recording is too short to find a period (%d samples)" % size)
+
+    # Autocorrelation through one FFT (padded so it doesn't wrap around) . . .
+    spectrum = np.fft.rfft(signal, 2 * size)
+    correlation = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2)[:longest + 1]
+    if correlation[0] <= 0:
+        raise ValueError("recording is silent")
+
+    correlation /= size - np.arange(longest + 1)    # Unbiased (shorter overlaps aren't penalized) . . .
+
+    lags = np.arange(shortest, longest)
+    peaks = lags[(correlation[lags] > correlation[lags - 1]) & (correlation[lags] >= correlation[lags + 1])]
+    if peaks.size == 0 or correlation[peaks].max() <= 0:
+        raise ValueError("no period found between %g and %g Hz" % (min_frequency, max_frequency))
+
+    # Earliest strong peak (later ones are multiples of the period) . . .
+    lag = peaks[np.argmax(correlation[peaks] >= PEAK_RATIO * correlation[peaks].max())]
+
+    # Peak is placed between samples by fitting a parabola through it . . .
+    before, at, after = correlation[lag - 1:lag + 2]
+    curvature = before - 2 * at + after
+
+    return lag + (0.5 * (before - after) / curvature if curvature < 0 else 0.0)
+
+
+# END def detect_period() #
+
+
+@traced()
+def load_wav_table(file_name: str, size: int, start: float = 0.0, duration: float = None,
+                   periods: int = 1) -> np.ndarray:
+    """Turns part of a recording into one loop of a waveform table
+
+    Either a window of the recording is used (when 'duration' is given), or the period found at 'start' is
+    (averaged over 'periods' periods). Either way, the recording is read a chunk at a time and resampled
+    without aliasing (only harmonics that fit in 'size' points are kept).
+
+    Keyword arguments:
+        :param file_name: Path to .wav file
+        :param size: Number of points in the table
+        :param start: Time (in seconds) the window or period starts at
+        :param duration: Length (in seconds) of the window (None to find a period)
+        :param periods: Number of periods averaged together
+
+    :returns: Array of 'size' points (1 is full scale)
+    """
+
+    rate, data = read_wav(file_name)
+    first = int(round(start * rate))
+    if not 0 <= first < len(data):
+        raise ValueError("%s: start %gs is outside of the recording (%gs long)" % (file_name, start, len(data) / rate))
+
+    if duration is not None:
+        length = min(int(round(duration * rate)), len(data) - first)
+        if length < 2:
+            raise ValueError("%s: window is too short" % file_name)
+
+        return _window_table(data, first, length, size)
+
+    period = detect_period(_to_float(data[first:first + int(ANALYSIS_TIME * rate)]), rate)
+    periods = max(1, min(int(periods), int((len(data) - first - 1) // period)))
+
+    return _period_table(data, first, period, periods, size)
+
+
+# END def load_wav_table() #
+
+
+def import_wav(bank: WaveformBank, file_name: str, mix_func: bool = False, **options):
+    """Reads a recording into the current waveform of a bank (see 'load_wav_table')
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' being changed
+        :param file_name: Path to .wav file
+        :param mix_func: Boolean used to control whether the recording is mixed or not
+        :param options: 'start', 'duration', 'periods', and 'normalize' (see 'table_to_points')
+    """
+
+    normalize = options.pop('normalize', True)
+    table = load_wav_table(file_name, bank.x_max - bank.x_min + 1, **options)
+
+    bank.apply_waveform(table_to_points(bank, table, normalize), mix_func)
+
+
+# END def import_wav() #
+
+
+def import_directory(bank: WaveformBank, file_names, first_slot: int = 0, jobs: int = None, **options) -> list:
+    """Reads many recordings into consecutive slots of a bank, spreading them across a process pool
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' being changed
+        :param file_names: Directory of .wav files, or a list of paths
+        :param first_slot: Slot the first recording goes into
+        :param jobs: Number of processes used (defaults to the number of CPUs)
+        :param options: 'start', 'duration', 'periods', and 'normalize' (see 'load_wav_table')
+
+    :returns: List of paths read (in slot order)
+    """
+
+    if isinstance(file_names, str):
+        file_names = find_wavs(file_names)
+
+    if first_slot + len(file_names) > len(bank.line_set):
+        raise ValueError("%d recordings don't fit in slots %d - %d" %
+                         (len(file_names), first_slot, len(bank.line_set) - 1))
+
+    normalize = options.pop('normalize', True)
+    size = bank.x_max - bank.x_min + 1
+    arguments = ([size] * len(file_names),) + tuple([value] * len(file_names) for value in (
+        options.get('start', 0.0), options.get('duration'), options.get('periods', 1)))
+
+    # A pool isn't worth starting for a single recording . . .
+    if jobs == 1 or len(file_names) < 2:
+        tables = list(map(load_wav_table, file_names, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            tables = list(executor.map(load_wav_table, file_names, *arguments))
+
+    current_waveform = bank.current_waveform
+
+    try:
+        for slot, table in enumerate(tables, first_slot):
+            bank.current_waveform = slot
+            bank.apply_waveform(table_to_points(bank, table, normalize), mix_func=False)
+    finally:
+        bank.current_waveform = current_waveform
+
+    return list(file_names)
+
+
+# END def import_directory() #
+
+
+def find_wavs(path: str) -> list:
+    """Lists the .wav files of a directory (in name order), or the file itself if 'path' isn't a directory
+
+    Keyword arguments:
+        :param path: Path to .wav file or directory
+
+    :returns: List of paths
+    """
+
+    if not os.path.isdir(path):
+        return [path]
+
+    return sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.wav'))
+
+
+# END def find_wavs() #
+
+
+def table_to_points(bank: WaveformBank, table, normalize: bool = True) -> np.ndarray:
+    """Places a table (centered on 0, 1 being full scale) onto a bank's y range
+
+    Keyword arguments:
+        :param bank: 'WaveformBank' the points are for
+        :param table: Array of points
+        :param normalize: Whether or not the table is scaled up (or down) to fill the whole range
+
+    :returns: Array of y points
+    """
+
+    table = table - table.mean()    # Any DC offset of the recording is removed . . .
+
+    peak = np.absolute(table).max()
+    if normalize and peak > 0:
+        table /= peak
+
+    return bank.y_mid_point + (bank.y_max - bank.y_mid_point) * table
+
+
+# END def table_to_points() #
+
+
+def main(argv: list = None) -> int:
+    """Command line entry for 'wav2bin import'
+
+    Keyword arguments:
+        :param argv: List of arguments (after 'import')
+
+    :returns: Exit status
+    """
+
+    from wav2bin.src.exporters import find_exporter
+    from wav2bin.src.project import save_project, PROJECT_EXTENSION
+
+    parser = argparse.ArgumentParser(prog="wav2bin import",
+                                     description="Turns .wav recordings into waveform tables, one slot each.")
+    parser.add_argument("recordings", nargs='+', help=".wav files (or directories of them)")
+    parser.add_argument("-o", "--output", required=True, help="ROM file (.bin, .hex, ...) or project (%s) written"
+                                                             % PROJECT_EXTENSION)
+    parser.add_argument("--address-bits", type=int, default=RomGeometry().address_bits)
+    parser.add_argument("--data-bits", type=int, default=RomGeometry().data_bits)
+    parser.add_argument("--start", type=float, default=0.0, help="time (in seconds) read from")
+    parser.add_argument("--duration", type=float, help="length (in seconds) used, instead of finding a period")
+    parser.add_argument("--periods", type=int, default=1, help="periods averaged together")
+    parser.add_argument("-j", "--jobs", type=int, help="number of processes used (defaults to CPU count)")
+    args = parser.parse_args(argv)
+
+    file_names = [file_name for recording in args.recordings for file_name in find_wavs(recording)]
+
+    try:
+        geometry = RomGeometry(address_bits=args.address_bits, data_bits=args.data_bits)
+        bank = WaveformBank(waveform_count=max(len(file_names), 1), geometry=geometry)
+        import_directory(bank, file_names, jobs=args.jobs, start=args.start, duration=args.duration,
+                         periods=args.periods)
+
+        if args.output.endswith(PROJECT_EXTENSION):
+            save_project(bank, args.output).close()
+        else:
+            writer = find_exporter(args.output)
+            with open(args.output, 'wb') as f:
+                writer(bank.export_data(), f, geometry)
+
+    except (OSError, ValueError) as error:
+        print("wav2bin import: %s" % error, file=sys.stderr)
+        return 1
+
+    for slot, file_name in enumerate(file_names):
+        print("%d: %s" % (slot, file_name))
+
+    return 0
+
+
+# END def main() #
+
+
+def _period_table(data, first: int, period: float, periods: int, size: int) -> np.ndarray:
+    """Averages consecutive periods of a recording into one table
+
+    Keyword arguments:
+        :param data: Array of samples (one column per channel, if more than one)
+        :param first: Index of the first sample of the first period
+        :param period: Period (in samples)
+        :param periods: Number of periods averaged
+        :param size: Number of points in the table
+
+    :returns: Array of 'size' points
+    """
+
+    # Each period is read at (about) the recording's own resolution, then resampled to the table . . .
+    points = int(np.ceil(period))
+    offsets = np.arange(points) * (period / points)
+    per_chunk = max(1, CHUNK_SAMPLES // points)
+
+    total = np.zeros(points)
+    for chunk_start in range(0, periods, per_chunk):
+        positions = first + (np.arange(chunk_start, min(chunk_start + per_chunk, periods))[:, np.newaxis] * period +
+                             offsets)
+
+        low = int(positions[0, 0])
+        samples = _to_float(data[low:int(positions[-1, -1]) + 2])
+        total += np.interp(positions - low, np.arange(samples.size), samples).sum(axis=0)
+
+    return _resample_periodic(total / periods, size)
+
+
+# END def _period_table() #
+
+
+def _resample_periodic(y, size: int) -> np.ndarray:
+    """Resamples one loop of a waveform (keeping only harmonics which fit in both lengths)
+
+    Keyword arguments:
+        :param y: Array of points (one loop)
+        :param size: Number of points returned
+
+    :returns: Array of 'size' points
+    """
+
+    spectrum = np.fft.rfft(y)
+    harmonics = (min(y.size, size) - 1) // 2    # Nyquist bins are dropped, as they'd alias . . .
+
+    resized = np.zeros(size // 2 + 1, dtype=complex)
+    resized[:harmonics + 1] = spectrum[:harmonics + 1]
+
+    return np.fft.irfft(resized, size) * (size / y.size)
+
+
+# END def _resample_periodic() #
+
+
+def _to_float(samples) -> np.ndarray:
+    """Converts samples to mono floats, with 1 being full scale
+
+    Keyword arguments:
+        :param samples: Array of samples (one column per channel, if more than one)
+
+    :returns: 1-D array of floats
+    """
+
+    dtype = samples.dtype
+    samples = samples.astype(float) if samples.ndim == 1 else samples.mean(axis=1)
+
+    if dtype == np.uint8:
+        return (samples - 128) / 128    # 8-bit .wav files are unsigned . . .
+    if dtype.kind == 'i':
+        return samples / 2 ** (8 * dtype.itemsize - 1)
+
+    return samples
+
+
+# END def _to_float() #
+
+
+def _window_table(data, first: int, length: int, size: int) -> np.ndarray:
+    """Turns a window of a recording into one table (the window being one loop)
+
+    Long windows are averaged down a chunk at a time (each sample added to the point it falls in) to
+    OVERSAMPLE times the table's size, before being resampled to the table.
+
+    Keyword arguments:
+        :param data: Array of samples (one column per channel, if more than one)
+        :param first: Index of the first sample of the window
+        :param length: Number of samples in the window
+        :param size: Number of points in the table
+
+    :returns: Array of 'size' points
+    """
+
+    points = OVERSAMPLE * size
+    if length <= points:
+        return _resample_periodic(_to_float(data[first:first + length]), size)
+
+    sums = np.zeros(points)
+    counts = np.zeros(points)
+
+    for chunk_start in range(first, first + length, CHUNK_SAMPLES):
+        samples = _to_float(data[chunk_start:min(chunk_start + CHUNK_SAMPLES, first + length)])
+        index = (np.arange(chunk_start - first, chunk_start - first + samples.size) * points) // length
+
+        sums += np.bincount(index, weights=samples, minlength=points)
+        counts += np.bincount(index, minlength=points)
+
+    return _resample_periodic(sums / counts, size)
+
+
+# END def _window_table() #
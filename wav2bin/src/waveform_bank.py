@@ -0,0 +1,1092 @@
+import numpy as np
+import operator
+
+from collections import OrderedDict
+from functools import partial, wraps
+
+from wav2bin.src.instrumentation import traced
+from wav2bin.src.quantize import quantize, quantization_report, DEFAULT_QUANTIZER
+from wav2bin.src.rom_geometry import RomGeometry
+
+# The variables below are set for quick changes without the hassle of sifting through code . . .
+WAVEFORM_COUNT = 32
+
+FUNCTION_CACHE_BYTES = 64 * 2 ** 20  # Memory kept for generated function waveforms . . .
+
+AFFINE_EDIT = 'affine'          # Change only scales and offsets the waveform (see 'recorded') . . .
+GENERATED_EDIT = 'generated'    # Change mixes in (or overwrites with) points which can be generated again . . .
+QUANTIZE_BLOCK_POINTS = 2 ** 16      # Points quantized at a time when exporting . . .
+
+
+def recorded(method=None, edit=None):
+    """Decorator recording a change of the current waveform into the bank's history (if it keeps one)
+
+    Used bare (@recorded), the waveform's points are kept from before and after the change. Changes of a known
+    shape can instead be described by 'edit', so the history only keeps what's needed to undo them.
+
+    Keyword arguments:
+        :param method: Method changing 'self.line_set[self.current_waveform]'
+        :param edit: Function taking the method's arguments (self included) and returning how the change is
+                     recorded: (AFFINE_EDIT,), (GENERATED_EDIT, generate, mix_func), or None to keep the points
+
+    :returns: Wrapped method (or a decorator, when only 'edit' is given)
+    """
+
+    if method is None:
+        return lambda method: recorded(method, edit)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Changes made within another recorded change are part of that one . . .
+        if self.history is None or self.history.recording:
+            return method(self, *args, **kwargs)
+
+        self.history.begin(self.line_set, self.current_waveform,
+                           None if edit is None else edit(self, *args, **kwargs))
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.history.end(self.line_set)
+
+    return wrapper
+
+
+# END def recorded() #
+
+class WaveformBank(object):
+    """Holds every waveform and the math used to change them (without any GUI dependencies)
+
+    Components:
+        :param self.current_waveform: Index to keep track of current waveform
+        :param self.function_cache: 'FunctionCache' used for generated function waveforms
+        :param self.geometry: 'RomGeometry' describing the ROM being built
+        :param self.history: 'History' of changes made (None when changes aren't kept)
+        :param self.line_set: 'LineSet' of 'LinePoints' objects (one per slot, created when first used)
+        :param self.quantizer: Name of quantizer (from 'QUANTIZERS') used when exporting
+        :param self.x_max: Upper x bound
+        :param self.x_min: Lower x bound
+        :param self.y_max: Upper y bound
+        :param self.y_mid_point: Mid point location on y axis
+        :param self.y_min: Lower y bound
+    """
+
+    def __init__(self, waveform_count: int = WAVEFORM_COUNT, geometry: RomGeometry = None, history=None):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param waveform_count: Number of waveforms held
+            :param geometry: 'RomGeometry' used (defaults to 256 addresses of 8-bit data)
+            :param history: 'History' used for undo/redo (by default, changes aren't kept)
+        """
+
+        self.geometry = geometry if geometry is not None else RomGeometry()
+
+        # The minimum/maximum values for x and y plot points are recorded . . .
+        self.x_min = self.geometry.x_min
+        self.x_max = self.geometry.x_max
+        self.y_min = self.geometry.y_min
+        self.y_max = self.geometry.y_max
+
+        self.y_mid_point = (self.y_max + self.y_min) / 2
+
+        # To better differentiate plot points, a set of lines are kept (only slots used take up memory) . . .
+        self.line_set = LineSet(waveform_count)
+
+        self.current_waveform = 0  # Index used for keeping track of working waveform . . .
+
+        self.function_cache = FUNCTION_CACHE  # Shared between banks, since it's keyed on geometry . . .
+
+        self.history = history
+
+        self.quantizer = DEFAULT_QUANTIZER  # Rounding used when exporting . . .
+
+    # END def __init__() #
+
+    @recorded(edit=lambda self, amp: (AFFINE_EDIT,) if amp else None)
+    def change_amp(self, amp: float):
+        """Changes the current waveform's amplitude
+
+        Keyword arguments:
+            :param amp: Amplitude factor used
+        """
+
+        # Multiplies given amplitude to the data (once the waveform is next used) . . .
+        self.line_set[self.current_waveform].transform(amp, 0.0)
+
+        # Changes if data is still in bounds (and takes action, if needed) . . .
+        self._check_plot_details()
+
+    # END def change_amp() #
+
+    @recorded
+    def change_freq(self, freq: int):
+        """Changes the current waveform's frequency
+
+        Keyword arguments:
+            :param freq: Frequency factor used
+        """
+
+        # Averages every 'freq' points and repeats the result across the whole waveform . . .
+        self.line_set[self.current_waveform].y = resample_cycles(self.line_set[self.current_waveform].y,
+                                                                 cycles=freq,
+                                                                 size=self.x_max - self.x_min + 1)
+
+        # Changes if data is still in bounds (and takes action, if needed) . . .
+        self._check_plot_details()
+
+    # END def change_freq() #
+
+    @recorded(edit=lambda self, *args, **kwargs: self._function_edit(*args, **kwargs))
+    def change_function(self, name: str, mix_func: bool, cycles: float, wav_num: int = None) -> bool:
+        """Changes the current waveform by either mixing or overwriting waveform with function
+
+        Keyword arguments:
+            :param name: Name of function being used
+            :param mix_func: Boolean used to control whether user mixes function or not
+            :param cycles: Provides number of cycles function will happen
+            :param wav_num: Used to index another waveform user created
+
+        :returns: Whether or not the current waveform was changed
+        """
+
+        x_array = self.function_cache.grid(self.geometry)
+
+        # Looks at what function user has selected . . .
+        if FUNCTIONS.get(name) is not None:
+            # Read-only array is shared with the cache . . .
+            y_array = self.function_cache.function(name, cycles, self.geometry)
+
+        elif name == "Random":
+            # To use random, cycles will be casted as an int . . .
+            cycles = self._round_int(cycles)
+            if cycles < 1:
+                cycles = 1
+
+            y_array = (self.y_max - self.y_min) * np.random.random_sample((x_array.size // cycles,)) + self.y_min
+
+            # Repeats the random points until there's enough y data points . . .
+            y_array = np.resize(y_array, x_array.size)
+
+        else:  # name == "Waveform"
+
+            # Checks to see if there is a waveform that can be copied . . .
+            if not self.line_set[wav_num].drawn:
+                return False  # Does nothing if array is empty . . .
+
+            # To use random, cycles will be casted as an int . . .
+            cycles = self._round_int(cycles)
+            if cycles < 1:
+                cycles = 1
+
+            # Averages every 'cycles' points and repeats the result across the whole waveform . . .
+            y_array = resample_cycles(self.line_set[wav_num].y, cycles=cycles, size=x_array.size)
+
+        self._apply_waveform(x_array, y_array, mix_func)
+
+        return True
+
+    # END def change_function() #
+
+    @recorded
+    def change_expression(self, text: str, mix_func: bool):
+        """Changes the current waveform by either mixing or overwriting waveform with an expression
+
+        Expressions are written over t (0 to 2*pi across the waveform) and return values between -1 and 1,
+        i.e. "0.6*sin(3*t) + 0.3*square(5*t, duty=0.25) + w[4]" (see 'wav2bin.src.expressions').
+
+        Keyword arguments:
+            :param text: Expression being used
+            :param mix_func: Boolean used to control whether user mixes expression or not
+        """
+
+        from wav2bin.src.expressions import compile_expression
+
+        expression = compile_expression(text)
+        y_array = (self.y_max - self.y_mid_point) * expression.evaluate(self) + self.y_mid_point
+
+        self._apply_waveform(self.function_cache.grid(self.geometry), y_array, mix_func)
+
+    # END def change_expression() #
+
+    @recorded(edit=lambda self, *args, **kwargs: self._harmonics_edit(*args, **kwargs))
+    def change_harmonics(self, magnitudes, phases=None, mix_func: bool = False):
+        """Changes the current waveform by either mixing or overwriting waveform with harmonics
+
+        Harmonic k (starting at 1) adds magnitude * sin(k*t + phase), with magnitudes scaled like functions
+        (1 reaches y_max), i.e. magnitudes [1, 0, 1/3] (see 'wav2bin.src.harmonics').
+
+        Keyword arguments:
+            :param magnitudes: Magnitudes of harmonics 1, 2, ...
+            :param phases: Phases (in radians) of each harmonic (defaults to 0)
+            :param mix_func: Boolean used to control whether user mixes harmonics or not
+        """
+
+        self._apply_waveform(self.function_cache.grid(self.geometry), self._harmonic_points(magnitudes, phases),
+                             mix_func)
+
+    # END def change_harmonics() #
+
+    @recorded
+    def change_wav(self, file_name: str, mix_func: bool = False, start: float = 0.0, duration: float = None,
+                   periods: int = 1):
+        """Changes the current waveform by either mixing or overwriting waveform with part of a recording
+
+        One period of the recording is found at 'start' unless a window is given with 'duration' (see
+        'wav2bin.src.wav_import'); either way it fills the whole waveform, once.
+
+        Keyword arguments:
+            :param file_name: Path to .wav file
+            :param mix_func: Boolean used to control whether user mixes the recording or not
+            :param start: Time (in seconds) the period or window starts at
+            :param duration: Length (in seconds) of the window (None to find a period)
+            :param periods: Number of periods averaged together
+        """
+
+        from wav2bin.src.wav_import import import_wav
+
+        import_wav(self, file_name, mix_func, start=start, duration=duration, periods=periods)
+
+    # END def change_wav() #
+
+    @recorded
+    def apply_waveform(self, y_array, mix_func: bool):
+        """Changes the current waveform by either mixing or overwriting waveform with points worked out elsewhere
+        (i.e. synthesized or imported many slots at a time)
+
+        Keyword arguments:
+            :param y_array: Array of y points (one per x point)
+            :param mix_func: Boolean used to control whether y data is mixed or not
+        """
+
+        self._apply_waveform(self.function_cache.grid(self.geometry), y_array, mix_func)
+
+    # END def apply_waveform() #
+
+    @recorded(edit=lambda self, level: (AFFINE_EDIT,))
+    def change_level(self, level: float):
+        """Changes the level of the current waveform
+
+        Keyword Arguments:
+            :param level: amount waveform needs to move
+        """
+
+        self.line_set[self.current_waveform].transform(1.0, level)  # Adds level value to waveform . . .
+        self._check_plot_details()
+
+    # END def change_level() #
+
+    @recorded
+    def clear_waveform(self) -> bool:
+        """Clears current 'LinePoints' data
+
+        :returns: Whether or not the current waveform was cleared
+        """
+
+        # No need to clear if waveform is already cleared . . .
+        if not self.line_set[self.current_waveform].drawn:
+            return False
+
+        self.line_set[self.current_waveform] = LinePoints()  # Resets current line . . .
+
+        return True
+
+    # END def clear_waveform() #
+
+    def undo(self) -> int:
+        """Undoes the most recent change
+
+        :returns: Index of waveform changed (None if there's nothing to undo)
+        """
+
+        if self.history is None:
+            return None
+
+        return self.history.undo(self.line_set, self.function_cache.grid(self.geometry))
+
+    # END def undo() #
+
+    def redo(self) -> int:
+        """Redoes the most recently undone change
+
+        :returns: Index of waveform changed (None if there's nothing to redo)
+        """
+
+        if self.history is None:
+            return None
+
+        return self.history.redo(self.line_set, self.function_cache.grid(self.geometry))
+
+    # END def redo() #
+
+    def export_data(self, report: bool = False):
+        """Exports data from every waveform (quantized with 'self.quantizer')
+
+        Keyword arguments:
+            :param report: Whether or not the error of each drawn waveform is measured too
+
+        returns: 2-D array (one row per waveform) of data in binary form, using 'self.geometry.dtype' (and, if
+                 'report', a dictionary of "slots" along with the "snr" and "max_error" of each)
+        """
+
+        # Waveforms not drawn are left at the lowest value . . .
+        data_to_return = np.full((len(self.line_set), self.x_max - self.x_min + 1),
+                                 self.y_min,
+                                 dtype=self.geometry.dtype)
+
+        drawn = self.line_set.drawn_slots()
+        reports = []
+
+        # Drawn waveforms are quantized a block at a time (each block in one call), which keeps the arrays
+        # worked on small enough to stay in cache . . .
+        block_rows = max(1, QUANTIZE_BLOCK_POINTS // data_to_return.shape[1])
+        y = np.empty((min(block_rows, len(drawn)), data_to_return.shape[1]))
+
+        for start in range(0, len(drawn), block_rows):
+            slots = drawn[start:start + block_rows]
+            for row, index in enumerate(slots):
+                y[row] = self.line_set[index].y
+
+            levels = quantize(y[:len(slots)], self.y_min, self.y_max, self.quantizer)
+            data_to_return[slots] = levels
+
+            if report:
+                reports.append(quantization_report(y[:len(slots)], levels))
+
+        if not report:
+            return data_to_return
+
+        return data_to_return, {"slots": drawn,
+                                "snr": np.concatenate([block["snr"] for block in reports] + [[]]),
+                                "max_error": np.concatenate([block["max_error"] for block in reports] + [[]])}
+
+    # END def export_data() #
+
+    def _apply_waveform(self, x_array, y_array, mix_func: bool):
+        """Mixes or overwrites the current waveform with new y data
+
+        Keyword arguments:
+            :param x_array: Array of x points
+            :param y_array: Array of y points
+            :param mix_func: Boolean used to control whether y data is mixed or not
+        """
+
+        # Checks whether the user selected to mix and if the line is drawn . . .
+        if mix_func and self.line_set[self.current_waveform].drawn:
+            self.line_set[self.current_waveform].y += y_array
+        else:
+            # Cached arrays are copied before they can be changed . . .
+            if not y_array.flags.writeable:
+                y_array = y_array.copy()
+
+            self.line_set[self.current_waveform].x = x_array
+            self.line_set[self.current_waveform].y = y_array
+            self.line_set[self.current_waveform].drawn = True
+
+        self._check_plot_details()
+
+    # END def _apply_waveform() #
+
+    def _function_edit(self, name: str, mix_func: bool, cycles: float, wav_num: int = None) -> tuple:
+        """Describes a 'change_function' call for the history (only functions of 'FUNCTIONS' can be generated
+        again; random and copied waveforms keep their points)
+
+        Keyword arguments:
+            :param name: Name of function being used
+            :param mix_func: Boolean used to control whether user mixes function or not
+            :param cycles: Provides number of cycles function will happen
+            :param wav_num: Used to index another waveform user created (unused)
+
+        :returns: Edit (see 'recorded')
+        """
+
+        if FUNCTIONS.get(name) is None:
+            return None
+
+        return GENERATED_EDIT, partial(self.function_cache.function, name, cycles, self.geometry), mix_func
+
+    # END def _function_edit() #
+
+    def _harmonics_edit(self, magnitudes, phases=None, mix_func: bool = False) -> tuple:
+        """Describes a 'change_harmonics' call for the history
+
+        Keyword arguments:
+            :param magnitudes: Magnitudes of harmonics 1, 2, ...
+            :param phases: Phases (in radians) of each harmonic (defaults to 0)
+            :param mix_func: Boolean used to control whether user mixes harmonics or not
+
+        :returns: Edit (see 'recorded')
+        """
+
+        # Copies are kept, in case the caller changes its arrays afterwards . . .
+        magnitudes = np.array(magnitudes, dtype=float)
+        phases = None if phases is None else np.array(phases, dtype=float)
+
+        return GENERATED_EDIT, partial(self._harmonic_points, magnitudes, phases), mix_func
+
+    # END def _harmonics_edit() #
+
+    def _harmonic_points(self, magnitudes, phases=None) -> np.ndarray:
+        """Synthesizes harmonics, spread over the ROM's y range
+
+        Keyword arguments:
+            :param magnitudes: Magnitudes of harmonics 1, 2, ...
+            :param phases: Phases (in radians) of each harmonic (defaults to 0)
+
+        :returns: Array of y points
+        """
+
+        from wav2bin.src.harmonics import synthesize
+
+        y_array = synthesize(magnitudes, phases, self.x_max - self.x_min + 1)
+
+        return (self.y_max - self.y_mid_point) * y_array + self.y_mid_point
+
+    # END def _harmonic_points() #
+
+    @traced()
+    def _check_plot_details(self):
+        """Checks to make sure waveform is right size and is made up of integers"""
+
+        y_low, y_high = self.line_set[self.current_waveform].bounds()
+
+        # Only go into here when a y value overflows over the desired boundaries . . .
+        if y_high > self.y_max or y_low < self.y_min:
+            self._rescale_to_fit()
+
+    # END def _check_plot_details() #
+
+    @traced()
+    def _rescale_to_fit(self):
+        """Corrects waveform data that overflows over the y boundaries"""
+
+        # Below, this algorithm is used to compress the waveform (about the mid point) . . .
+        y_low, y_high = self.line_set[self.current_waveform].bounds()
+        overflow = max(y_high - self.y_mid_point, self.y_mid_point - y_low)
+
+        scale = (self.y_max - self.y_mid_point) / overflow
+        self.line_set[self.current_waveform].transform(scale, self.y_mid_point - self.y_mid_point * scale)
+
+    # END def _rescale_to_fit() #
+
+    @staticmethod
+    def _round_int(num: float) -> int:
+        """Rounds numbers to nearest integer
+
+        Keyword arguments:
+            :param num: Number to be rounded
+
+        :returns: Rounded integer
+        """
+
+        return int(num + .5)
+
+    # END def _round_int() #
+
+
+class FunctionCache(object):
+    """Bounded (least recently used) cache of generated function waveforms
+
+    Components:
+        :param self.hits: Number of lookups found in the cache
+        :param self.max_bytes: Memory the cache is allowed to hold
+        :param self.misses: Number of lookups which had to be generated
+        :param self.nbytes: Memory the cache currently holds
+        :param self.__entries: Ordered dictionary of read-only arrays (least recently used first)
+    """
+
+    def __init__(self, max_bytes: int = FUNCTION_CACHE_BYTES):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param max_bytes: Memory the cache is allowed to hold
+        """
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self.__entries = OrderedDict()
+
+    # END def __init__() #
+
+    def __len__(self) -> int:
+        """Number of arrays held"""
+
+        return len(self.__entries)
+
+    # END def __len__() #
+
+    def clear(self):
+        """Removes every array (and resets the counters)"""
+
+        self.__entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # END def clear() #
+
+    def function(self, name: str, cycles: float, geometry: RomGeometry) -> np.ndarray:
+        """Gets a function from 'FUNCTIONS' spread over the ROM's y range
+
+        Keyword arguments:
+            :param name: Name of function being used
+            :param cycles: Number of cycles across the waveform
+            :param geometry: 'RomGeometry' of the waveform
+
+        :returns: Read-only array of y points
+        """
+
+        def generate():
+            x_array = self.grid(geometry)
+            y_mid_point = (geometry.y_max + geometry.y_min) / 2
+
+            # To fill the graph, a custom frequency is generated (using name and cycles as an input)
+            freq = (cycles * 2 * np.pi) / (geometry.x_max - geometry.x_min)
+            return (geometry.y_max - y_mid_point) * FUNCTIONS[name](freq * x_array) + y_mid_point
+
+        return self.__lookup((name, float(cycles), geometry), generate)
+
+    # END def function() #
+
+    def grid(self, geometry: RomGeometry) -> np.ndarray:
+        """Gets the x points of a waveform (one at every ROM address)
+
+        Keyword arguments:
+            :param geometry: 'RomGeometry' of the waveform
+
+        :returns: Read-only array of x points
+        """
+
+        return self.__lookup(("Grid", geometry),
+                             lambda: np.linspace(geometry.x_min, geometry.x_max, geometry.x_max - geometry.x_min + 1))
+
+    # END def grid() #
+
+    def __lookup(self, key: tuple, generate) -> np.ndarray:
+        """Finds an array in the cache (generating and storing it if missing)
+
+        Keyword arguments:
+            :param key: Key of array
+            :param generate: Function called to create the array when missing
+
+        :returns: Read-only array
+        """
+
+        if key in self.__entries:
+            self.hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+        self.misses += 1
+
+        array = generate()
+        array.flags.writeable = False
+
+        # Arrays larger than the cache itself are handed back without being stored . . .
+        if array.nbytes <= self.max_bytes:
+            self.__entries[key] = array
+            self.nbytes += array.nbytes
+
+            # Least recently used arrays are dropped until the cache fits . . .
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= self.__entries.popitem(last=False)[1].nbytes
+
+        return array
+
+    # END def __lookup() #
+
+
+class LinePoints(object):
+    """
+    Holds coordinates for x and y plots (along with if they were drawn or not)
+
+    Scaling and offsetting y (amplitude, level, and rescaling) is put off until y is next used: every step
+    is folded into a single pending 'scale * y + offset', applied in one pass. The bounds of y are worked
+    out from the bounds of the stored points, so overflow is checked without going through the points.
+
+    Stored points handed out by 'share' (i.e. to the history) are copied on write: the next use of y works
+    them into a new array rather than changing them in place, so 'restore' can put them back exactly.
+
+    Components:
+        :param self.x: Holds all x plot data (first as a list, for speed reasons, then converted to numpy array)
+        :param self.y: Holds all y plot data (first as a list, for speed reasons, then converted to numpy array)
+        :param self.drawn: Indicates whether or not graph has been drawn
+        :param self.__bounds: Lowest and highest stored y point (None until needed)
+        :param self.__offset: Offset still to be added to the stored y points
+        :param self.__scale: Scale still to be applied to the stored y points
+        :param self.__shared: Indicates whether or not the stored y points have been handed out by 'share'
+        :param self.__y: Stored y points (see '_load_y')
+    """
+
+    def __init__(self):
+        """Initializes all necessary variables"""
+
+        self.x = []
+        self.y = []
+        self.drawn = False
+
+        # END def __init__() #
+
+    @property
+    def y(self):
+        """Holds all y plot data (with any pending scale and offset applied)"""
+
+        y = self._load_y()
+
+        if self.__shared:
+            bounds = None if self.__bounds is None else self.bounds()
+
+            # Shared points are left as they are, so every pending step goes into a new array . . .
+            y = y * self.__scale
+            y += self.__offset
+            self._store_y(y)
+
+            self.__scale, self.__offset, self.__bounds, self.__shared = 1.0, 0.0, bounds, False
+
+        elif self.__scale != 1.0 or self.__offset != 0.0:
+            bounds = None if self.__bounds is None else self.bounds()
+
+            # Every pending step goes through the points at once . . .
+            y *= self.__scale
+            y += self.__offset
+
+            self.__scale, self.__offset, self.__bounds = 1.0, 0.0, bounds
+
+        return y
+
+    # END def y() #
+
+    @y.setter
+    def y(self, value):
+        # Augmented assignments (i.e. line.y += y_array) go through here as well . . .
+        self.__scale, self.__offset, self.__bounds, self.__shared = 1.0, 0.0, None, False
+        self._store_y(value)
+
+    # END def y() #
+
+    def bounds(self) -> tuple:
+        """Finds the lowest and highest y points (without applying any pending scale and offset)
+
+        :returns: Lowest and highest y point
+        """
+
+        if self.__bounds is None:
+            y = self._load_y()
+            self.__bounds = (float(y.min()), float(y.max()))
+
+        # Rounding keeps the order of points, so these are exactly the bounds of 'self.y' . . .
+        low, high = (self.__scale * bound + self.__offset for bound in self.__bounds)
+
+        return (low, high) if low <= high else (high, low)
+
+    # END def bounds() #
+
+    @property
+    def pending(self) -> tuple:
+        """Scale and offset still to be applied to the stored y points"""
+
+        return self.__scale, self.__offset
+
+    # END def pending() #
+
+    def share(self) -> tuple:
+        """Hands out the stored y points without copying them (they're copied before they're next changed)
+
+        :returns: State of y: stored y points, pending scale and offset, and bounds of the stored points
+        """
+
+        self.__shared = True
+
+        return self._load_y(), self.__scale, self.__offset, self.__bounds
+
+    # END def share() #
+
+    def restore(self, state: tuple):
+        """Puts y back exactly as it was when handed out by 'share'
+
+        Keyword arguments:
+            :param state: State of y (as returned by 'share')
+        """
+
+        y, scale, offset, bounds = state
+
+        self._store_y(y)
+        self.__scale, self.__offset, self.__bounds, self.__shared = scale, offset, bounds, True
+
+    # END def restore() #
+
+    def transform(self, scale: float, offset: float):
+        """Scales then offsets y (y = scale * y + offset), once y is next used
+
+        Keyword arguments:
+            :param scale: Factor y is multiplied by
+            :param offset: Amount added to y (after scaling)
+        """
+
+        self.__scale, self.__offset = self.__scale * scale, self.__offset * scale + offset
+
+    # END def transform() #
+
+    def _load_y(self):
+        """Gives the stored y points (as they were before any pending scale and offset)"""
+
+        return self.__y
+
+    # END def _load_y() #
+
+    def _store_y(self, value):
+        """Stores y points
+
+        Keyword arguments:
+            :param value: List or array of y points
+        """
+
+        self.__y = value
+
+    # END def _store_y() #
+
+
+class LineSet(object):
+    """List-like set of 'LinePoints' objects, where each slot's line is only created once it's used
+
+    Banks of thousands of slots only hold memory for the slots which have been used (i.e. drawn or viewed).
+
+    Components:
+        :param self.__count: Number of slots
+        :param self.__lines: Dictionary of slot -> 'LinePoints' object (for slots used so far)
+    """
+
+    def __init__(self, count: int = WAVEFORM_COUNT):
+        """Initializes all necessary variables
+
+        Keyword arguments:
+            :param count: Number of slots
+        """
+
+        if count < 1:
+            raise ValueError("waveform count must be at least 1 (got %d)" % count)
+
+        self.__count = count
+        self.__lines = {}
+
+    # END def __init__() #
+
+    def __len__(self) -> int:
+        """Number of slots"""
+
+        return self.__count
+
+    # END def __len__() #
+
+    def __getitem__(self, slot: int) -> LinePoints:
+        """Gets the line of a slot (creating it the first time the slot is used)
+
+        Keyword arguments:
+            :param slot: Index of waveform
+
+        :returns: 'LinePoints' object
+        """
+
+        slot = self.__index(slot)
+
+        line = self.__lines.get(slot)
+        if line is None:
+            line = self.__lines[slot] = LinePoints()
+
+        return line
+
+    # END def __getitem__() #
+
+    def __setitem__(self, slot: int, line: LinePoints):
+        """Replaces the line of a slot
+
+        Keyword arguments:
+            :param slot: Index of waveform
+            :param line: 'LinePoints' object
+        """
+
+        self.__lines[self.__index(slot)] = line
+
+    # END def __setitem__() #
+
+    def __iter__(self):
+        """Goes through the line of every slot (slots never used give empty lines, without being created)"""
+
+        for slot in range(self.__count):
+            line = self.__lines.get(slot)
+            yield line if line is not None else LinePoints()
+
+    # END def __iter__() #
+
+    @property
+    def allocated(self) -> int:
+        """Number of slots holding a line"""
+
+        return len(self.__lines)
+
+    # END def allocated() #
+
+    def drawn_slots(self) -> list:
+        """Finds every drawn slot (in order), without going through slots never used
+
+        :returns: List of slot indexes
+        """
+
+        return sorted(slot for slot, line in self.__lines.items() if line.drawn)
+
+    # END def drawn_slots() #
+
+    def release(self, slot: int):
+        """Lets go of a slot's line if it isn't drawn (it's created again once used)
+
+        Keyword arguments:
+            :param slot: Index of waveform
+        """
+
+        slot = self.__index(slot)
+
+        line = self.__lines.get(slot)
+        if line is not None and not line.drawn and len(line.x) == 0:
+            del self.__lines[slot]
+
+    # END def release() #
+
+    def resize(self, count: int):
+        """Changes the number of slots (lines of removed slots are let go)
+
+        Keyword arguments:
+            :param count: Number of slots
+        """
+
+        if count < 1:
+            raise ValueError("waveform count must be at least 1 (got %d)" % count)
+
+        for slot in [slot for slot in self.__lines if slot >= count]:
+            del self.__lines[slot]
+
+        self.__count = count
+
+    # END def resize() #
+
+    def __index(self, slot: int) -> int:
+        """Checks a slot index (negative indexes count from the end, like a list)
+
+        Keyword arguments:
+            :param slot: Index of waveform
+
+        :returns: Index between 0 and the number of slots
+        """
+
+        slot = operator.index(slot)
+        if slot < 0:
+            slot += self.__count
+
+        if not 0 <= slot < self.__count:
+            raise IndexError("slot %d is outside of 0 - %d" % (slot, self.__count - 1))
+
+        return slot
+
+    # END def __index() #
+
+
+def write_data(data, f, geometry: RomGeometry) -> int:
+    """Writes exported waveform data to a file in a single write
+
+    Keyword arguments:
+        :param data: 2-D array of points (as returned by 'WaveformBank.export_data')
+        :param f: File (opened in binary mode) being written to
+        :param geometry: 'RomGeometry' used for packing the points
+
+    :returns: Number of bytes written
+    """
+
+    # The packed bank is handed over through the buffer protocol (no copy when already packed) . . .
+    buffer = memoryview(geometry.pack(data)).cast('B')
+    f.write(buffer)
+
+    return buffer.nbytes
+
+
+# END def write_data() #
+
+
+def resample_cycles(y, cycles: int, size: int):
+    """Compresses a waveform by 'cycles' and repeats it to fill 'size' points
+
+    Every group of 'cycles' neighbouring points is averaged (any leftover points are dropped), then the
+    averaged waveform is repeated until 'size' points are filled.
+
+    Keyword arguments:
+        :param y: Array of waveform points
+        :param cycles: Number of times the waveform is repeated
+        :param size: Number of points returned
+
+    :returns: Array of 'size' points
+    """
+
+    groups = size // cycles
+
+    # Reshaping lets every group be averaged in one pass . . .
+    y_array = np.asarray(y, dtype=float)[:groups * cycles].reshape(groups, cycles).mean(axis=1)
+
+    return np.resize(y_array, size)
+
+
+# END def resample_cycles() #
+
+
+def square(t, duty: float = 0.5):
+    """Square wave with a period of 2*pi (matches 'scipy.signal.square')
+
+    Keyword arguments:
+        :param t: Array of phase points
+        :param duty: Fraction of each period spent high
+
+    :returns: Array of points between -1 and 1
+    """
+
+    return np.where(np.mod(t, 2 * np.pi) < duty * 2 * np.pi, 1.0, -1.0)
+
+
+# END def square() #
+
+
+def sawtooth(t, width: float = 1.0):
+    """Sawtooth wave with a period of 2*pi (matches 'scipy.signal.sawtooth')
+
+    Keyword arguments:
+        :param t: Array of phase points
+        :param width: Fraction of each period spent rising (0.5 gives a triangle wave)
+
+    :returns: Array of points between -1 and 1
+    """
+
+    t_mod = np.mod(t, 2 * np.pi)
+
+    if width >= 1:
+        return t_mod / np.pi - 1
+
+    # Only one side of np.where is used per point, so divisions by zero are harmless . . .
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(t_mod < width * 2 * np.pi,
+                        t_mod / (np.pi * width) - 1,
+                        (np.pi * (width + 1) - t_mod) / (np.pi * (1 - width)))
+
+
+# END def sawtooth() #
+
+
+def square_bl(t, duty: float = 0.5):
+    """Band-limited square wave (PolyBLEP), to keep high cycle counts from aliasing once played back
+
+    Keyword arguments:
+        :param t: Array of evenly stepping phase points (like 'square')
+        :param duty: Fraction of each period spent high
+
+    :returns: Array of points between about -1 and 1
+    """
+
+    phase, step = _phase_steps(t)
+    if step is None:
+        return square(t, duty)
+
+    # Rising edges (at the start of each period) and falling edges (at 'duty') are smoothed . . .
+    return np.where(phase < duty, 1.0, -1.0) + _poly_blep(phase, step) - _poly_blep(np.mod(phase - duty, 1), step)
+
+
+# END def square_bl() #
+
+
+def sawtooth_bl(t, width: float = 1.0):
+    """Band-limited sawtooth wave (PolyBLEP), to keep high cycle counts from aliasing once played back
+
+    Only the sawtooth's jump is smoothed, so widths below 1 (which have no jump) match 'sawtooth'.
+
+    Keyword arguments:
+        :param t: Array of evenly stepping phase points (like 'sawtooth')
+        :param width: Fraction of each period spent rising
+
+    :returns: Array of points between about -1 and 1
+    """
+
+    phase, step = _phase_steps(t)
+    if step is None or width < 1:
+        return sawtooth(t, width)
+
+    return 2 * phase - 1 - _poly_blep(phase, step)
+
+
+# END def sawtooth_bl() #
+
+
+def _phase_steps(t) -> tuple:
+    """Finds the phase (as a fraction of a period) of each point and how far it steps between points
+
+    Keyword arguments:
+        :param t: Array of phase points (with a period of 2*pi)
+
+    :returns: Fractions of a period and steps between points (None when there are too few points)
+    """
+
+    t = np.asarray(t, dtype=float)
+    if t.ndim != 1 or t.size < 2:
+        return None, None
+
+    cycles = t / (2 * np.pi)
+
+    # Each point's step is taken from the point before it (the first point borrows the next step) . . .
+    step = np.empty_like(cycles)
+    np.subtract(cycles[1:], cycles[:-1], out=step[1:])
+    step[0] = step[1]
+
+    # Steps wider than half a period can't be smoothed any further . . .
+    np.absolute(step, out=step)
+    np.minimum(step, 0.5, out=step)
+
+    return np.mod(cycles, 1), step
+
+
+# END def _phase_steps() #
+
+
+def _poly_blep(phase, step):
+    """Polynomial correction of a jump of 2 at the start of each period (zero away from the jump)
+
+    Keyword arguments:
+        :param phase: Array of fractions of a period
+        :param step: Array of steps between points (as fractions of a period)
+
+    :returns: Array of corrections
+    """
+
+    correction = np.zeros_like(phase)
+
+    # Only the few points next to a jump are corrected . . .
+    index = np.flatnonzero(phase < step)
+    after = phase[index] / step[index]             # Just after the jump, between 0 and 1 . . .
+    correction[index] = 2 * after - after * after - 1
+
+    index = np.flatnonzero(phase > 1 - step)
+    before = (phase[index] - 1) / step[index]      # Just before the jump, between -1 and 0 . . .
+    correction[index] = before * before + 2 * before + 1
+
+    return correction
+
+
+# END def _poly_blep() #
+
+
+# Dictionary used to hold all functions used . . .
+FUNCTIONS = OrderedDict([("Sine", np.sin),
+                         ("Cosine", np.cos),
+                         ("Square", square),
+                         ("Sawtooth", sawtooth),
+                         ("Square (Band-Limited)", square_bl),
+                         ("Sawtooth (Band-Limited)", sawtooth_bl),
+                         ("Random", None),
+                         ("Waveform", None)])
+
+# Cache shared by every 'WaveformBank' . . .
+FUNCTION_CACHE = FunctionCache()